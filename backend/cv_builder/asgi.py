@@ -17,6 +17,12 @@ from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from cvs.routing import websocket_urlpatterns
+from django.conf import settings
+
+# PDF worker'ları arka planda hazırlanır; sunucu açılışı derlemeyi beklemez
+if getattr(settings, 'PDF_WARM_ON_STARTUP', True):
+    from cvs.pdf import warm_render_workers
+    warm_render_workers(wait=False)
 
 application = ProtocolTypeRouter({
     "http": get_asgi_application(),
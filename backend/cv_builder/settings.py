@@ -216,6 +216,11 @@ AWS_S3_REGION_NAME = os.getenv('AWS_S3_REGION_NAME')
 AWS_S3_ENDPOINT_URL = os.getenv('AWS_S3_ENDPOINT_URL')
 AWS_S3_CUSTOM_DOMAIN = f"{AWS_STORAGE_BUCKET_NAME}.{AWS_S3_REGION_NAME}.cdn.digitaloceanspaces.com"
 
+# Videolar tarayıcıdan doğrudan Spaces'e multipart yüklenir (cvs.uploads)
+VIDEO_UPLOAD_MAX_SIZE = int(os.getenv('VIDEO_UPLOAD_MAX_SIZE', str(100 * 1024 * 1024)))
+VIDEO_UPLOAD_PART_SIZE = int(os.getenv('VIDEO_UPLOAD_PART_SIZE', str(8 * 1024 * 1024)))
+VIDEO_UPLOAD_URL_EXPIRY = int(os.getenv('VIDEO_UPLOAD_URL_EXPIRY', '3600'))  # saniye
+
 # Static ve Media dosya ayarları
 STATIC_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
@@ -226,6 +231,12 @@ STATICFILES_DIRS = [
 MEDIA_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Yüklenen dosyaların SHA-256'sı yükleme sırasında hesaplanır (cvs.blobs)
+FILE_UPLOAD_HANDLERS = [
+    'cvs.upload_handlers.HashingMemoryFileUploadHandler',
+    'cvs.upload_handlers.HashingTemporaryFileUploadHandler',
+]
+
 # Social Auth ayarları
 AUTHENTICATION_BACKENDS = (
     'users.auth.EmailBackend',
@@ -318,14 +329,101 @@ TRAILING_SLASH = True
 
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+# CV kaydı sonrası düzeltme/çeviri işlerini çalıştıran worker thread sayısı
+TRANSLATION_WORKER_THREADS = int(os.getenv('TRANSLATION_WORKER_THREADS', '4'))
+
+# Bir çeviri işi içinde dillere paralel gönderilen OpenAI isteklerinin limitleri
+TRANSLATION_MAX_CONCURRENCY = int(os.getenv('TRANSLATION_MAX_CONCURRENCY', '6'))
+TRANSLATION_REQUEST_TIMEOUT = float(os.getenv('TRANSLATION_REQUEST_TIMEOUT', '60'))
+TRANSLATION_MAX_RETRIES = int(os.getenv('TRANSLATION_MAX_RETRIES', '2'))
+TRANSLATION_RETRY_BACKOFF = float(os.getenv('TRANSLATION_RETRY_BACKOFF', '1.0'))
+
+# Çeviri hafızası: prompt'lar değişince sürümü artırın, LRU süreç içi önbellek boyutudur
+TRANSLATION_PROMPT_VERSION = os.getenv('TRANSLATION_PROMPT_VERSION', 'v1')
+TRANSLATION_MEMORY_LRU_SIZE = int(os.getenv('TRANSLATION_MEMORY_LRU_SIZE', '10000'))
+
+# Önbellek: REDIS_URL tanımlıysa Redis (production), değilse süreç içi locmem (geliştirme/test)
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'cvbuilder',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'cvbuilder',
+        }
+    }
+
+# Herkese açık CV yanıtlarının önbellekte kalma süresi (saniye)
+PUBLIC_CV_CACHE_TIMEOUT = int(os.getenv('PUBLIC_CV_CACHE_TIMEOUT', '3600'))
+
+# PDF çıktısı: eşzamanlı WeasyPrint render sayısı ve tek render için süre sınırı (saniye).
+# Şablonlar dışında çıktıyı etkileyen bir değişiklikte (font, WeasyPrint sürümü) sürümü artırın.
+PDF_RENDER_WORKERS = int(os.getenv('PDF_RENDER_WORKERS', '2'))
+PDF_RENDER_TIMEOUT = int(os.getenv('PDF_RENDER_TIMEOUT', '60'))
+PDF_TEMPLATE_VERSION = os.getenv('PDF_TEMPLATE_VERSION', 'v1')
+# Sunucu süreci başlarken PDF worker'larının şablon varlıklarını arka planda derle (açılışı bekletmez)
+PDF_WARM_ON_STARTUP = os.getenv('PDF_WARM_ON_STARTUP', 'True').lower() == 'true'
+
 # Channels ve ASGI ayarları
 ASGI_APPLICATION = 'cv_builder.asgi.application'
 
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer'
+# Channel layer: birden fazla daphne süreci varsa Redis zorunludur, aksi halde bir
+# süreçten yapılan group_send diğer süreçlerdeki bağlantılara ulaşmaz.
+# CHANNEL_REDIS_URLS virgülle ayrılmış adres listesidir; birden fazla adres verilirse
+# kanallar bu sunuculara shard edilir. Tanımlı değilse REDIS_URL kullanılır.
+# CHANNEL_LAYER_BACKEND: redis, redis_pubsub veya memory (tek süreç / testler)
+CHANNEL_REDIS_URLS = [
+    url.strip() for url in os.getenv('CHANNEL_REDIS_URLS', REDIS_URL or '').split(',') if url.strip()
+]
+CHANNEL_LAYER_BACKEND = os.getenv('CHANNEL_LAYER_BACKEND', 'redis' if CHANNEL_REDIS_URLS else 'memory')
+
+# Kanal başına bekleyen mesaj sınırı ve mesaj/grup üyeliği ömürleri (saniye)
+CHANNEL_LAYER_CAPACITY = int(os.getenv('CHANNEL_LAYER_CAPACITY', '100'))
+CHANNEL_LAYER_EXPIRY = int(os.getenv('CHANNEL_LAYER_EXPIRY', '60'))
+CHANNEL_LAYER_GROUP_EXPIRY = int(os.getenv('CHANNEL_LAYER_GROUP_EXPIRY', '86400'))
+
+if CHANNEL_LAYER_BACKEND == 'redis':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {
+                'hosts': CHANNEL_REDIS_URLS,
+                'capacity': CHANNEL_LAYER_CAPACITY,
+                'expiry': CHANNEL_LAYER_EXPIRY,
+                'group_expiry': CHANNEL_LAYER_GROUP_EXPIRY,
+                'prefix': os.getenv('CHANNEL_LAYER_PREFIX', 'asgi'),
+            },
+        }
+    }
+elif CHANNEL_LAYER_BACKEND == 'redis_pubsub':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.pubsub.RedisPubSubChannelLayer',
+            'CONFIG': {
+                'hosts': CHANNEL_REDIS_URLS,
+                'prefix': os.getenv('CHANNEL_LAYER_PREFIX', 'asgi'),
+            },
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+            'CONFIG': {
+                'capacity': CHANNEL_LAYER_CAPACITY,
+                'expiry': CHANNEL_LAYER_EXPIRY,
+                'group_expiry': CHANNEL_LAYER_GROUP_EXPIRY,
+            },
+        }
     }
-}
 
 # WebSocket için authentication ayarları
 CHANNEL_AUTHENTICATION = {
@@ -335,8 +433,24 @@ CHANNEL_AUTHENTICATION = {
 CHANNEL_SETTINGS = {
     'PING_INTERVAL': 30,  # saniye
     'PING_TIMEOUT': 20,   # saniye
+    # İstemci mesajları: bağlantı başına ve (gruba iletilenler için) grup başına token bucket
+    'CLIENT_RATE': float(os.getenv('WS_CLIENT_RATE', '5')),    # mesaj/saniye
+    'CLIENT_BURST': int(os.getenv('WS_CLIENT_BURST', '10')),
+    'GROUP_RATE': float(os.getenv('WS_GROUP_RATE', '20')),
+    'GROUP_BURST': int(os.getenv('WS_GROUP_BURST', '40')),
+    'CLIENT_MAX_THROTTLED': int(os.getenv('WS_CLIENT_MAX_THROTTLED', '100')),  # sonra bağlantı kapanır
+    # Bağlantı başına bekleyen giden çerçeve sayısı
+    'OUTBOUND_QUEUE_SIZE': int(os.getenv('WS_OUTBOUND_QUEUE_SIZE', '32')),
 }
 
+# CV izleyici sayısı yayınları arasındaki en kısa süre (saniye)
+CV_PRESENCE_INTERVAL = float(os.getenv('CV_PRESENCE_INTERVAL', '2'))
+
+# Canlı önizleme bildirimleri: bu pencere (saniye) içinde gelen kayıtlar tek yayına
+# birleştirilir, ilk kayıttan en geç MAX_LATENCY saniye sonra yayın yapılır. 0 kapatır.
+CV_NOTIFY_COALESCE_WINDOW = float(os.getenv('CV_NOTIFY_COALESCE_WINDOW', '0.25'))
+CV_NOTIFY_MAX_LATENCY = float(os.getenv('CV_NOTIFY_MAX_LATENCY', '1.0'))
+
 # WebSocket için güvenlik ayarları
 CHANNEL_SECURITY = {
     'ALLOWED_HOSTS': [
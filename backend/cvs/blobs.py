@@ -0,0 +1,121 @@
+"""
+İçerik adresli dosya deposu (sertifika belgeleri).
+
+Dosyalar `blobs/<sha256[:2]>/<sha256><uzantı>` altında bir kez saklanır; aynı
+diploma tekrar veya başka bir CV'ye yüklendiğinde mevcut dosyanın referans
+sayısı artırılır ve aynı URL kullanılır. Hash, yükleme sırasında upload
+handler'larda hesaplanır (cvs.upload_handlers); yoksa dosya parça parça okunur.
+
+Referans sayısı StoredBlob satırı kilitlenerek değiştirilir. Son referans
+bırakıldığında satır silinir ve dosya ancak transaction commit edildikten sonra
+depolamadan kaldırılır; aynı anda aynı içerik yeniden yüklenirse yeni bir
+satır ve dosya oluşur, silinen eski dosyayı kimse göstermez.
+"""
+import hashlib
+import logging
+import os
+import re
+
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+
+from .models import StoredBlob
+
+logger = logging.getLogger(__name__)
+
+BLOB_PREFIX = 'blobs'
+
+
+def file_digest(file):
+    """(sha256, boyut); yükleme sırasında hesaplanmışsa tekrar okunmaz"""
+    digest = getattr(file, 'sha256', None)
+    if digest:
+        return digest, file.size
+
+    sha256 = hashlib.sha256()
+    size = 0
+    for chunk in file.chunks():
+        sha256.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+    return sha256.hexdigest(), size
+
+
+def blob_name(digest, filename):
+    extension = os.path.splitext(filename or '')[1].lower()
+    if not re.fullmatch(r'\.[a-z0-9]{1,8}', extension):
+        extension = ''
+    return f'{BLOB_PREFIX}/{digest[:2]}/{digest}{extension}'
+
+
+def _acquire(digest):
+    """Mevcut blob'un referans sayısını artırır; yoksa None"""
+    with transaction.atomic():
+        blob = StoredBlob.objects.select_for_update().filter(sha256=digest).first()
+        if blob is None:
+            return None
+        blob.ref_count += 1
+        blob.save(update_fields=['ref_count', 'updated_at'])
+        return blob
+
+
+def store_blob(file, content_type=''):
+    """
+    Dosyayı içerik adresli olarak saklar ve bir referans ekler.
+
+    Returns:
+        StoredBlob: name alanı default_storage içindeki yoldur
+    """
+    digest, size = file_digest(file)
+    blob = _acquire(digest)
+    if blob is not None:
+        logger.info(f"Reusing blob {blob.name} ({blob.ref_count} references)")
+        return blob
+
+    name = default_storage.save(blob_name(digest, file.name), file)
+    try:
+        with transaction.atomic():
+            return StoredBlob.objects.create(
+                sha256=digest,
+                name=name,
+                size=size,
+                content_type=content_type or getattr(file, 'content_type', '') or '',
+                ref_count=1,
+            )
+    except IntegrityError:
+        # Aynı içerik eşzamanlı yüklendi; kazanan dosyayı kullan, bizimkini sil
+        blob = _acquire(digest)
+        if blob is None:
+            raise
+        if blob.name != name:
+            default_storage.delete(name)
+        return blob
+
+
+def release_blob(name):
+    """
+    Bir referansı bırakır; son referanssa blob commit sonrasında silinir.
+
+    Returns:
+        bool: name bir blob ise True (değilse çağıran dosyayı kendisi yönetir)
+    """
+    with transaction.atomic():
+        blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+        if blob is None:
+            return False
+        if blob.ref_count > 1:
+            blob.ref_count -= 1
+            blob.save(update_fields=['ref_count', 'updated_at'])
+            return True
+        blob.delete()
+        transaction.on_commit(lambda: delete_stored_file(name))
+    return True
+
+
+def delete_stored_file(name):
+    """Dosyayı depolamadan siler; hata loglanır (kalan dosya yetim dosya olarak temizlenir)"""
+    try:
+        default_storage.delete(name)
+        logger.info(f"Deleted unreferenced file {name}")
+    except Exception as e:
+        logger.error(f"Error deleting {name}: {str(e)}")
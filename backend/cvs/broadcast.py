@@ -0,0 +1,177 @@
+"""
+CV güncellemelerinin WebSocket gruplarına yayını.
+
+Her grup için en son yayınlanan veri ve sürümü önbellekte tutulur. Yeni yayında
+bu veriyle arasındaki fark RFC 6902 patch olarak hesaplanır ve olaya eklenir;
+delta modundaki bağlantılar, elindeki sürüm patch'in base_version'ıyla ve
+elindeki içeriğin özeti patch tabanının özetiyle (base_hash) eşleşiyorsa tam veri
+yerine sadece `{version, base_version, patch}` alır. Aynı sürüm farklı kurulmuş
+olabilir (ör. bağlantı anındaki veri göreli URL'lerle); özet eşleşmeyen
+bağlantılara tam veri gönderilir.
+
+İstemcilerin gruba ilettiği mesajlar da (build_relay_event) aynı şekilde
+gönderen tarafta bir kez kodlanır.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import InMemoryChannelLayer, get_channel_layer
+from django.core.cache import cache
+
+from .frames import encode_frame
+from .json_patch import make_patch
+
+logger = logging.getLogger(__name__)
+
+# Her yayında değişen, patch'e katılmayan alanlar
+META_FIELDS = {'action', 'timestamp', 'version', 'job_id', 'failed_languages'}
+LAST_BROADCAST_TIMEOUT = 60 * 60 * 24
+
+# Consumer'ların çalıştığı sunucu event loop'u (bkz. register_server_loop, send_to_group)
+_server_loop = None
+
+
+def _last_broadcast_key(group_name):
+    return f'cv:broadcast:{group_name}'
+
+
+def _content(data):
+    return {key: value for key, value in data.items() if key not in META_FIELDS}
+
+
+def payload_hash(data):
+    """Yayın veya bağlantı anındaki verinin meta alanlar hariç özeti"""
+    encoded = json.dumps(_content(data), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def build_patch(group_name, data, version, digest=None):
+    """
+    Grubun son yayınına göre patch'i hesaplar ve yeni veriyi son yayın olarak kaydeder.
+    Patch tam veriden küçük değilse veya önceki yayın bilinmiyorsa None döner.
+    """
+    content = _content(data)
+    digest = digest or payload_hash(data)
+    last = cache.get(_last_broadcast_key(group_name))
+    cache.set(
+        _last_broadcast_key(group_name),
+        {'version': version, 'data': content, 'hash': digest},
+        LAST_BROADCAST_TIMEOUT
+    )
+
+    if not last or version is None or last['version'] == version:
+        return None
+
+    ops = make_patch(last['data'], content)
+    if len(encode_frame(ops)) >= len(encode_frame(content)):
+        return None
+    return {
+        'base_version': last['version'],
+        'base_hash': last.get('hash') or payload_hash(last['data']),
+        'ops': ops,
+    }
+
+
+def build_event(group_name, data, version):
+    """
+    Yayın olayını üretir. Çerçeveler burada bir kez kodlanır; consumer'lar
+    alıcıya göre değiştirmeden aynen iletir. Olayın kendisi sadece küçük bir
+    zarftır: sürüm, patch tabanı ve hazır çerçeveler.
+    """
+    frame = dict(data, _websocket_update=True, _update_timestamp=str(time.time()))
+    event = {
+        'type': 'cv_update',
+        'version': version,
+        'content_hash': payload_hash(data),
+        'frame': encode_frame(frame),
+    }
+
+    try:
+        patch = build_patch(group_name, data, version, event['content_hash'])
+    except Exception as e:
+        logger.error(f"Error building patch for {group_name}: {str(e)}")
+        patch = None
+    if patch:
+        event['base_version'] = patch['base_version']
+        event['base_hash'] = patch['base_hash']
+        event['patch_frame'] = encode_frame({
+            'type': 'patch',
+            'version': version,
+            'base_version': patch['base_version'],
+            'patch': patch['ops'],
+        })
+    return event
+
+
+def relay_frame(message):
+    """
+    İstemciden gruba iletilen mesajın çerçeve içeriği. Sürüm sadece sunucu
+    yayınlarına aittir; istemcinin gönderdiği `version` alanı çıkarılır.
+    Sözlük veya metin olmayan mesajlar için None döner.
+    """
+    if isinstance(message, str):
+        return {'message': message, 'type': 'string_message'}
+    if not isinstance(message, dict):
+        return None
+    frame = {key: value for key, value in message.items() if key != 'version'}
+    frame['_websocket_update'] = True
+    frame['_update_timestamp'] = str(time.time())
+    return frame
+
+
+def build_relay_event(message):
+    """
+    İstemci mesajının yayın olayı; çerçeve gönderen consumer'da bir kez kodlanır.
+    `relayed` olayları sürümsüzdür ve alıcıların sent_version değerine dokunmaz.
+    """
+    frame = relay_frame(message)
+    if frame is None:
+        return None
+    return {'type': 'cv_update', 'relayed': True, 'frame': encode_frame(frame)}
+
+
+def register_server_loop(loop):
+    """Consumer bağlanırken sunucunun event loop'unu kaydeder"""
+    global _server_loop
+    _server_loop = loop
+
+
+def send_to_group(group_name, event):
+    """
+    Olayı senkron bağlamlardan (istek, çeviri worker'ı veya birleştirici
+    zamanlayıcısı thread'leri) gruba gönderir.
+
+    Redis katmanları her thread ve event loop'tan kullanılabilir. Süreç içi katman
+    (InMemoryChannelLayer) ise kuyruklarını consumer'ların loop'unda tutar;
+    async_to_sync başka bir thread'de yeni bir loop açacağı için gönderim sunucu
+    loop'una devredilir. Bu süreçte hiç consumer bağlanmadıysa süreç içi katmanda
+    alıcı da yoktur ve olay atılır.
+    """
+    channel_layer = get_channel_layer()
+    if not isinstance(channel_layer, InMemoryChannelLayer):
+        async_to_sync(channel_layer.group_send)(group_name, event)
+        return
+
+    loop = _server_loop
+    if loop is None or loop.is_closed():
+        logger.debug(f"No server loop for in-memory channel layer, dropping event for {group_name}")
+        return
+
+    def report(future):
+        if future.exception() is not None:
+            logger.error(f"Error sending event to {group_name}: {str(future.exception())}")
+
+    # Sıra korunur: olaylar loop'a gönderildikleri sırayla çalışır
+    asyncio.run_coroutine_threadsafe(channel_layer.group_send(group_name, event), loop).add_done_callback(report)
+
+
+def broadcast_cv_update(group_name, data, version):
+    """
+    CV verisini gruba yayınlar (senkron bağlamlardan). Olay tam veriyi ve
+    mümkünse patch'i birlikte taşır; hangisinin gönderileceğine consumer karar verir.
+    """
+    send_to_group(group_name, build_event(group_name, data, version))
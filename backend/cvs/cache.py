@@ -0,0 +1,77 @@
+"""
+Herkese açık CV endpoint'i için sürümlü yanıt önbelleği.
+
+Her CV için önbellekte bir sürüm sayacı tutulur. CV veya çevirilerinden biri
+kaydedildiğinde (sinyaller ve sertifika/video action'ları üzerinden) sayaç
+yenilenir; önbellek anahtarları sürümü içerdiği için eski kayıtlar kendiliğinden
+kullanılmaz hale gelir ve TTL ile düşer. Sürüm, değişikliğin mikro saniye
+cinsinden zamanıdır; ETag ve Last-Modified başlıkları da buradan üretilir.
+"""
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+PUBLIC_CV_CACHE_TIMEOUT = getattr(settings, 'PUBLIC_CV_CACHE_TIMEOUT', 60 * 60)
+VERSION_TIMEOUT = None  # Sürüm sayacı süresiz tutulur
+
+
+def _version_key(cv_id):
+    return f'cv:{cv_id}:version'
+
+
+def _new_version():
+    return time.time_ns() // 1000
+
+
+def get_cv_version(cv_id):
+    """CV'nin güncel sürümü; önbellekte yoksa şimdiki zamanla başlatılır"""
+    version = cache.get(_version_key(cv_id))
+    if version is None:
+        cache.add(_version_key(cv_id), _new_version(), VERSION_TIMEOUT)
+        version = cache.get(_version_key(cv_id))
+    return version
+
+
+def bump_cv_version(cv_id):
+    """CV'ye ait tüm önbellek kayıtlarını geçersiz kılar"""
+    cache.set(_version_key(cv_id), _new_version(), VERSION_TIMEOUT)
+
+
+def version_last_modified(version):
+    """Sürümden Last-Modified zamanını (UTC datetime) üretir"""
+    return datetime.fromtimestamp(version / 1_000_000, tz=dt_timezone.utc)
+
+
+def public_cv_cache_key(cv_id, translation_key, lang, template_id, version, host=''):
+    return f'cv:{cv_id}:public:{translation_key}:{lang}:{template_id}:{host}:{version}'
+
+
+def public_cv_etag(cv_id, translation_key, lang, template_id, version):
+    return f'"{cv_id}-{translation_key}-{lang}-{template_id}-{version}"'
+
+
+def is_not_modified(request, etag, last_modified):
+    """
+    İstemcinin elindeki kopya hâlâ geçerli mi? If-None-Match varsa sadece ona,
+    yoksa If-Modified-Since'e bakılır (RFC 7232).
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags or f'W/{etag}' in etags
+
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+    if if_modified_since is not None:
+        return int(last_modified.timestamp()) <= if_modified_since
+    return False
+
+
+def set_validators(response, etag, last_modified):
+    """Yanıta ETag, Last-Modified ve tekrar doğrulama zorunlu Cache-Control ekler"""
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified.timestamp())
+    response['Cache-Control'] = 'public, no-cache'
+    return response
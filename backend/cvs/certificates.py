@@ -0,0 +1,279 @@
+"""
+Sertifika değişikliklerinin tüm çevirilere uygulanması.
+
+Sertifikalar her dilin `certificates` JSON alanında tekrarlanır. Değişiklik tüm
+çevirilere transaction içinde tek bir bulk_update(['certificates']) ile yazılır;
+satırlar select_for_update ile kilitlendiği için eşzamanlı iki yükleme birbirinin
+sertifikasını ezmez. bulk_update post_save sinyali göndermediği için herkese açık
+CV sürümü commit sonrasında burada artırılır.
+
+Belgeler içerik adresli depoda (cvs.blobs) tutulur; her sertifika kullandığı
+blob için bir referanstır (çeviri sayısından bağımsız). Blob'a ait olmayan eski
+yollar (certificates/...) doğrudan silinir. Çevirilerin normal kaydıyla
+(save) sertifika listesinden çıkan belgeler cvs.signals üzerinden
+release_dropped_documents ile bırakılır.
+
+Her işlem depolama ve veritabanı sürelerini döndürür (bkz. server_timing).
+"""
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .blobs import delete_stored_file, release_blob, store_blob
+from .cache import bump_cv_version
+from .models import CVTranslation
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif')
+
+
+class Timings(dict):
+    """Aşama başına milisaniye cinsinden süreler"""
+
+    def measure(self, name, started):
+        self[name] = self.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+def server_timing(timings):
+    """Server-Timing header değeri"""
+    return ', '.join(f'{name};dur={duration:.1f}' for name, duration in timings.items())
+
+
+def document_type(filename):
+    """Dosya adından 'pdf' veya 'image'; desteklenmiyorsa None"""
+    filename = (filename or '').lower()
+    if filename.endswith('.pdf'):
+        return 'pdf'
+    if filename.endswith(IMAGE_EXTENSIONS):
+        return 'image'
+    return None
+
+
+def storage_name(document_url):
+    """Depolamadaki dosyanın adı; URL bu depolamaya ait değilse None"""
+    if document_url and document_url.startswith(settings.MEDIA_URL):
+        return document_url[len(settings.MEDIA_URL):]
+    return None
+
+
+def _store(file, timings):
+    """Dosyayı blob olarak saklar (aynı içerik varsa yüklenmez); (blob adı, URL)"""
+    started = time.perf_counter()
+    blob = store_blob(file)
+    timings.measure('storage', started)
+    return blob.name, default_storage.url(blob.name)
+
+
+def _release_files(names, timings):
+    """Her ad için bir referans bırakır; blob olmayan eski dosyalar silinir"""
+    started = time.perf_counter()
+    for name in names:
+        try:
+            if not release_blob(name):
+                # Blob öncesi dosya: commit sonrasında silinir (S3 silme işlemi dosya
+                # yoksa da başarılıdır; exists kontrolü yapılmaz)
+                transaction.on_commit(lambda name=name: delete_stored_file(name))
+        except Exception as e:
+            logger.error(f"Error releasing certificate document {name}: {str(e)}")
+    timings.measure('storage', started)
+
+
+def _apply(cv, mutate, timings):
+    """
+    mutate(certificates) listeyi yerinde değiştirir ve değişiklik olup olmadığını
+    döndürür. Değişen çeviriler tek sorguda yazılır.
+
+    Returns:
+        int: güncellenen çeviri sayısı
+    """
+    started = time.perf_counter()
+    with transaction.atomic():
+        translations = list(
+            CVTranslation.objects.select_for_update()
+            .filter(cv=cv)
+            .only('id', 'cv_id', 'language_code', 'certificates')
+        )
+        changed = []
+        for translation in translations:
+            translation.certificates = translation.certificates or []
+            if mutate(translation.certificates):
+                changed.append(translation)
+        if changed:
+            CVTranslation.objects.bulk_update(changed, ['certificates'])
+            transaction.on_commit(lambda: bump_cv_version(cv.id))
+    timings.measure('db', started)
+    return len(changed)
+
+
+def _apply_or_release(cv, mutate, timings, name):
+    """_apply; veritabanı yazılamazsa yeni dosyanın referansı geri bırakılır"""
+    try:
+        return _apply(cv, mutate, timings)
+    except Exception:
+        _release_files([name], timings)
+        raise
+
+
+def certificate_references(certificates):
+    """Sertifika listesindeki belge referansları: {(sertifika id, depolama adı)}"""
+    references = set()
+    for cert in certificates or []:
+        if not isinstance(cert, dict):
+            continue
+        name = storage_name(cert.get('document_url'))
+        if name:
+            references.add((str(cert.get('id')), name))
+    return references
+
+
+def release_cv_documents(cv):
+    """
+    CV silinirken sertifika belgelerinin referanslarını bırakır (sertifika başına
+    bir kez). Referanslar çeviriler silinmeden okunur, ancak silme commit
+    edildikten sonra bırakılır; silme geri alınırsa referans sayıları değişmez.
+    """
+    references = set()
+    for certificates in CVTranslation.objects.filter(cv=cv).values_list('certificates', flat=True):
+        references |= certificate_references(certificates)
+    if references:
+        names = [name for _, name in references]
+        transaction.on_commit(lambda: _release_files(names, Timings()))
+
+
+def release_dropped_documents(translation, old_certificates):
+    """
+    Çeviri kaydedilirken (CV düzenleme, çeviri işi) sertifika listesinden çıkan
+    belgelerin referanslarını commit sonrasında bırakır. Referans CV başınadır:
+    belge CV'nin başka bir çevirisinde (henüz çevrilmemiş diller dahil) hâlâ
+    geçiyorsa bırakılmaz; son çeviriden de çıktığında bırakılır. Aynı dosyayı
+    başka bir sertifika kullanıyorsa da bırakılmaz (fazla bırakmak dosyayı
+    silebilir; kalan fark cleanup_orphaned_media --fix-refcounts ile düzelir).
+    """
+    dropped = certificate_references(old_certificates) - certificate_references(translation.certificates)
+    if not dropped:
+        return
+
+    in_use = {name for _, name in certificate_references(translation.certificates)}
+    others = CVTranslation.objects.filter(cv_id=translation.cv_id).exclude(pk=translation.pk)
+    for certificates in others.values_list('certificates', flat=True):
+        in_use |= {name for _, name in certificate_references(certificates)}
+
+    names = [name for _, name in dropped if name not in in_use]
+    if names:
+        transaction.on_commit(lambda: _release_files(names, Timings()))
+
+
+def _find(certificates, certificate_id):
+    for cert in certificates:
+        if str(cert.get('id')) == str(certificate_id):
+            return cert
+    return None
+
+
+def add_certificate(cv, file):
+    """
+    Dosyayı kaydeder ve yeni sertifikayı tüm çevirilere ekler.
+
+    Returns:
+        tuple: (sertifika verisi, Timings)
+
+    Raises:
+        ValueError: dosya tipi desteklenmiyorsa
+    """
+    doc_type = document_type(file.name)
+    if doc_type is None:
+        raise ValueError('Invalid file type. Only PDF and images are allowed.')
+
+    timings = Timings()
+    certificate_id = str(uuid.uuid4())
+    name, file_url = _store(file, timings)
+    certificate_data = {
+        'id': certificate_id,
+        'name': 'Untitled Certificate',
+        'issuer': 'Unknown Issuer',
+        'description': '',
+        'date': timezone.now().date().isoformat(),
+        'document_url': file_url,
+        'document_type': doc_type
+    }
+
+    def mutate(certificates):
+        certificates.append(certificate_data.copy())
+        return True
+
+    updated = _apply_or_release(cv, mutate, timings, name)
+    logger.info(f"Added certificate {certificate_id} to {updated} translation(s) of CV {cv.id}: {server_timing(timings)}")
+    return certificate_data, timings
+
+
+def attach_certificate_document(cv, certificate_id, file):
+    """
+    Sertifikanın belgesini tüm çevirilerde yeni dosyayla değiştirir; önceki
+    dosya commit sonrasında silinir.
+
+    Returns:
+        tuple: (document_url, document_type, Timings)
+    """
+    doc_type = document_type(file.name)
+    if doc_type is None:
+        raise ValueError('Invalid file type. Only PDF and images are allowed.')
+
+    timings = Timings()
+    name, file_url = _store(file, timings)
+    replaced = set()
+
+    def mutate(certificates):
+        cert = _find(certificates, certificate_id)
+        if cert is None:
+            return False
+        # Aynı blob tekrar yüklendiyse de eski referans bırakılır (yenisi eklendi)
+        old_name = storage_name(cert.get('document_url'))
+        if old_name:
+            replaced.add(old_name)
+        cert['document_url'] = file_url
+        cert['document_type'] = doc_type
+        return True
+
+    updated = _apply_or_release(cv, mutate, timings, name)
+    if not updated:
+        # Sertifika bulunamadı; yeni dosyanın referansı kullanılmadı
+        _release_files([name], timings)
+    if replaced:
+        _release_files(replaced, timings)
+    logger.info(f"Replaced document of certificate {certificate_id} in {updated} translation(s) of CV {cv.id}: {server_timing(timings)}")
+    return file_url, doc_type, timings
+
+
+def remove_certificate_document(cv, certificate_id):
+    """
+    Sertifikanın belgesini tüm çevirilerden kaldırır; dosya her yol için bir kez
+    ve ancak veritabanı değişikliği kalıcı olduktan sonra silinir.
+
+    Returns:
+        Timings
+    """
+    timings = Timings()
+    removed = set()
+
+    def mutate(certificates):
+        cert = _find(certificates, certificate_id)
+        if cert is None or not (cert.get('document_url') or cert.get('document_type')):
+            return False
+        name = storage_name(cert.get('document_url'))
+        if name:
+            removed.add(name)
+        cert['document_url'] = None
+        cert['document_type'] = None
+        return True
+
+    updated = _apply(cv, mutate, timings)
+    if removed:
+        _release_files(removed, timings)
+    logger.info(f"Removed document of certificate {certificate_id} from {updated} translation(s) of CV {cv.id}: {server_timing(timings)}")
+    return timings
@@ -0,0 +1,108 @@
+"""
+Canlı önizleme bildirimleri için birleştirici (coalescer).
+
+Otomatik kayıt art arda çok sayıda güncelleme üretir; her biri ayrı yayınlanırsa
+istemciler aldıkları veriyi hemen bir sonrakiyle ezer. Birleştirici, aynı CV için
+pencere (window) içinde gelen bildirimleri tek bir yayına indirger. Yayın son
+bildirimden `window` saniye sonra yapılır, ancak ilk bekleyen bildirimden en geç
+`max_latency` saniye sonra mutlaka gönderilir. Yayın anında CV'nin en güncel hali
+yüklendiği için son sürüm gönderilmiş olur.
+
+Yayın, istek bittikten sonra zamanlayıcı thread'inden yapılır; submit'e istek
+nesnesine bağlı değerler (request, request.build_absolute_uri) değil düz değerler
+(ör. base_url metni) verilmelidir. Süreç içi kanal katmanında gönderim sunucu
+loop'una devredilir (bkz. cvs.broadcast.send_to_group).
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .topics import publish_cv_update
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    def __init__(self, first_at):
+        self.first_at = first_at
+        self.received = 0
+        self.include = set()
+        self.kwargs = {}
+        self.timer = None
+
+
+class UpdateCoalescer:
+    def __init__(self, publish, window=None, max_latency=None):
+        self.publish = publish
+        self.window = window if window is not None else getattr(settings, 'CV_NOTIFY_COALESCE_WINDOW', 0.25)
+        self.max_latency = max_latency if max_latency is not None else getattr(settings, 'CV_NOTIFY_MAX_LATENCY', 1.0)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stats = {'received': 0, 'emitted': 0, 'failed': 0}
+
+    def stats(self):
+        """Alınan bildirim ve yapılan yayın sayıları"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+        published = stats['emitted'] + stats['failed']
+        stats['reduction'] = 1 - published / stats['received'] if stats['received'] else 0.0
+        return stats
+
+    def submit(self, cv_id, include=(), **kwargs):
+        """Bildirimi kuyruğa alır; pencere 0 ise hemen yayınlar"""
+        if self.window <= 0:
+            with self._lock:
+                self._stats['received'] += 1
+            self._emit(cv_id, set(include), kwargs, 1)
+            return
+
+        with self._lock:
+            self._stats['received'] += 1
+            now = time.monotonic()
+            pending = self._pending.get(cv_id)
+            if pending is None:
+                pending = self._pending[cv_id] = _Pending(now)
+            elif pending.timer is not None:
+                pending.timer.cancel()
+
+            pending.received += 1
+            pending.include.update(include)
+            pending.kwargs = kwargs
+
+            delay = min(self.window, max(0.0, pending.first_at + self.max_latency - now))
+            pending.timer = threading.Timer(delay, self._flush, args=(cv_id, pending))
+            pending.timer.daemon = True
+            pending.timer.start()
+
+    def _flush(self, cv_id, pending):
+        with self._lock:
+            # İptal edilmeye çalışılırken tetiklenmiş eski bir zamanlayıcıysa çık
+            if self._pending.get(cv_id) is not pending:
+                return
+            del self._pending[cv_id]
+
+        try:
+            self._emit(cv_id, pending.include, pending.kwargs, pending.received)
+        finally:
+            close_old_connections()
+
+    def _emit(self, cv_id, include, kwargs, received):
+        try:
+            self.publish(cv_id, include=include, **kwargs)
+        except Exception as e:
+            logger.error(f"Error publishing coalesced update for CV {cv_id}: {str(e)}")
+            with self._lock:
+                self._stats['failed'] += 1
+            return
+
+        with self._lock:
+            self._stats['emitted'] += 1
+        logger.debug(f"Published CV {cv_id} update ({received} notification(s) coalesced)")
+
+
+# Düzenleme bildirimleri (views._notify_cv_update) bu örnek üzerinden yayınlanır
+cv_update_coalescer = UpdateCoalescer(publish_cv_update)
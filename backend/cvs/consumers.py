@@ -1,12 +1,42 @@
 import json
+from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from .models import CV, CVTranslation
+from asgiref.sync import sync_to_async
 import asyncio
+from django.conf import settings
+from .broadcast import build_relay_event, register_server_loop, relay_frame
+from .cache import get_cv_version
+from .documents import load_cv_document
+from .frames import decode_client_frame, encode_frame, negotiate_encoding, transcode_frame
+from .group_registry import group_registry
+from .presence import add_viewer, presence_broadcaster, viewer_count
+from .throttle import CLIENT_BURST, CLIENT_MAX_THROTTLED, CLIENT_RATE, OutboundQueue, TokenBucket, ws_stats
+from .topics import subscribe, unsubscribe
 from .views import get_cv_group_name
 from django.utils import timezone
 
+# İstemciden gelen ve gruba iletilmeyen kontrol mesajları
+CONTROL_ACTIONS = {'ping', 'pong', 'init', 'get_cv_data', 'sync', 'snapshot'}
+
 class CVConsumer(AsyncWebsocketConsumer):
+    """
+    Canlı CV önizlemesi.
+
+    Sunucudan istemciye: tam CV verisi (`version` alanıyla), `heartbeat`,
+    `presence`, `up_to_date` ve delta modunda (`?delta=1`)
+    `{"type": "patch", "version", "base_version", "patch": [RFC 6902 işlemleri]}`.
+    İstemciden sunucuya: `ping`, `sync` (elindeki `version` ile) ve patch
+    uygulanamadığında tam veri için `snapshot`.
+
+    İstemci mesajları hız sınırlıdır (cvs.throttle); sınır aşıldığında
+    `{"type": "throttled"}` gönderilir ve mesaj atılır. Giden çerçeveler sınırlı
+    bir kuyruktan gönderilir; geride kalan istemci eski sürümleri atlar.
+
+    `?encoding=msgpack` veya `?encoding=deflate` ile çerçeveler binary olarak
+    gönderilir (bkz. cvs.frames); parametre yoksa JSON text çerçeveler kullanılır.
+    """
+
     async def connect(self):
         try:
             # print("="*50)
@@ -21,6 +51,12 @@ class CVConsumer(AsyncWebsocketConsumer):
             
             # template_id parametresi varsa al, yoksa varsayılan değer kullan
             self.template_id = self.scope['url_route']['kwargs'].get('template_id', '1')
+
+            # ?delta=1 ile bağlanan istemciler güncellemeleri JSON Patch olarak alır
+            query = parse_qs(self.scope.get('query_string', b'').decode())
+            self.delta = query.get('delta', ['0'])[0].lower() in ('1', 'true')
+            # ?encoding=msgpack|deflate ile kompakt binary çerçeveler
+            self.encoding = negotiate_encoding(query.get('encoding', [''])[0])
             
             # print(f"Connection parameters: template_id={self.template_id}, cv_id={self.cv_id}, translation_key={self.translation_key}, lang={self.lang}")
             
@@ -31,48 +67,49 @@ class CVConsumer(AsyncWebsocketConsumer):
             # Channel layer bilgilerini kontrol et
             # print(f"Channel layer type: {type(self.channel_layer).__name__}")
             
+            # Thread'lerden yapılan yayınlar süreç içi katmanda bu loop'a devredilir
+            register_server_loop(asyncio.get_running_loop())
+
+            # Süreç içi grup kaydına katıl (paylaşılan CV verisi)
+            group_registry.join(self.group_name)
+            self.registered = True
+
             # Gruba katıl
             await self.channel_layer.group_add(
                 self.group_name,
                 self.channel_name
             )
             
+            # İstemci mesajları için hız sınırı
+            self.rate_limit = TokenBucket(CLIENT_RATE, CLIENT_BURST)
+            self.throttled = 0
+            self.throttle_notified = False
+
             await self.accept()
             # print("WebSocket connection accepted")
             # print(f"Channel name: {self.channel_name}")
             # print("="*50)
 
-            # Ping/pong mekanizmasını başlat
-            self.ping_task = asyncio.create_task(self.send_ping())
+            # Bu bağlantıya en son gönderilen (kuyruğa alınan) CV sürümü ve içeriğin özeti
+            self.sent_version = None
+            self.sent_hash = None
+
+            # Giden çerçeveler bu kuyruktan ayrı bir task ile gönderilir
+            self.outbound = OutboundQueue()
+            self.writer_task = asyncio.create_task(self.drain_outbound())
+
+            # Heartbeat mekanizmasını başlat
+            self.heartbeat_task = asyncio.create_task(self.send_heartbeat())
             
-            # Bağlantı başarılı olduğunda CV verilerini gönder
-            cv_data = await self.get_cv_data()
-            if cv_data:
-                await self.send(text_data=json.dumps(cv_data))
+            # Başlangıç verisi sadece bağlanan istemciye gönderilir
+            snapshot = await self.send_snapshot()
+            if snapshot:
                 # print("Initial CV data sent to client")
-                
-                # Bağlantı kurulduğunda gruba bir test mesajı gönder
-                await self.channel_layer.group_send(
-                    self.group_name,
-                    {
-                        'type': 'cv_update',
-                        'message': {
-                            'id': cv_data['id'],
-                            'title': cv_data['title'],
-                            'action': 'test_connection',
-                            'timestamp': str(timezone.now().timestamp()),
-                            'message': 'This is a test message to verify group messaging is working',
-                            'personal_info': cv_data['personal_info'],
-                            'education': cv_data['education'],
-                            'experience': cv_data['experience'],
-                            'skills': cv_data['skills'],
-                            'languages': cv_data['languages'],
-                            'certificates': cv_data['certificates'],
-                            'video_info': cv_data['video_info']
-                        }
-                    }
-                )
-                # print("Test message sent to group after connection")
+                # Diğer izleyicilere sadece güncel izleyici sayısı gider
+                await self.update_presence(1)
+
+                # CV'nin yayın konusuna abone ol (diğer şablon/dillerdeki düzenlemeler de gelsin)
+                await sync_to_async(subscribe)(self.cv_id, self.template_id, self.lang)
             else:
                 # print("No CV data available to send")
                 await self.close()
@@ -88,9 +125,25 @@ class CVConsumer(AsyncWebsocketConsumer):
         # print(f"Close code: {close_code}")
         # print(f"Group name: {self.group_name}")
         
-        # Ping task'ı iptal et
-        if hasattr(self, 'ping_task'):
-            self.ping_task.cancel()
+        # Heartbeat task'ı iptal et
+        if hasattr(self, 'heartbeat_task'):
+            self.heartbeat_task.cancel()
+        if hasattr(self, 'writer_task'):
+            self.writer_task.cancel()
+
+        # İzleyici sayısını azalt
+        if getattr(self, 'counted', False):
+            await self.update_presence(-1)
+
+        # Grup kaydından çık; son bağlantıysa paylaşılan veri silinir
+        if getattr(self, 'registered', False):
+            group_registry.leave(self.group_name)
+            self.registered = False
+
+            # Bu süreçte grubu izleyen kalmadıysa abonelikten çık. Başka süreçlerdeki
+            # izleyiciler bir sonraki heartbeat'te grubu tekrar ekler.
+            if not group_registry.viewer_count(self.group_name):
+                await sync_to_async(unsubscribe)(self.cv_id, self.template_id, self.lang)
             
         # Gruptan ayrıl
         await self.channel_layer.group_discard(
@@ -100,10 +153,23 @@ class CVConsumer(AsyncWebsocketConsumer):
         # print("Disconnected from group")
         # print("="*50)
 
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
+        # Bağlantı başına hız sınırı (ping dahil tüm mesajlar)
+        if not self.rate_limit.allow():
+            await self.reject_throttled('connection')
+            return
+        self.throttle_notified = False
+
+        # Binary çerçeveler bağlantının kodlamasıyla çözülür
+        if bytes_data is not None:
+            text_data = decode_client_frame(bytes_data, self.encoding)
+            if text_data is None:
+                ws_stats['invalid'] += 1
+                return
+
         # Ping mesajını kontrol et ve sessizce işle
         if text_data == "ping":
-            await self.send(text_data="pong")
+            self.outbound.put("pong")
             return
             
         # Normal mesajlar için log yazdır
@@ -119,14 +185,11 @@ class CVConsumer(AsyncWebsocketConsumer):
             
             # Mesaj tipini kontrol et
             message_type = text_data_json.get('type')
+            control_action = message_type or text_data_json.get('action')
             
-            # Ping mesajı kontrolü
-            if message_type == 'ping':
-                # print("Client ping received, sending pong")
-                await self.send(text_data=json.dumps({
-                    'type': 'pong',
-                    'timestamp': text_data_json.get('timestamp')
-                }))
+            # Kontrol mesajları bu bağlantıda cevaplanır, gruba iletilmez
+            if control_action in CONTROL_ACTIONS:
+                await self.handle_control(control_action, text_data_json)
                 return
             
             # Normal mesaj kontrolü
@@ -136,51 +199,20 @@ class CVConsumer(AsyncWebsocketConsumer):
             if message:
                 # print(f"Parsed message: {message}")
                 
-                # Mesaj bir string ise
-                if isinstance(message, str):
-                    await self.channel_layer.group_send(
-                        self.group_name,
-                        {
-                            'type': 'cv_update',
-                            'message': message
-                        }
-                    )
-                    # print("String message sent to group")
-                # Mesaj bir sözlük ise
-                else:
-                    await self.channel_layer.group_send(
-                        self.group_name,
-                        {
-                            'type': 'cv_update',
-                            'message': message
-                        }
-                    )
-                    # print("Dictionary message sent to group")
+                await self.relay(message)
+                # print("Message sent to group")
             else:
                 # print("Warning: 'message' field not found in the received data")
                 # Eğer mesaj alanı yoksa, tüm veriyi mesaj olarak kabul et
                 if message_type != 'ping' and message_type != 'pong':
-                    await self.channel_layer.group_send(
-                        self.group_name,
-                        {
-                            'type': 'cv_update',
-                            'message': text_data_json
-                        }
-                    )
+                    await self.relay(text_data_json)
                     # print("Full JSON data sent to group as message")
             
             # print("="*50)
         except json.JSONDecodeError as e:
             # print(f"Error decoding JSON: {str(e)}")
-            # JSON decode hatası durumunda, raw mesajı gönder
-            await self.channel_layer.group_send(
-                self.group_name,
-                {
-                    'type': 'cv_update',
-                    'message': text_data
-                }
-            )
-            # print("Raw text sent to group as message")
+            # Geçersiz JSON gruba iletilmez
+            ws_stats['invalid'] += 1
         except Exception as e:
             # print(f"Error processing message: {str(e)}")
             import traceback
@@ -188,214 +220,201 @@ class CVConsumer(AsyncWebsocketConsumer):
             pass
 
     async def cv_update(self, event):
+        # Önceden kodlanmış yayınlar (cvs.broadcast) aynen iletilir
+        if 'frame' in event:
+            await self.forward_frame(event)
+            return
+
+        # Eski biçimdeki olaylar (ör. deploy sırasında eski süreçlerin ilettiği
+        # istemci mesajları) alıcıda kodlanır; sürümleri dikkate alınmaz
+        frame = relay_frame(event.get('message'))
+        if frame is not None:
+            self.outbound.put(encode_frame(frame))
+
+    async def forward_frame(self, event):
+        """
+        Yayın çerçevesini kopyalamadan ve yeniden kodlamadan gönderir. Delta
+        modunda istemcideki sürüm ve içerik özeti patch'in tabanıyla eşleşiyorsa
+        sadece patch gider; aynı sürümün farklı kurulmuş bir hali elindeyse tam veri gider.
+        """
+        if event.get('relayed'):
+            # İstemci mesajı: CV durumu taşımaz, sürüm kontrolü yapılmaz
+            self.outbound.put(event['frame'])
+            return
+
+        version = event.get('version')
+        if version is not None and self.sent_version is not None and version <= self.sent_version:
+            return
+
+        if (
+            self.delta
+            and 'patch_frame' in event
+            and version is not None
+            and event.get('base_version') == self.sent_version
+            and event.get('base_hash') == self.sent_hash
+            # Kuyruk doluysa patch yerine tam veri gider ve eski çerçeveler atılır
+            and self.outbound.put_patch(event['patch_frame'])
+        ):
+            self.sent_version = version
+            self.sent_hash = event.get('content_hash')
+            return
+
+        if version is not None:
+            self.sent_version = version
+            self.sent_hash = event.get('content_hash')
+        self.outbound.put_snapshot(event['frame'])
+
+    async def relay(self, message):
+        """İstemci mesajını gruba iletir; grup başına sınır aşıldıysa mesaj atılır"""
+        if not group_registry.relay_allowed(self.group_name):
+            await self.reject_throttled('group')
+            return
+        # Çerçeve burada bir kez kodlanır; alıcılar forward_frame ile aynen iletir
+        event = build_relay_event(message)
+        if event is None:
+            ws_stats['invalid'] += 1
+            return
+        ws_stats['relayed'] += 1
+        await self.channel_layer.group_send(self.group_name, event)
+
+    async def reject_throttled(self, scope):
+        """
+        Sınırı aşan mesajı sayar. İstemciye her sınırlama döneminde bir kez
+        haber verilir; çok fazla mesajı sınırlanan bağlantı kapatılır.
+        """
+        ws_stats[f'throttled_{scope}'] += 1
+        self.throttled += 1
+        if CLIENT_MAX_THROTTLED and self.throttled >= CLIENT_MAX_THROTTLED:
+            ws_stats['closed_throttled'] += 1
+            await self.close(code=4429)
+            return
+        if not self.throttle_notified:
+            self.throttle_notified = True
+            self.outbound.put(json.dumps({'type': 'throttled', 'scope': scope}))
+
+    async def drain_outbound(self):
+        """Giden kuyruğu sırayla gönderir; istemci yavaşsa kuyruk birikir ve eski veriler atılır"""
         try:
-            # print("="*50)
-            # print("Sending CV update to client")
-            # print(f"Event data type: {type(event)}")
-            # print(f"Event keys: {event.keys()}")
-            # print(f"Event data: {event}")
-            # print(f"Channel name: {self.channel_name}")
-            # print(f"Group name: {self.group_name}")
-            
-            # Güncel CV verilerini gönder
-            message = event['message']
-            # print(f"Message type: {type(message)}")
-            
-            # Mesaj bir string ise
-            if isinstance(message, str):
-                # print(f"Message content (string): {message}")
-                # String mesajı doğrudan gönder
-                await self.send(text_data=json.dumps({"message": message, "type": "string_message"}))
-                # print("String message sent to client successfully")
-                # print("="*50)
-                return
-            
-            # Mesaj bir sözlük ise
-            # Mesajın içeriğini detaylı bir şekilde yazdır
-            # print("Message content:")
-            # print(f"  ID: {message.get('id')}")
-            # print(f"  Template ID: {message.get('template_id')}")
-            # print(f"  Title: {message.get('title')}")
-            # print(f"  Language: {message.get('language')}")
-            # print(f"  Translation Key: {message.get('translation_key')}")
-            # print(f"  Updated At: {message.get('updated_at')}")
-            # print(f"  Action: {message.get('action')}")
-            
-            # Bu bir update mesajı olduğuna dair özel alan ekleyelim
-            message['_websocket_update'] = True
-            message['_update_timestamp'] = str(timezone.now().timestamp())
-            message['_channel_name'] = self.channel_name
-            
-            # Mesajı JSON formatında gönder
-            try:
-                json_message = json.dumps(message)
-                # print(f"JSON message length: {len(json_message)} bytes")
-                # print(f"JSON message preview: {json_message[:100]}...")
-            except TypeError as e:
-                # print(f"JSON serialization error in cv_update: {str(e)}")
-                # Datetime nesnelerini string'e çevir
-                if 'created_at' in message and message['created_at'] is not None and not isinstance(message['created_at'], str):
-                    message['created_at'] = message['created_at'].isoformat() if hasattr(message['created_at'], 'isoformat') else str(message['created_at'])
-                if 'updated_at' in message and message['updated_at'] is not None and not isinstance(message['updated_at'], str):
-                    message['updated_at'] = message['updated_at'].isoformat() if hasattr(message['updated_at'], 'isoformat') else str(message['updated_at'])
-                if 'timestamp' in message and not isinstance(message['timestamp'], str):
-                    message['timestamp'] = str(message['timestamp'])
-                
-                # Tekrar dene
-                json_message = json.dumps(message)
-                # print(f"JSON message length after fixing: {len(json_message)} bytes")
-                # print(f"JSON message preview after fixing: {json_message[:100]}...")
-            
-            # WebSocket bağlantı durumunu kontrol et
-            if self.scope['type'] == 'websocket':
-                pass
-                # print(f"WebSocket connection state: {self.scope.get('state', 'unknown')}")
-                # print(f"WebSocket client: {self.scope.get('client', 'unknown')}")
-            
-            # Doğrudan client'a gönderme dene (ping yaklaşımı gibi)
-            try:
-                # print(f"Sending CV update directly to client: {self.channel_name}")
-                # Mesajı gönder
-                await self.send(text_data=json_message)
-                # print("CV update sent to client successfully (direct method)")
-            except Exception as direct_error:
-                # print(f"Error sending CV update directly to client: {str(direct_error)}")
-                # Tekrar deneyelim, basitleştirilmiş veri ile
-                try:
-                    simple_message = {
-                        'id': message.get('id'),
-                        'title': message.get('title'),
-                        'action': 'fallback_update',
-                        'message': 'CV updated but full data could not be sent. Please refresh.',
-                        '_websocket_update': True,
-                        '_fallback': True
-                    }
-                    await self.send(text_data=json.dumps(simple_message))
-                    # print("Fallback message sent to client")
-                except Exception as fallback_error:
-                    # print(f"Error sending fallback message: {str(fallback_error)}")
-                    pass
-            
-            # print("="*50)
+            while True:
+                text = await self.outbound.get()
+                if self.encoding == 'json':
+                    text_data, bytes_data = text, None
+                else:
+                    text_data, bytes_data = transcode_frame(text, self.encoding)
+                await self.send(text_data=text_data, bytes_data=bytes_data)
+                ws_stats['sent'] += 1
+                ws_stats['sent_bytes'] += len(bytes_data) if bytes_data is not None else len(text_data)
+        except asyncio.CancelledError:
+            # Task iptal edildiğinde sessizce çık
+            pass
         except Exception as e:
-            # print(f"Error sending CV update to client: {str(e)}")
-            import traceback
-            # traceback.print_exc()
+            # print(f"Error in drain_outbound: {str(e)}")
             pass
 
+    async def update_presence(self, delta):
+        """İzleyici sayısını günceller ve gruba kısıtlanmış bir presence yayını planlar"""
+        await sync_to_async(add_viewer)(self.cv_id, self.lang, delta)
+        self.counted = delta > 0
+
+        cv_id, lang, group_name = self.cv_id, self.lang, self.group_name
+        channel_layer = self.channel_layer
+
+        async def broadcast():
+            viewers = await sync_to_async(viewer_count)(cv_id, lang)
+            await channel_layer.group_send(group_name, {'type': 'presence', 'viewers': viewers})
+
+        presence_broadcaster.schedule(group_name, broadcast)
+
+    async def presence(self, event):
+        self.outbound.put(json.dumps({'type': 'presence', 'viewers': event['viewers']}))
+
+    async def handle_control(self, action, data):
+        """İstemcinin ping, init ve veri/sürüm isteklerini cevaplar"""
+        if action == 'ping':
+            self.outbound.put(json.dumps({
+                'type': 'pong',
+                'timestamp': data.get('timestamp')
+            }))
+            return
+
+        if action == 'snapshot':
+            # Patch uygulayamayan (senkronu kaybolmuş) istemci tam veri ister
+            await self.send_snapshot()
+            return
+
+        if action in ('get_cv_data', 'sync'):
+            # İstemci sürüm bildirmezse bu bağlantıya en son gönderilen sürüm esas alınır
+            client_version = data.get('version', self.sent_version)
+            current_version = await self.get_version()
+            if client_version is None or client_version != current_version:
+                if await self.send_snapshot(current_version):
+                    return
+            self.outbound.put(json.dumps({'type': 'up_to_date', 'version': client_version}))
+
+    async def send_snapshot(self, version=None):
+        """
+        Grubun paylaşılan (sürüm başına bir kez yüklenip serileştirilmiş) CV
+        verisini bu bağlantıya gönderir ve gönderilen sürümü kaydeder.
+        """
+        if version is None:
+            # Sürüm veriden önce okunur; arada gelen değişiklik bir sonraki sürümle gönderilir
+            version = await self.get_version()
+        snapshot = await group_registry.snapshot(
+            self.group_name, version, lambda: self.get_cv_data(version)
+        )
+        if snapshot is None:
+            return None
+        text, self.sent_hash = snapshot
+        self.outbound.put_snapshot(text)
+        self.sent_version = version
+        return text
+
+    @sync_to_async
+    def get_version(self):
+        return get_cv_version(self.cv_id)
+
     @database_sync_to_async
-    def get_cv_data(self):
-        # print("="*50)
-        # print("Getting CV data")
-        # print(f"Parameters: template_id={self.template_id}, cv_id={self.cv_id}, translation_key={self.translation_key}, lang={self.lang}")
-        
+    def get_cv_data(self, version):
         try:
-            cv = CV.objects.get(id=self.cv_id, translation_key=self.translation_key)
-            translation = cv.translations.filter(language_code=self.lang).first()
+            # CV, kullanıcı ve çeviriler tek sorguda
+            document = load_cv_document(self.cv_id, self.translation_key, self.lang)
+            if document is None:
+                # print("No translation found at all")
+                return None
             
-            if not translation:
-                # print(f"No translation found for language {self.lang}, trying English")
-                translation = cv.translations.filter(language_code='en').first()
-                if not translation:
-                    # print("No translation found at all")
-                    return None
-            
-            data = {
-                'id': cv.id,
-                'template_id': self.template_id,
-                'title': cv.title,
-                'language': translation.language_code,
-                'personal_info': translation.personal_info,
-                'education': translation.education,
-                'experience': translation.experience,
-                'skills': translation.skills,
-                'languages': translation.languages,
-                'certificates': translation.certificates,
-                'video_info': translation.video_info,
-                'created_at': cv.created_at.isoformat() if cv.created_at else None,
-                'updated_at': cv.updated_at.isoformat() if cv.updated_at else None,
-                'translation_key': cv.translation_key,
-                'action': 'initial',  # Başlangıç verisi olduğunu belirt
-                'timestamp': str(timezone.now().timestamp())  # Zaman damgası ekle
-            }
-
-            # Kullanıcının profil resmini ekle
-            if cv.user.profile_picture:
-                # request nesnesini scope'dan al
-                request = self.scope.get('request')
-                if request:
-                    data['personal_info']['photo'] = request.build_absolute_uri(cv.user.profile_picture.url)
-                else:
-                    data['personal_info']['photo'] = cv.user.profile_picture.url
-            
-            # Döndürülen verinin içeriğini detaylı bir şekilde yazdır
-            # print("Returned data content:")
-            # print(f"  ID: {data['id']}")
-            # print(f"  Template ID: {data['template_id']}")
-            # print(f"  Title: {data['title']}")
-            # print(f"  Language: {data['language']}")
-            # print(f"  Translation Key: {data['translation_key']}")
-            # print(f"  Updated At: {data['updated_at']}")
-            # print(f"  Action: {data['action']}")
-            # print(f"  Timestamp: {data['timestamp']}")
-            
-            # JSON serileştirme kontrolü
-            try:
-                json_data = json.dumps(data)
-                # print(f"JSON message length: {len(json_data)} bytes")
-            except TypeError as e:
-                # print(f"JSON serialization error in get_cv_data: {str(e)}")
-                # Basitleştirilmiş veri döndür
-                data = {
-                    'id': cv.id,
-                    'template_id': self.template_id,
-                    'title': cv.title,
-                    'language': translation.language_code,
-                    'action': 'initial',
-                    'timestamp': str(timezone.now())
-                }
-            
-            # print("CV data retrieved successfully")
-            # print("="*50)
-            return data
+            return document.payload(
+                self.template_id,
+                action='initial',  # Tam veri olduğunu belirt (gruptaki tüm bağlantılara aynı veri)
+                version=version,
+                timestamp=str(timezone.now().timestamp())  # Zaman damgası ekle
+            )
         except Exception as e:
             # print(f"Error in get_cv_data: {str(e)}")
-            # print("="*50)
             return None
 
-    async def send_ping(self):
-        """Her 30 saniyede bir ping gönder ve CV verilerini gönder"""
+    async def send_heartbeat(self):
+        """
+        Belirli aralıklarla küçük bir heartbeat çerçevesi gönderir. Tam veri sadece
+        değişiklik olayı geldiğinde (cv_update) veya bu bağlantının sürümü geride
+        kaldığında (ör. kaçırılmış bir olay) gönderilir.
+        """
+        interval = getattr(settings, 'CHANNEL_SETTINGS', {}).get('PING_INTERVAL', 30)
         try:
             while True:
-                await asyncio.sleep(30)
-                
-                # Normal ping mesajını gönder
-                await self.send(text_data="ping")
-                # print(f"Ping sent to client: {self.channel_name}")
-                
-                # CV verilerini al
-                cv_data = await self.get_cv_data()
-                if cv_data:
-                    # CV verilerini mesaj olarak gönder
-                    try:
-                        # Mesajı JSON formatına dönüştür
-                        json_message = json.dumps(cv_data)
-                        
-                        # Ping ile birlikte CV verilerini gönder
-                        await self.send(text_data=json_message)
-                        # print(f"CV data sent with ping: {self.channel_name}")
-                        # print(f"CV data summary: id={cv_data.get('id')}, template_id={cv_data.get('template_id')}")
-                    except Exception as json_error:
-                        # print(f"Error sending CV data with ping: {str(json_error)}")
-                        pass
-                else:
-                    # print(f"No CV data available to send with ping")
-                    pass
+                await asyncio.sleep(interval)
+
+                # Abonelik kaydını canlı tut
+                await sync_to_async(subscribe)(self.cv_id, self.template_id, self.lang)
+
+                current_version = await self.get_version()
+                if self.sent_version is not None and current_version != self.sent_version:
+                    if await self.send_snapshot(current_version):
+                        continue
+
+                self.outbound.put(json.dumps({'type': 'heartbeat', 'version': self.sent_version}))
         except asyncio.CancelledError:
             # Task iptal edildiğinde sessizce çık
             pass
         except Exception as e:
-            # print(f"Error in send_ping: {str(e)}")
-            import traceback
-            # traceback.print_exc()
-            pass 
\ No newline at end of file
+            # print(f"Error in send_heartbeat: {str(e)}")
+            pass
@@ -0,0 +1,196 @@
+"""
+CV içeriği için yapısal fark (diff) motoru.
+
+Liste alanlarında (experience, education, ...) elemanlar varsa `id` alanına göre,
+yoksa sıralarına göre eşleştirilir. Sonuç, sadece eklenen veya değişen metin
+parçalarının anahtarlarını ("experience.2.description") ve yeni elemanların eski
+listedeki karşılıklarını içerir. Böylece diğer dillere sadece değişen metinler
+çevrilir, dokunulmamış çeviriler olduğu gibi korunur.
+
+Bir alanın farkı şu yapıdadır:
+    {'mapping': [eski_index veya None, ...] (sadece liste alanları), 'changed': [anahtar, ...],
+     'length': eski listenin uzunluğu (sadece liste alanları)}
+Alanın tamamen yeniden çevrilmesi gerekiyorsa fark `None` olur.
+"""
+import copy
+
+from .services import TEXT_FIELDS, apply_texts
+
+
+def _item_id(item):
+    if isinstance(item, dict) and item.get('id') not in (None, ''):
+        return str(item['id'])
+    return None
+
+
+def match_items(old_items, new_items):
+    """Her yeni eleman için eski listedeki karşılığının index'ini (yoksa None) döndürür"""
+    old_items = old_items if isinstance(old_items, list) else []
+    old_by_id = {}
+    for idx, item in enumerate(old_items):
+        item_id = _item_id(item)
+        if item_id is not None:
+            old_by_id.setdefault(item_id, idx)
+
+    mapping = []
+    for idx, item in enumerate(new_items):
+        item_id = _item_id(item)
+        if item_id is not None:
+            mapping.append(old_by_id.get(item_id))
+        elif idx < len(old_items) and _item_id(old_items[idx]) is None:
+            mapping.append(idx)
+        else:
+            mapping.append(None)
+    return mapping
+
+
+def diff_field(field, old_value, new_value):
+    """Bir alanın eski ve yeni değeri arasındaki metin farkını hesaplar"""
+    text_fields = TEXT_FIELDS.get(field, [])
+
+    if isinstance(new_value, list):
+        old_items = old_value if isinstance(old_value, list) else []
+        mapping = match_items(old_items, new_value)
+        changed = []
+        for idx, item in enumerate(new_value):
+            if not isinstance(item, dict):
+                continue
+            old_item = old_items[mapping[idx]] if mapping[idx] is not None else {}
+            if not isinstance(old_item, dict):
+                old_item = {}
+            for text_field in text_fields:
+                if item.get(text_field) and item.get(text_field) != old_item.get(text_field):
+                    changed.append(f"{field}.{idx}.{text_field}")
+        return {'mapping': mapping, 'changed': changed, 'length': len(old_items)}
+
+    if isinstance(new_value, dict):
+        old_value = old_value if isinstance(old_value, dict) else {}
+        changed = [
+            f"{field}.{text_field}" for text_field in text_fields
+            if new_value.get(text_field) and new_value.get(text_field) != old_value.get(text_field)
+        ]
+        return {'mapping': None, 'changed': changed}
+
+    return None
+
+
+def merge_diffs(earlier, later):
+    """
+    Art arda iki farkı (orijinal -> ara, ara -> yeni) tek bir farka (orijinal -> yeni)
+    birleştirir. Henüz çalışmamış çeviri işleri birleştirilirken kullanılır.
+    """
+    merged = dict(earlier)
+    for field, later_diff in later.items():
+        if field not in earlier:
+            merged[field] = later_diff
+            continue
+
+        earlier_diff = earlier[field]
+        if earlier_diff is None or later_diff is None:
+            merged[field] = None
+            continue
+
+        later_mapping = later_diff['mapping']
+        earlier_mapping = earlier_diff['mapping']
+        changed = set(later_diff['changed'])
+
+        if later_mapping is None:
+            # Sözlük alanı: anahtarlar index içermez
+            changed.update(earlier_diff['changed'])
+            merged[field] = {'mapping': None, 'changed': sorted(changed)}
+            continue
+
+        if earlier_mapping is None:
+            merged[field] = None
+            continue
+
+        # Ara listedeki index'i yeni listedeki index'e taşı
+        new_index_by_mid = {mid: idx for idx, mid in enumerate(later_mapping) if mid is not None}
+        for key in earlier_diff['changed']:
+            _, mid_idx, text_field = key.split('.')
+            if int(mid_idx) in new_index_by_mid:
+                changed.add(f"{field}.{new_index_by_mid[int(mid_idx)]}.{text_field}")
+
+        mapping = [
+            earlier_mapping[mid] if mid is not None and mid < len(earlier_mapping) else None
+            for mid in later_mapping
+        ]
+        merged[field] = {'mapping': mapping, 'changed': sorted(changed), 'length': earlier_diff.get('length')}
+    return merged
+
+
+def _target_item(field_diff, target_value, target_by_id, idx, item):
+    """
+    Kaynak elemanın hedef dildeki mevcut karşılığı. id'li elemanlar hedefte id ile
+    bulunur; id'siz elemanlar eski kaynaktaki sırasıyla eşleşir ve bu sadece hedef
+    liste eski kaynakla aynı uzunluktaysa güvenilirdir. Geçersiz kılınan veya başarısız
+    olan bir iş yüzünden hedef farklı bir kaynak sürümündeyse eşleşme yapılmaz ve
+    eleman yeniden çevrilir.
+    """
+    mapping = field_diff['mapping']
+    if not isinstance(target_value, list) or idx >= len(mapping) or mapping[idx] is None:
+        return None
+
+    item_id = _item_id(item)
+    if item_id is not None:
+        return target_by_id.get(item_id)
+
+    length = field_diff.get('length')
+    if length is not None and len(target_value) != length:
+        return None
+    old_idx = mapping[idx]
+    if old_idx < len(target_value) and isinstance(target_value[old_idx], dict) and _item_id(target_value[old_idx]) is None:
+        return target_value[old_idx]
+    return None
+
+
+def existing_texts(field, source_value, target_value, field_diff):
+    """
+    Kaynakta değişmemiş metin parçaları için hedef dildeki mevcut çevirileri
+    kaynak (yeni) anahtarlarla döndürür.
+    """
+    if field_diff is None:
+        return {}
+
+    text_fields = TEXT_FIELDS.get(field, [])
+    changed = set(field_diff['changed'])
+    existing = {}
+
+    if isinstance(source_value, list):
+        target_by_id = {}
+        for target_item in target_value if isinstance(target_value, list) else []:
+            target_id = _item_id(target_item)
+            if target_id is not None:
+                target_by_id.setdefault(target_id, target_item)
+
+        for idx, item in enumerate(source_value):
+            if not isinstance(item, dict):
+                continue
+            target_item = _target_item(field_diff, target_value, target_by_id, idx, item)
+            if target_item is None:
+                continue
+            for text_field in text_fields:
+                key = f"{field}.{idx}.{text_field}"
+                if item.get(text_field) and key not in changed and target_item.get(text_field):
+                    existing[key] = target_item[text_field]
+    elif isinstance(source_value, dict) and isinstance(target_value, dict):
+        for text_field in text_fields:
+            key = f"{field}.{text_field}"
+            if source_value.get(text_field) and key not in changed and target_value.get(text_field):
+                existing[key] = target_value[text_field]
+    return existing
+
+
+def patch_field(field, source_value, target_value, field_diff, translated_texts):
+    """
+    Hedef dilin yeni alan değerini üretir: yapı ve metin dışı alanlar kaynaktan,
+    değişmemiş metinler hedefin mevcut çevirisinden, değişenler translated_texts'ten alınır.
+    """
+    patched = copy.deepcopy(source_value)
+    texts = existing_texts(field, source_value, target_value, field_diff)
+    texts.update({
+        key: text for key, text in translated_texts.items()
+        if key.split('.', 1)[0] == field
+    })
+    apply_texts({field: patched}, texts)
+    return patched
@@ -0,0 +1,164 @@
+"""
+CV okuma modeli.
+
+Herkese açık CV endpoint'i, WebSocket consumer'ı, güncelleme bildirimleri ve
+CVSerializer aynı birleştirilmiş CV belgesini kullanır. Belge; CV, kullanıcı ve
+istenen dil ile yedek dil ('en') çevirileri tek bir sorguda yüklenerek oluşturulur.
+"""
+import copy
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from django.core.files.storage import default_storage
+
+from .models import CV, CVTranslation
+
+FALLBACK_LANGUAGE = 'en'
+
+
+@dataclass(frozen=True)
+class CVDocument:
+    id: int
+    title: str
+    translation_key: str
+    language: str
+    personal_info: dict
+    education: list
+    experience: list
+    skills: list
+    languages: list
+    certificates: list
+    video_info: dict
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    photo_url: Optional[str] = None
+    # Profil resmi türevleri, küçükten büyüğe: (genişlik, jpeg_url, webp_url)
+    photo_variants: tuple = ()
+    video_url: Optional[str] = None
+    video_description: Optional[str] = None
+
+    def payload(self, template_id=None, build_absolute_uri=None, **extra):
+        """
+        Herkese açık endpoint ve WebSocket mesajlarında kullanılan dict'i üretir.
+        Her çağrıda yeni bir kopya döner; belge değişmez.
+        """
+        build_uri = build_absolute_uri or (lambda url: url)
+        data = {
+            'id': self.id,
+            'template_id': template_id,
+            'title': self.title,
+            'language': self.language,
+            'personal_info': copy.deepcopy(self.personal_info),
+            'education': copy.deepcopy(self.education),
+            'experience': copy.deepcopy(self.experience),
+            'skills': copy.deepcopy(self.skills),
+            'languages': copy.deepcopy(self.languages),
+            'certificates': copy.deepcopy(self.certificates),
+            'video_info': copy.deepcopy(self.video_info),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'translation_key': self.translation_key,
+        }
+        if template_id is None:
+            del data['template_id']
+
+        # Kullanıcının profil resmini ekle
+        if self.photo_url:
+            data['personal_info']['photo'] = build_uri(self.photo_url)
+            data['personal_info'].update(self.photo_srcsets(build_uri))
+
+        # Video bilgilerini ekle
+        if self.video_url:
+            data['video_info']['video_url'] = build_uri(self.video_url)
+        if self.video_description:
+            data['video_info']['description'] = self.video_description
+
+        data.update(extra)
+        return data
+
+    def photo_srcsets(self, build_absolute_uri=None):
+        """Türevler varsa `photo_srcset` (JPEG) ve `photo_srcset_webp` alanları"""
+        if not self.photo_variants:
+            return {}
+        build_uri = build_absolute_uri or (lambda url: url)
+        return {
+            'photo_srcset': ', '.join(f'{build_uri(jpeg)} {width}w' for width, jpeg, _ in self.photo_variants),
+            'photo_srcset_webp': ', '.join(f'{build_uri(webp)} {width}w' for width, _, webp in self.photo_variants),
+        }
+
+    def photo_variant(self, min_width):
+        """En az min_width genişliğindeki en küçük JPEG türevi (yoksa en büyüğü)"""
+        for width, jpeg, _ in self.photo_variants:
+            if width >= min_width:
+                return jpeg
+        return self.photo_variants[-1][1] if self.photo_variants else None
+
+
+def _photo_variants(user):
+    variants = getattr(user, 'profile_picture_variants', None) or {}
+    # Önceki resmin türevleri (yenisi henüz üretilmemişse) kullanılmaz
+    if not user.profile_picture or variants.get('source') != user.profile_picture.name:
+        return ()
+    return tuple(
+        (entry['width'], default_storage.url(entry['jpeg']), default_storage.url(entry['webp']))
+        for _, entry in sorted(variants.get('sizes', {}).items(), key=lambda item: int(item[0]))
+    )
+
+
+def build_cv_document(cv, translation):
+    """Önceden yüklenmiş CV (user ile) ve çeviriden belgeyi oluşturur; sorgu yapmaz"""
+    user = cv.user
+    return CVDocument(
+        id=cv.id,
+        title=cv.title,
+        translation_key=cv.translation_key,
+        language=translation.language_code,
+        personal_info=translation.personal_info or {},
+        education=translation.education or [],
+        experience=translation.experience or [],
+        skills=translation.skills or [],
+        languages=translation.languages or [],
+        certificates=translation.certificates or [],
+        video_info=translation.video_info or {},
+        created_at=cv.created_at,
+        updated_at=cv.updated_at,
+        photo_url=user.profile_picture.url if user.profile_picture else None,
+        photo_variants=_photo_variants(user),
+        video_url=cv.video.url if cv.video else None,
+        video_description=cv.video_description,
+    )
+
+
+def select_translation(translations, lang):
+    """İstenen dildeki çeviriyi, yoksa yedek dildekini seçer (Python tarafında, sorgusuz)"""
+    by_language = {translation.language_code: translation for translation in translations}
+    return by_language.get(lang) or by_language.get(FALLBACK_LANGUAGE)
+
+
+def load_cv_document(cv_id, translation_key, lang):
+    """
+    CV + kullanıcı + istenen ve yedek dildeki çevirileri tek sorguda yükler.
+
+    Returns:
+        CVDocument veya CV var ama uygun çeviri yoksa None
+
+    Raises:
+        CV.DoesNotExist: CV bulunamazsa
+    """
+    translations = list(
+        CVTranslation.objects
+        .select_related('cv__user')
+        .filter(
+            cv_id=cv_id,
+            cv__translation_key=translation_key,
+            language_code__in={lang, FALLBACK_LANGUAGE},
+        )
+    )
+    translation = select_translation(translations, lang)
+    if translation is None:
+        # Nadir durum: CV'nin kendisi mi yok, yoksa sadece çevirisi mi?
+        if not CV.objects.filter(id=cv_id, translation_key=translation_key).exists():
+            raise CV.DoesNotExist()
+        return None
+    return build_cv_document(translation.cv, translation)
@@ -0,0 +1,79 @@
+"""
+WebSocket çerçevelerinin JSON kodlaması.
+
+Yayınlar bir kez kodlanıp tüm bağlantılara aynen iletildiği için kodlayıcı
+tek noktada tutulur. orjson kuruluysa kullanılır, değilse standart json.
+
+İstemci bağlanırken `?encoding=` ile daha kompakt bir kodlama seçebilir:
+- `json` (varsayılan): JSON text çerçeveler (eski istemciler)
+- `msgpack`: tüm çerçeveler MessagePack binary çerçeve
+- `deflate`: DEFLATE_MIN_SIZE üzerindeki çerçeveler zlib ile sıkıştırılmış JSON
+  binary çerçeve (tarayıcıda DecompressionStream('deflate')), küçükler JSON text
+
+Çerçeveler kanal katmanında JSON olarak taşınır; dönüşüm gönderim anında yapılır
+ve aynı çerçeve süreç içinde bir kez dönüştürülür.
+"""
+import json
+import zlib
+from functools import lru_cache
+
+import msgpack
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_frame(data):
+    """Veriyi WebSocket text çerçevesi olarak (str) kodlar"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str).decode('utf-8')
+        except TypeError:
+            # orjson'un desteklemediği veri (ör. str olmayan sözlük anahtarları)
+            pass
+    return json.dumps(data, default=str)
+
+
+FRAME_ENCODINGS = ('json', 'msgpack', 'deflate')
+DEFAULT_FRAME_ENCODING = 'json'
+# deflate kodlamasında bundan küçük çerçeveler sıkıştırmaya değmez
+DEFLATE_MIN_SIZE = 512
+
+
+def negotiate_encoding(requested):
+    """Bilinmeyen veya boş değerlerde JSON'a düşer"""
+    requested = (requested or '').lower()
+    return requested if requested in FRAME_ENCODINGS else DEFAULT_FRAME_ENCODING
+
+
+@lru_cache(maxsize=64)
+def transcode_frame(text, encoding):
+    """
+    JSON text çerçeveyi seçilen kodlamaya çevirir.
+
+    Returns:
+        tuple: (text_data, bytes_data); ikisinden sadece biri doludur
+    """
+    if encoding == 'msgpack':
+        try:
+            return None, msgpack.packb(json.loads(text), use_bin_type=True)
+        except ValueError:
+            # JSON olmayan kontrol mesajları (ör. "pong") olduğu gibi gider
+            return text, None
+    if encoding == 'deflate' and len(text) >= DEFLATE_MIN_SIZE:
+        return None, zlib.compress(text.encode('utf-8'))
+    return text, None
+
+
+def decode_client_frame(data, encoding):
+    """İstemciden gelen binary çerçeveyi JSON metnine çevirir; çözülemezse None"""
+    try:
+        if encoding == 'msgpack':
+            return json.dumps(msgpack.unpackb(data, raw=False), default=str)
+        if encoding == 'deflate':
+            return zlib.decompress(data).decode('utf-8')
+    except (ValueError, TypeError, zlib.error):
+        return None
+    return None
@@ -0,0 +1,89 @@
+"""
+Süreç içi WebSocket grup kaydı.
+
+Aynı CV grubunu izleyen tüm yerel bağlantılar tek bir GroupState paylaşır. CV
+belgesi her grup ve sürüm için bir kez yüklenip JSON'a çevrilir; aynı metin tüm
+bağlantılara gönderilir. Grupta son bağlantı kapandığında kayıt silinir.
+
+Consumer'lar aynı event loop'ta çalıştığı için kayıt thread-safe değildir,
+sadece event loop içinden kullanılmalıdır.
+"""
+import asyncio
+
+from .broadcast import payload_hash
+from .frames import encode_frame
+from .throttle import GROUP_BURST, GROUP_RATE, TokenBucket
+
+
+class GroupState:
+    def __init__(self):
+        self.refcount = 0
+        self.version = None
+        self.text = None
+        self.content_hash = None
+        self.lock = asyncio.Lock()
+        # İstemcilerin gruba ilettiği mesajların süreç içi sınırı
+        self.relay_bucket = TokenBucket(GROUP_RATE, GROUP_BURST)
+
+
+class GroupRegistry:
+    def __init__(self):
+        self._groups = {}
+        self.stats = {'loads': 0, 'hits': 0}
+
+    def join(self, group_name):
+        state = self._groups.get(group_name)
+        if state is None:
+            state = self._groups[group_name] = GroupState()
+        state.refcount += 1
+        return state
+
+    def leave(self, group_name):
+        state = self._groups.get(group_name)
+        if state is None:
+            return
+        state.refcount -= 1
+        if state.refcount <= 0:
+            del self._groups[group_name]
+
+    def relay_allowed(self, group_name):
+        """Gruba istemci mesajı iletilebilir mi (grup başına token bucket)"""
+        state = self._groups.get(group_name)
+        return state is None or state.relay_bucket.allow()
+
+    def viewer_count(self, group_name):
+        state = self._groups.get(group_name)
+        return state.refcount if state else 0
+
+    async def snapshot(self, group_name, version, loader):
+        """
+        Grubun verilen sürümdeki serileştirilmiş CV verisini ve içeriğin özetini
+        (cvs.broadcast.payload_hash) `(text, content_hash)` olarak döndürür. Sürüm
+        değiştiyse loader (async, dict veya None döner) sadece bir kez çağrılır;
+        aynı anda bekleyen bağlantılar aynı sonucu alır.
+        """
+        state = self._groups.get(group_name)
+        if state is None:
+            # Kayıtlı olmayan grup (ör. bağlantı kapanırken): paylaşmadan yükle
+            data = await loader()
+            return (encode_frame(data), payload_hash(data)) if data else None
+
+        if state.text is not None and state.version == version:
+            self.stats['hits'] += 1
+            return state.text, state.content_hash
+
+        async with state.lock:
+            if state.text is None or state.version != version:
+                data = await loader()
+                self.stats['loads'] += 1
+                if not data:
+                    return None
+                state.text = encode_frame(data)
+                state.content_hash = payload_hash(data)
+                state.version = version
+            else:
+                self.stats['hits'] += 1
+            return state.text, state.content_hash
+
+
+group_registry = GroupRegistry()
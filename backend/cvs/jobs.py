@@ -0,0 +1,294 @@
+"""
+CV çeviri işleri.
+
+CV kaydı sırasında sadece kaynak dildeki CVTranslation güncellenir; imla düzeltme
+ve diğer dillere çeviri bir TranslationJob olarak kaydedilip süreç içindeki
+worker havuzunda çalıştırılır. İş bittiğinde sonuç mevcut `cv_update` WebSocket
+grupları üzerinden bildirilir.
+"""
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .diff import existing_texts, merge_diffs, patch_field
+from .models import CVTranslation, TranslationJob
+from .services import TranslationService, apply_texts, collect_texts
+from .topics import publish_cv_update
+from .translation_memory import translation_memory
+
+logger = logging.getLogger(__name__)
+
+CONTENT_FIELDS = ['personal_info', 'education', 'experience', 'skills', 'languages', 'certificates', 'video_info']
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Süreç başına tek bir çeviri worker havuzu oluşturur"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'TRANSLATION_WORKER_THREADS', 4),
+                    thread_name_prefix='cv-translation',
+                )
+    return _executor
+
+
+def enqueue_translation_job(cv, source_language, changes, template_id='1', kind='update'):
+    """
+    CV için yeni bir çeviri işi oluşturur ve transaction commit edildikten sonra
+    worker havuzuna gönderir. `changes` alan bazında cvs.diff farklarıdır.
+    Aynı CV için bekleyen veya çalışan aynı türdeki işlerin farkları yeni işe
+    taşınır; böylece hızlı art arda kayıtlar tek bir iş olarak çalışır ve yarıda
+    kalan işin değişiklikleri kaybolmaz.
+    """
+    active_jobs = TranslationJob.objects.filter(
+        cv=cv, source_language=source_language, kind=kind, status__in=['pending', 'running']
+    ).order_by('created_at')
+
+    merged_changes = {}
+    for active_job in active_jobs:
+        merged_changes = merge_diffs(merged_changes, _job_changes(active_job))
+    merged_changes = merge_diffs(merged_changes, changes)
+    # Çalışan işler yazmadan önce _is_superseded ile kendilerini durdurur
+    active_jobs.filter(status='pending').update(status='superseded', finished_at=timezone.now())
+
+    job = TranslationJob.objects.create(
+        cv=cv,
+        kind=kind,
+        source_language=source_language,
+        fields=sorted(merged_changes),
+        changes=merged_changes,
+        template_id=template_id or '1',
+    )
+    transaction.on_commit(lambda: get_executor().submit(run_translation_job, job.id))
+    return job
+
+
+def enqueue_repair_job(cv, source_language, template_id='1'):
+    """
+    Kaynak çeviriye göre eskimiş veya eksik dilleri tamamen yeniden çevirir.
+    Okuma isteklerinden çağrılır; kaynak metinler düzeltilmez.
+    """
+    return enqueue_translation_job(
+        cv, source_language, {field: None for field in CONTENT_FIELDS}, template_id, kind='repair'
+    )
+
+
+def content_hash(content):
+    """Çevrilebilir metin parçalarının SHA-256 özeti; çevirilerin eskiyip eskimediğini anlamak için"""
+    texts = collect_texts(content, CONTENT_FIELDS)
+    return hashlib.sha256(json.dumps(texts, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def is_stale(translation, translations):
+    """
+    Çevirinin kaydedilmiş source_hash'i kaynak dildeki çevirinin güncel özetiyle
+    eşleşmiyorsa çeviri eskimiştir. translations: {dil_kodu: CVTranslation}
+    """
+    if not translation.source_language or translation.source_language == translation.language_code:
+        return False
+    source_translation = translations.get(translation.source_language)
+    if source_translation is None:
+        return False
+    return translation.source_hash != content_hash(source_translation.content)
+
+
+def has_active_job(cv):
+    return TranslationJob.objects.filter(cv=cv, status__in=['pending', 'running']).exists()
+
+
+def _job_changes(job):
+    """Fark bilgisi olmayan (eski) işlerde alanların tamamı yeniden çevrilir"""
+    return job.changes or {field: None for field in job.fields}
+
+
+def run_translation_job(job_id):
+    """Worker thread içinde çalışır: düzeltme, diğer dillere çeviri ve bildirim"""
+    close_old_connections()
+    try:
+        # Sadece bekleyen işi al; başka bir worker almışsa veya iş iptal edildiyse çık
+        claimed = TranslationJob.objects.filter(id=job_id, status='pending').update(
+            status='running', started_at=timezone.now()
+        )
+        if not claimed:
+            return
+
+        job = TranslationJob.objects.select_related('cv').get(id=job_id)
+        try:
+            failed_languages = _process_job(job)
+        except Exception as e:
+            logger.exception(f"Translation job {job_id} failed")
+            TranslationJob.objects.filter(id=job_id).update(
+                status='failed', error=str(e), finished_at=timezone.now()
+            )
+            return
+
+        if failed_languages is None:
+            TranslationJob.objects.filter(id=job_id).update(
+                status='superseded', finished_at=timezone.now()
+            )
+            return
+
+        if failed_languages:
+            # Çevrilen diller yazıldı; başarısız diller eski kalır ve okumada onarılır
+            logger.warning(f"Translation job {job_id} failed for: {', '.join(failed_languages)}")
+            TranslationJob.objects.filter(id=job_id).update(
+                status='failed',
+                error=f"Translation failed for: {', '.join(failed_languages)}",
+                finished_at=timezone.now()
+            )
+        else:
+            TranslationJob.objects.filter(id=job_id).update(
+                status='completed', finished_at=timezone.now()
+            )
+            logger.info(f"Translation job {job_id} completed, translation memory: {translation_memory.stats()}")
+        notify_translation_complete(job, failed_languages)
+    finally:
+        close_old_connections()
+
+
+def _is_superseded(job):
+    """Aynı CV için aynı türde daha yeni bir iş varsa eski işin sonuçları yazılmamalı"""
+    return TranslationJob.objects.filter(
+        cv_id=job.cv_id,
+        source_language=job.source_language,
+        kind=job.kind,
+        created_at__gt=job.created_at,
+    ).exclude(status='superseded').exists()
+
+
+def _source_translation(cv, source_language):
+    """Kaynak dilde henüz çeviri yoksa CV'nin orijinal verisinden oluşturulur"""
+    return CVTranslation.objects.get_or_create(
+        cv=cv,
+        language_code=source_language,
+        defaults={
+            **{field: getattr(cv, field) for field in CONTENT_FIELDS},
+            'source_language': source_language,
+        }
+    )[0]
+
+
+def _process_job(job):
+    """
+    İşi çalıştırır ve çevrilemeyen dillerin listesini döndürür; daha yeni bir iş
+    tarafından geçersiz kılındıysa None döner.
+    """
+    cv = job.cv
+    source_language = job.source_language
+    changes = _job_changes(job)
+    fields = [field for field in changes if field in CONTENT_FIELDS]
+
+    source_translation = _source_translation(cv, source_language)
+    source_content = source_translation.content
+    all_texts = collect_texts(source_content, fields)
+
+    # Kaynakta eklenen/değişen metin parçaları
+    changed_keys = set()
+    for field in fields:
+        field_keys = {key for key in all_texts if key.startswith(f"{field}.")}
+        if changes[field] is None:
+            changed_keys |= field_keys
+        else:
+            changed_keys |= field_keys & set(changes[field]['changed'])
+
+    # Değişmemiş ama bir hedef dilde karşılığı olmayan parçalar da çevrilmeli
+    target_languages = [lang_code for lang_code in TranslationService.SUPPORTED_LANGUAGES if lang_code != source_language]
+    targets = {
+        translation.language_code: translation
+        for translation in CVTranslation.objects.filter(cv=cv, language_code__in=target_languages)
+    }
+    missing_keys = set()
+    for lang_code in target_languages:
+        target = targets.get(lang_code)
+        for field in fields:
+            existing = existing_texts(
+                field, source_content[field], getattr(target, field) if target else None, changes[field]
+            )
+            missing_keys |= {
+                key for key in all_texts
+                if key.startswith(f"{field}.") and key not in changed_keys and key not in existing
+            }
+
+    service = TranslationService()
+
+    # Önce kaynak dildeki değişen metinleri düzelt (onarım işlerinde kullanıcı metnine dokunulmaz)
+    texts_to_correct = {key: all_texts[key] for key in changed_keys} if job.kind == 'update' else {}
+    if texts_to_correct:
+        corrected_texts = service.correct_texts(texts_to_correct, source_language)
+        corrections = {
+            key: text for key, text in corrected_texts.items()
+            if text != texts_to_correct[key]
+        }
+        if corrections:
+            with transaction.atomic():
+                # İş çalışırken kullanıcı tekrar kaydetmiş olabilir; güncel satır üzerinde
+                # sadece hâlâ aynı olan metinleri düzelt
+                source_translation = CVTranslation.objects.select_for_update().get(pk=source_translation.pk)
+                source_content = source_translation.content
+                current_texts = collect_texts(source_content, fields)
+                apply_texts(source_content, {
+                    key: text for key, text in corrections.items()
+                    if current_texts.get(key) == texts_to_correct[key]
+                })
+                for field in fields:
+                    setattr(source_translation, field, source_content[field])
+                source_translation.save(update_fields=fields + ['updated_at'])
+            all_texts.update(corrections)
+
+    # Sonra sadece gereken parçaları diğer dillere paralel çevir
+    texts_to_translate = {key: all_texts[key] for key in changed_keys | missing_keys}
+    all_translated_texts = service.translate_many(texts_to_translate, source_language, target_languages)
+
+    if _is_superseded(job):
+        return None
+
+    # Başarısız dillere kaynak metin yazılmaz ve source_hash damgalanmaz;
+    # böylece eski kalırlar ve bir sonraki okumada onarım işi kuyruklanır
+    failed_languages = [lang_code for lang_code in target_languages if lang_code not in all_translated_texts]
+
+    source_hash = content_hash(source_content)
+    for lang_code in target_languages:
+        if lang_code in failed_languages:
+            continue
+        translation = targets.get(lang_code)
+        if translation is None:
+            translation = CVTranslation.objects.get_or_create(cv=cv, language_code=lang_code)[0]
+
+        # Yapı kaynaktan, dokunulmamış metinler hedefin mevcut çevirisinden gelir
+        for field in fields:
+            setattr(translation, field, patch_field(
+                field,
+                source_content[field],
+                getattr(translation, field),
+                changes[field],
+                all_translated_texts[lang_code]
+            ))
+        translation.source_language = source_language
+        translation.source_hash = source_hash
+        translation.save(update_fields=fields + ['source_language', 'source_hash', 'updated_at'])
+
+    return failed_languages
+
+
+def notify_translation_complete(job, failed_languages=()):
+    """Çeviri tamamlandığında CV'yi izleyen tüm şablon/dil gruplarına güncel veriyi gönderir"""
+    try:
+        publish_cv_update(
+            job.cv_id,
+            action='translation_complete',
+            job_id=str(job.id),
+            failed_languages=list(failed_languages)
+        )
+    except Exception as e:
+        logger.error(f"Error sending translation completion for CV {job.cv_id}: {str(e)}")
@@ -0,0 +1,54 @@
+"""
+RFC 6902 JSON Patch üretimi.
+
+Canlı önizleme için iki CV verisi arasındaki farkı add/remove/replace
+işlemlerinden oluşan bir patch olarak üretir. Sözlükler anahtar bazında, aynı
+uzunluktaki listeler eleman bazında karşılaştırılır; uzunluğu değişen listelerde
+ortak önek eleman bazında, fazlalık sondan ekleme/silme olarak ifade edilir.
+"""
+
+
+def _escape(token):
+    """RFC 6901 JSON Pointer kaçışı"""
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def _diff(old, new, path, ops):
+    if type(old) is not type(new):
+        ops.append({'op': 'replace', 'path': path, 'value': new})
+        return
+
+    if isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f'{path}/{_escape(key)}'})
+        for key, value in new.items():
+            child_path = f'{path}/{_escape(key)}'
+            if key not in old:
+                ops.append({'op': 'add', 'path': child_path, 'value': value})
+            elif old[key] != value:
+                _diff(old[key], value, child_path, ops)
+        return
+
+    if isinstance(new, list):
+        common = min(len(old), len(new))
+        for idx in range(common):
+            if old[idx] != new[idx]:
+                _diff(old[idx], new[idx], f'{path}/{idx}', ops)
+        for idx in range(common, len(new)):
+            ops.append({'op': 'add', 'path': f'{path}/-', 'value': new[idx]})
+        # Index'ler kaymasın diye sondan başa doğru sil
+        for idx in range(len(old) - 1, common - 1, -1):
+            ops.append({'op': 'remove', 'path': f'{path}/{idx}'})
+        return
+
+    if old != new:
+        ops.append({'op': 'replace', 'path': path, 'value': new})
+
+
+def make_patch(old, new):
+    """old belgesini new belgesine dönüştüren RFC 6902 işlem listesini döndürür"""
+    ops = []
+    if old != new:
+        _diff(old, new, '', ops)
+    return ops
@@ -0,0 +1,97 @@
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from cvs.pdf import PDF_TEMPLATES, SECTION_LABELS, compile_template_assets, render_template_html
+from cvs.pdf_assets import TemplateAssets, render_inline
+
+SAMPLE_CV = {
+    'title': 'Benchmark CV',
+    'personal_info': {
+        'first_name': 'Jane',
+        'last_name': 'Doe',
+        'title': 'Senior Software Engineer',
+        'email': 'jane@example.com',
+        'phone': '+90 555 000 00 00',
+        'location': 'Istanbul, Turkey',
+        'summary': 'Backend engineer focused on Python, Django and distributed systems. ' * 3,
+    },
+    'experience': [
+        {
+            'position': f'Software Engineer {idx}',
+            'company': f'Company {idx}',
+            'location': 'Istanbul',
+            'start_date': '2018-01',
+            'end_date': '2020-12',
+            'description': 'Designed and maintained services, improved performance and reliability. ' * 4,
+        }
+        for idx in range(4)
+    ],
+    'education': [
+        {
+            'degree': 'BSc Computer Engineering',
+            'school': 'Example University',
+            'location': 'Ankara',
+            'start_date': '2010-09',
+            'end_date': '2014-06',
+            'description': 'Graduated with honors.',
+        }
+    ],
+    'skills': [{'name': name, 'level': 4, 'description': ''} for name in ['Python', 'Django', 'PostgreSQL', 'Redis']],
+    'languages': [{'name': 'English', 'level': 5}, {'name': 'German', 'level': 3}],
+    'certificates': [
+        {'name': 'Cloud Architect', 'issuer': 'Example', 'date': '2022-05-01', 'description': 'Professional level'}
+    ],
+}
+
+
+def _measure(render, html, iterations):
+    durations = []
+    peaks = []
+    for _ in range(iterations):
+        tracemalloc.start()
+        started = time.perf_counter()
+        render(html)
+        durations.append((time.perf_counter() - started) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / (1024 * 1024))
+        tracemalloc.stop()
+    return statistics.median(durations), max(peaks)
+
+
+class Command(BaseCommand):
+    help = 'Compare per-render latency and memory of the PDF templates with and without precompiled assets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=5, help='Renders per template and mode')
+        parser.add_argument('--lang', default='en', choices=list(SECTION_LABELS))
+        parser.add_argument('--template', action='append', choices=PDF_TEMPLATES, help='Only benchmark these templates')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        template_names = options['template'] or PDF_TEMPLATES
+        lang = options['lang']
+
+        assets = TemplateAssets()
+        started = time.perf_counter()
+        compile_template_assets(assets, template_names, [lang])
+        self.stdout.write(f'Asset compilation: {(time.perf_counter() - started) * 1000:.1f} ms (one-off per worker)')
+
+        self.stdout.write(
+            f"{'template':<16}{'inline ms':>12}{'compiled ms':>14}{'speedup':>10}"
+            f"{'inline MiB':>13}{'compiled MiB':>15}"
+        )
+        for template_name in template_names:
+            html = render_template_html(template_name, SAMPLE_CV, lang)
+            # İlk render'lar modül içi önbellekleri ısıtır; ölçüme katılmaz
+            render_inline(html)
+            assets.render(html)
+
+            inline_ms, inline_mib = _measure(render_inline, html, iterations)
+            compiled_ms, compiled_mib = _measure(assets.render, html, iterations)
+            speedup = inline_ms / compiled_ms if compiled_ms else 0
+            self.stdout.write(
+                f'{template_name:<16}{inline_ms:>12.1f}{compiled_ms:>14.1f}{speedup:>9.2f}x'
+                f'{inline_mib:>13.2f}{compiled_mib:>15.2f}'
+            )
@@ -0,0 +1,84 @@
+import copy
+import statistics
+import time
+
+import msgpack
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from cvs.documents import load_cv_document
+from cvs.frames import FRAME_ENCODINGS, encode_frame, transcode_frame
+from cvs.management.commands.benchmark_ws_fanout import SAMPLE_PAYLOAD
+
+
+def _scaled_payload(scale):
+    """Uzun açıklamalı, çok girdili örnek CV (scale katı deneyim/proje)"""
+    payload = copy.deepcopy(SAMPLE_PAYLOAD)
+    experience = payload['experience']
+    payload['experience'] = [
+        dict(item, id=f'{idx}-{copy_idx}')
+        for copy_idx in range(scale)
+        for idx, item in enumerate(experience)
+    ]
+    return payload
+
+
+class Command(BaseCommand):
+    help = 'Compare bytes on the wire and encode time of the WebSocket frame encodings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cv-id', type=int, help='Use a real CV instead of the synthetic payload')
+        parser.add_argument('--translation-key')
+        parser.add_argument('--lang', default='en')
+        parser.add_argument('--template', default='1')
+        parser.add_argument('--scale', type=int, nargs='+', default=[1, 4, 16],
+                            help='Synthetic payload size multipliers')
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        if options['cv_id']:
+            if not options['translation_key']:
+                raise CommandError('--translation-key is required with --cv-id')
+            document = load_cv_document(options['cv_id'], options['translation_key'], options['lang'])
+            if document is None:
+                raise CommandError('CV or translation not found')
+            payload = document.payload(options['template'], action='benchmark', version=1,
+                                       timestamp=str(timezone.now().timestamp()))
+            self._report(f"CV {options['cv_id']} ({options['lang']})", payload, options['iterations'])
+            return
+
+        for scale in options['scale']:
+            self._report(f'synthetic x{scale}', _scaled_payload(scale), options['iterations'])
+
+    def _report(self, label, payload, iterations):
+        text = encode_frame(payload)
+        json_bytes = len(text.encode('utf-8'))
+        self.stdout.write(f'\n{label}')
+        self.stdout.write(f"{'encoding':<18}{'bytes':>10}{'ratio':>8}{'encode us':>12}")
+
+        for encoding in FRAME_ENCODINGS:
+            if encoding == 'json':
+                size = json_bytes
+                encode = lambda: encode_frame(payload)
+            else:
+                # Kanal katmanındaki JSON çerçeveden dönüşüm (önbelleksiz)
+                text_data, bytes_data = transcode_frame.__wrapped__(text, encoding)
+                size = len(bytes_data) if bytes_data is not None else len(text_data.encode('utf-8'))
+                encode = lambda encoding=encoding: transcode_frame.__wrapped__(text, encoding)
+            self._row(encoding, size, json_bytes, self._time(encode, iterations))
+
+        # Karşılaştırma: veriyi doğrudan MessagePack ile kodlamak
+        packed = msgpack.packb(payload, default=str, use_bin_type=True)
+        self._row('msgpack (direct)', len(packed), json_bytes,
+                  self._time(lambda: msgpack.packb(payload, default=str, use_bin_type=True), iterations))
+
+    def _time(self, func, iterations):
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1_000_000)
+        return statistics.median(samples)
+
+    def _row(self, encoding, size, json_bytes, micros):
+        self.stdout.write(f'{encoding:<18}{size:>10}{size / json_bytes:>8.2f}{micros:>12.1f}')
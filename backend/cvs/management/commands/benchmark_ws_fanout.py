@@ -0,0 +1,104 @@
+import asyncio
+import copy
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from cvs.broadcast import build_event
+from cvs.consumers import CVConsumer
+from cvs.frames import orjson
+
+SAMPLE_PAYLOAD = {
+    'id': 1,
+    'template_id': 'web-template1',
+    'title': 'Benchmark CV',
+    'language': 'en',
+    'translation_key': 'benchmark',
+    'personal_info': {
+        'full_name': 'Jane Doe',
+        'email': 'jane@example.com',
+        'summary': 'Backend engineer focused on Python, Django and distributed systems. ' * 5,
+    },
+    'experience': [
+        {
+            'id': str(idx),
+            'position': f'Software Engineer {idx}',
+            'company': f'Company {idx}',
+            'description': 'Designed and maintained services, improved performance and reliability. ' * 6,
+        }
+        for idx in range(6)
+    ],
+    'education': [{'id': '1', 'degree': 'BSc Computer Engineering', 'school': 'Example University'}],
+    'skills': [{'id': str(idx), 'name': f'Skill {idx}', 'level': 4} for idx in range(12)],
+    'languages': [{'id': '1', 'name': 'English', 'level': 5}],
+    'certificates': [],
+    'video_info': {},
+    'created_at': timezone.now().isoformat(),
+    'updated_at': timezone.now().isoformat(),
+}
+
+
+class _Wire:
+    """Giden kuyruk yerine: çerçeveleri kuyruğa almadan bayt sayısını toplar"""
+
+    def __init__(self):
+        self.sent_bytes = 0
+
+    def put(self, text):
+        self.sent_bytes += len(text)
+        return True
+
+    put_snapshot = put
+    put_patch = put
+
+
+class _Consumer(CVConsumer):
+    """Ağ yerine gönderilen bayt sayısını toplayan consumer"""
+
+    def __init__(self, idx):
+        super().__init__()
+        self.channel_name = f'bench.{idx}'
+        self.group_name = 'bench'
+        self.sent_version = None
+        self.sent_hash = None
+        self.delta = False
+        self.outbound = _Wire()
+
+
+class Command(BaseCommand):
+    help = 'Measure cv_update fan-out cost: per-consumer encoding vs a single pre-encoded frame'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--consumers', type=int, nargs='+', default=[10, 100, 1000])
+        parser.add_argument('--rounds', type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"JSON encoder: {'orjson' if orjson is not None else 'json'}")
+        self.stdout.write(f"{'consumers':>10}{'per-consumer ms':>18}{'pre-encoded ms':>17}{'speedup':>10}")
+        for count in options['consumers']:
+            legacy_ms, shared_ms = asyncio.run(self._measure(count, options['rounds']))
+            speedup = legacy_ms / shared_ms if shared_ms else 0
+            self.stdout.write(f'{count:>10}{legacy_ms:>18.2f}{shared_ms:>17.2f}{speedup:>9.1f}x')
+
+    async def _measure(self, count, rounds):
+        legacy = []
+        shared = []
+        for round_idx in range(rounds):
+            consumers = [_Consumer(idx) for idx in range(count)]
+            # Eski yol: her alıcı kendi mesaj kopyasını değiştirip kodlar
+            events = [{'type': 'cv_update', 'message': copy.deepcopy(SAMPLE_PAYLOAD)} for _ in consumers]
+            started = time.perf_counter()
+            for consumer, event in zip(consumers, events):
+                await consumer.cv_update(event)
+            legacy.append((time.perf_counter() - started) * 1000)
+
+            # Yeni yol: gönderici bir kez kodlar (ölçüme dahil), alıcılar aynen iletir
+            consumers = [_Consumer(idx) for idx in range(count)]
+            started = time.perf_counter()
+            event = build_event(f'bench-{round_idx}', SAMPLE_PAYLOAD, round_idx + 1)
+            for consumer in consumers:
+                await consumer.cv_update(dict(event))
+            shared.append((time.perf_counter() - started) * 1000)
+        return statistics.median(legacy), statistics.median(shared)
@@ -0,0 +1,213 @@
+"""
+Bucket'taki yetim (hiçbir kayıtta referansı olmayan) medya dosyalarını bulur ve siler.
+
+Veritabanındaki tüm dosya referansları .iterator() ile okunup bellekte bir küme
+olarak tutulur; bucket önekleri sayfa sayfa listelenir ve referansı olmayan
+anahtarlar 1000'lik DeleteObjects çağrılarıyla silinir. Yeni yüklenmiş ama
+henüz kaydedilmemiş dosyalar silinmesin diye --min-age'den genç nesnelere
+dokunulmaz. pdf-cache/ bir önbellektir; sadece --pdf-cache-max-age verilirse
+o süreden eski dosyalar silinir.
+
+    python manage.py cleanup_orphaned_media --dry-run
+    python manage.py cleanup_orphaned_media --fix-refcounts --pdf-cache-max-age 30
+"""
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from cvs.blobs import BLOB_PREFIX, delete_stored_file
+from cvs.certificates import storage_name
+from cvs.models import CV, CVTranslation, StoredBlob
+from cvs.pdf import PDF_CACHE_PREFIX
+from users.models import User
+
+# Referansları veritabanında tutulan önekler (default_storage adına göre)
+MEDIA_PREFIXES = ['certificates/', f'{BLOB_PREFIX}/', 'cv_videos/', 'profile_pictures/', 'video_intros/']
+DELETE_BATCH_SIZE = 1000
+
+
+def _file_names(queryset, field):
+    for name in queryset.values_list(field, flat=True).iterator():
+        if name:
+            yield name
+
+
+class Command(BaseCommand):
+    help = 'Find and delete media files in the bucket that no database record references'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report orphans')
+        parser.add_argument('--prefix', action='append', choices=MEDIA_PREFIXES + [f'{PDF_CACHE_PREFIX}/'],
+                            help='Only scan these prefixes')
+        parser.add_argument('--min-age', type=float, default=24, help='Skip objects younger than this many hours')
+        parser.add_argument('--pdf-cache-max-age', type=float,
+                            help='Also delete rendered PDFs older than this many days')
+        parser.add_argument('--fix-refcounts', action='store_true',
+                            help='Recompute blob reference counts and drop blobs no certificate uses')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.dry_run = options['dry_run']
+        self.client = default_storage.connection.meta.client
+        self.bucket = default_storage.bucket_name
+        self.location = default_storage.location.strip('/')
+        self.stats = defaultdict(Counter)
+
+        refs_loaded_at = timezone.now()
+        referenced, blob_refs = self.referenced_names()
+        self.stdout.write(f'{len(referenced)} referenced files loaded in {time.perf_counter() - started:.1f}s')
+
+        if options['fix_refcounts']:
+            self.fix_refcounts(blob_refs, refs_loaded_at)
+        # Satırı olan blob'lar (referans sayısı düzeltilmediyse) korunur
+        referenced.update(StoredBlob.objects.values_list('name', flat=True).iterator())
+
+        now = timezone.now()
+        min_modified = now - timedelta(hours=options['min_age'])
+        prefixes = options['prefix'] or list(MEDIA_PREFIXES)
+        if options['pdf_cache_max_age'] is not None and f'{PDF_CACHE_PREFIX}/' not in prefixes:
+            prefixes.append(f'{PDF_CACHE_PREFIX}/')
+
+        for prefix in prefixes:
+            if prefix == f'{PDF_CACHE_PREFIX}/':
+                if options['pdf_cache_max_age'] is None:
+                    self.stdout.write(f'{prefix}: skipped (pass --pdf-cache-max-age)')
+                    continue
+                # Önbellekteki PDF'lerin referansı yoktur; yaşa göre silinir
+                cutoff = now - timedelta(days=options['pdf_cache_max_age'])
+                self.scan(prefix, lambda name, modified: modified < cutoff)
+            else:
+                self.scan(prefix, lambda name, modified: name not in referenced and modified < min_modified)
+
+        self.report(time.perf_counter() - started)
+
+    def referenced_names(self):
+        """
+        Veritabanındaki tüm dosya adları ve blob başına onu kullanan sertifikalar.
+
+        Returns:
+            tuple: (set, {blob adı: {(cv_id, sertifika id)}})
+        """
+        referenced = set()
+        blob_refs = defaultdict(set)
+
+        referenced.update(_file_names(CV.objects.all(), 'video'))
+        for certificates in CV.objects.values_list('certificates', flat=True).iterator():
+            for cert in certificates or []:
+                name = storage_name(cert.get('document_url'))
+                if name:
+                    referenced.add(name)
+
+        for cv_id, certificates in CVTranslation.objects.values_list('cv_id', 'certificates').iterator():
+            for cert in certificates or []:
+                name = storage_name(cert.get('document_url'))
+                if name:
+                    referenced.add(name)
+                    if name.startswith(f'{BLOB_PREFIX}/'):
+                        blob_refs[name].add((cv_id, str(cert.get('id'))))
+
+        for name, variants in User.objects.values_list('profile_picture', 'profile_picture_variants').iterator():
+            if name:
+                referenced.add(name)
+            for entry in (variants or {}).get('sizes', {}).values():
+                referenced.update(entry[key] for key in ('jpeg', 'webp') if entry.get(key))
+
+        if apps.is_installed('profiles'):
+            referenced.update(_file_names(apps.get_model('profiles', 'Profile').objects.all(), 'video_intro'))
+
+        # Eski `cv` uygulaması INSTALLED_APPS'te değilse modeli sorgulanamaz
+        if apps.is_installed('cv'):
+            referenced.update(_file_names(apps.get_model('cv', 'Certificate').objects.all(), 'document'))
+            referenced.update(_file_names(apps.get_model('cv', 'CV').objects.all(), 'video'))
+
+        return referenced, blob_refs
+
+    def fix_refcounts(self, blob_refs, refs_loaded_at):
+        """
+        Blob referans sayılarını sertifikalardan yeniden hesaplar; kullanılmayanları
+        siler. Referanslar okunmaya başladıktan sonra değişen blob'lara dokunulmaz;
+        güncelleme sadece referans sayısı okunduğu gibiyse yapılır.
+        """
+        fixed = dropped = 0
+        for blob in StoredBlob.objects.filter(updated_at__lt=refs_loaded_at).iterator():
+            actual = len(blob_refs.get(blob.name, ()))
+            if actual == blob.ref_count:
+                continue
+            if self.dry_run:
+                self.stdout.write(f'  refcount {blob.name}: {blob.ref_count} -> {actual}')
+            else:
+                with transaction.atomic():
+                    unchanged = StoredBlob.objects.filter(pk=blob.pk, ref_count=blob.ref_count)
+                    if actual:
+                        changed = unchanged.update(ref_count=actual)
+                    else:
+                        changed = unchanged.delete()[0]
+                        if changed:
+                            transaction.on_commit(lambda name=blob.name: delete_stored_file(name))
+                if not changed:
+                    continue
+            if actual:
+                fixed += 1
+            else:
+                dropped += 1
+        self.stdout.write(f'Blob refcounts: {fixed} corrected, {dropped} unreferenced blob(s) dropped')
+
+    def scan(self, prefix, is_orphan):
+        """Öneki sayfa sayfa listeler; is_orphan(ad, LastModified) True olanları siler/raporlar"""
+        stats = self.stats[prefix]
+        key_prefix = f'{self.location}/' if self.location else ''
+        batch = []
+
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=key_prefix + prefix):
+            for obj in page.get('Contents', []):
+                stats['listed'] += 1
+                stats['listed_bytes'] += obj['Size']
+                name = obj['Key'][len(key_prefix):]
+                if not is_orphan(name, obj['LastModified']):
+                    continue
+                stats['orphans'] += 1
+                stats['orphan_bytes'] += obj['Size']
+                if self.dry_run:
+                    self.stdout.write(f'  orphan {name} ({obj["Size"]} bytes)')
+                    continue
+                batch.append(obj['Key'])
+                if len(batch) >= DELETE_BATCH_SIZE:
+                    self.delete(batch, stats)
+                    batch = []
+        if batch:
+            self.delete(batch, stats)
+
+    def delete(self, keys, stats):
+        response = self.client.delete_objects(
+            Bucket=self.bucket,
+            Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True},
+        )
+        errors = response.get('Errors', [])
+        for error in errors:
+            self.stdout.write(self.style.ERROR(f"  {error.get('Key')}: {error.get('Message')}"))
+        stats['deleted'] += len(keys) - len(errors)
+        stats['errors'] += len(errors)
+
+    def report(self, elapsed):
+        self.stdout.write(f"\n{'prefix':<22}{'listed':>10}{'MB':>10}{'orphans':>10}{'orphan MB':>11}{'deleted':>10}{'errors':>8}")
+        total = Counter()
+        for prefix, stats in self.stats.items():
+            total.update(stats)
+            self._row(prefix, stats)
+        self._row('total', total)
+        rate = total['listed'] / elapsed if elapsed else 0
+        mode = 'dry run' if self.dry_run else 'deleted'
+        self.stdout.write(self.style.SUCCESS(f'{mode}: {elapsed:.1f}s, {rate:.0f} objects/s listed'))
+
+    def _row(self, label, stats):
+        self.stdout.write(
+            f"{label:<22}{stats['listed']:>10}{stats['listed_bytes'] / 1048576:>10.1f}{stats['orphans']:>10}"
+            f"{stats['orphan_bytes'] / 1048576:>11.1f}{stats['deleted']:>10}{stats['errors']:>8}"
+        )
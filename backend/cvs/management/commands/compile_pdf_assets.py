@@ -0,0 +1,43 @@
+"""
+PDF şablonlarının stil ve fontlarının derlenebildiğini doğrular (ör. deploy öncesi
+kontrol olarak). Derlenen varlıklar bu komutun sürecinde kalır; sunucu
+worker'ları kendi varlıklarını açılışta warm_render_workers ile hazırlar.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cvs.pdf import PDF_TEMPLATES, SECTION_LABELS, compile_template_assets
+from cvs.pdf_assets import TemplateAssets
+
+
+class Command(BaseCommand):
+    help = 'Check that the stylesheets and fonts of all PDF templates compile (does not warm the server)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--template', action='append', choices=PDF_TEMPLATES, help='Only compile these templates')
+        parser.add_argument('--lang', action='append', choices=list(SECTION_LABELS), help='Only compile these languages')
+
+    def handle(self, *args, **options):
+        template_names = options['template'] or PDF_TEMPLATES
+        languages = options['lang'] or list(SECTION_LABELS)
+        assets = TemplateAssets()
+        failed = 0
+
+        for template_name in template_names:
+            started = time.perf_counter()
+            try:
+                compile_template_assets(assets, [template_name], languages)
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'{template_name}: {str(e)}'))
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stdout.write(self.style.SUCCESS(f'{template_name}: compiled in {elapsed:.1f} ms'))
+
+        self.stdout.write(
+            f"{assets.stats['compiled']} distinct stylesheet(s) for "
+            f"{len(template_names)} template(s) x {len(languages)} language(s)"
+        )
+        if failed:
+            raise CommandError(f'{failed} template(s) failed to compile')
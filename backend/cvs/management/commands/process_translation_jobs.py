@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from cvs.jobs import run_translation_job
+from cvs.models import TranslationJob
+
+
+class Command(BaseCommand):
+    help = 'Run pending CV translation jobs (e.g. jobs lost when a worker process restarted)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-minutes',
+            type=int,
+            default=15,
+            help='Re-queue running jobs that started more than this many minutes ago',
+        )
+
+    def handle(self, *args, **options):
+        stale_before = timezone.now() - timedelta(minutes=options['stale_minutes'])
+        requeued = TranslationJob.objects.filter(
+            status='running', started_at__lt=stale_before
+        ).update(status='pending', started_at=None)
+        if requeued:
+            self.stdout.write(f'Re-queued {requeued} stale running job(s)')
+
+        job_ids = list(
+            TranslationJob.objects.filter(status='pending')
+            .order_by('created_at')
+            .values_list('id', flat=True)
+        )
+        self.stdout.write(f'Processing {len(job_ids)} pending translation job(s)...')
+
+        for job_id in job_ids:
+            run_translation_job(job_id)
+            job = TranslationJob.objects.get(id=job_id)
+            if job.status == 'failed':
+                self.stdout.write(self.style.ERROR(f'Job {job_id} failed: {job.error}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'Job {job_id}: {job.status}'))
@@ -0,0 +1,186 @@
+"""
+Canlı önizleme WebSocket yük testi.
+
+Birden fazla daphne sürecini aynı Redis channel layer ile başlatıp bu komutu
+aynı ayarlarla çalıştırın; istemciler verilen adreslere sırayla dağıtılır,
+güncellemeler bu süreçten group_send ile yayınlanır ve her istemcide teslim
+gecikmesi ölçülür:
+
+    export REDIS_URL=redis://127.0.0.1:6379/0
+    daphne -p 8001 cv_builder.asgi:application &
+    daphne -p 8002 cv_builder.asgi:application &
+    python manage.py ws_load_test --url ws://127.0.0.1:8001 --url ws://127.0.0.1:8002 \\
+        --cv-id 1 --translation-key <key> --clients 200 --messages 50
+"""
+import asyncio
+import json
+import statistics
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+from autobahn.asyncio.websocket import WebSocketClientFactory, WebSocketClientProtocol
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cvs.frames import encode_frame
+from cvs.views import get_cv_group_name
+
+
+class LoadTestClient(WebSocketClientProtocol):
+    def onOpen(self):
+        self.factory.harness.opened(self)
+
+    def onMessage(self, payload, isBinary):
+        received_at = time.time()
+        if isBinary:
+            return
+        try:
+            data = json.loads(payload.decode('utf-8'))
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+
+        if 'load_test_seq' in data:
+            latency = received_at - float(data['_update_timestamp'])
+            self.factory.harness.delivered(self.factory.base_url, data['load_test_seq'], latency)
+        elif 'personal_info' in data:
+            self.factory.harness.initialized(self)
+
+    def onClose(self, wasClean, code, reason):
+        self.factory.harness.closed(self)
+
+
+class Harness:
+    def __init__(self, clients):
+        self.expected_clients = clients
+        self.open = set()
+        self.ready = set()
+        self.all_ready = asyncio.Event()
+        self.latencies = defaultdict(list)
+        self.deliveries = defaultdict(int)
+
+    def opened(self, client):
+        self.open.add(client)
+
+    def initialized(self, client):
+        self.ready.add(client)
+        if len(self.ready) >= self.expected_clients:
+            self.all_ready.set()
+
+    def closed(self, client):
+        self.open.discard(client)
+        self.ready.discard(client)
+
+    def delivered(self, base_url, seq, latency):
+        self.latencies[base_url].append(latency * 1000)
+        self.deliveries[seq] += 1
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Open N WebSocket clients against ws/cv/... and measure cv_update delivery latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', action='append', required=True, help='Base URL of a worker, e.g. ws://127.0.0.1:8001')
+        parser.add_argument('--cv-id', type=int, required=True)
+        parser.add_argument('--translation-key', required=True)
+        parser.add_argument('--lang', default='en')
+        parser.add_argument('--template', default='1')
+        parser.add_argument('--clients', type=int, default=100)
+        parser.add_argument('--messages', type=int, default=20)
+        parser.add_argument('--interval', type=float, default=0.2, help='Seconds between published updates')
+        parser.add_argument('--timeout', type=float, default=30, help='Seconds to wait for connections and deliveries')
+
+    def handle(self, *args, **options):
+        if settings.CHANNEL_LAYER_BACKEND == 'memory':
+            self.stdout.write(self.style.WARNING(
+                'In-memory channel layer: updates from this process cannot reach daphne workers. '
+                'Set REDIS_URL or CHANNEL_REDIS_URLS.'
+            ))
+        asyncio.run(self.run(options))
+
+    async def run(self, options):
+        loop = asyncio.get_running_loop()
+        harness = Harness(options['clients'])
+        path = f"/ws/cv/{options['template']}/{options['cv_id']}/{options['translation_key']}/{options['lang']}/"
+
+        factories = []
+        for base_url in options['url']:
+            factory = WebSocketClientFactory(base_url.rstrip('/') + path)
+            factory.protocol = LoadTestClient
+            factory.harness = harness
+            factory.base_url = base_url
+            factories.append(factory)
+
+        started = time.perf_counter()
+        connections = []
+        for idx in range(options['clients']):
+            factory = factories[idx % len(factories)]
+            parsed = urlparse(factory.url)
+            connections.append(loop.create_connection(factory, parsed.hostname, parsed.port or 80))
+        results = await asyncio.gather(*connections, return_exceptions=True)
+        failed = [result for result in results if isinstance(result, Exception)]
+        if failed:
+            self.stdout.write(self.style.ERROR(f'{len(failed)} connection(s) failed: {failed[0]}'))
+
+        try:
+            await asyncio.wait_for(harness.all_ready.wait(), options['timeout'])
+        except asyncio.TimeoutError:
+            if not harness.ready:
+                raise CommandError('No client received the initial CV data; check the URL, CV id and translation key')
+        self.stdout.write(
+            f'{len(harness.ready)}/{options["clients"]} clients ready in {time.perf_counter() - started:.1f}s'
+        )
+
+        channel_layer = get_channel_layer()
+        group_name = get_cv_group_name(options['cv_id'], options['translation_key'], options['lang'], options['template'])
+        for seq in range(options['messages']):
+            sent_at = time.time()
+            await channel_layer.group_send(group_name, {
+                'type': 'cv_update',
+                # Bağlantıların gönderdiği son sürümden büyük olmalı
+                'version': time.time_ns() // 1000,
+                'frame': encode_frame({
+                    'id': options['cv_id'],
+                    'action': 'load_test',
+                    'load_test_seq': seq,
+                    '_update_timestamp': str(sent_at),
+                }),
+            })
+            await asyncio.sleep(options['interval'])
+
+        expected = len(harness.ready) * options['messages']
+        deadline = loop.time() + options['timeout']
+        while sum(harness.deliveries.values()) < expected and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+
+        self.report(harness, expected)
+        for client in list(harness.open):
+            client.sendClose()
+        await asyncio.sleep(0.5)
+
+    def report(self, harness, expected):
+        delivered = sum(harness.deliveries.values())
+        self.stdout.write(f'Delivered {delivered}/{expected} messages')
+        self.stdout.write(f"{'worker':<28}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        all_latencies = []
+        for base_url, latencies in sorted(harness.latencies.items()):
+            all_latencies.extend(latencies)
+            self._row(base_url, latencies)
+        if all_latencies:
+            self._row('all', all_latencies)
+            self.stdout.write(f'Mean latency: {statistics.mean(all_latencies):.1f} ms')
+
+    def _row(self, label, latencies):
+        self.stdout.write(
+            f'{label:<28}{len(latencies):>8}{percentile(latencies, 50):>10.1f}{percentile(latencies, 90):>10.1f}'
+            f'{percentile(latencies, 99):>10.1f}{max(latencies):>10.1f}'
+        )
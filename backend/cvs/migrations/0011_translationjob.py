@@ -0,0 +1,79 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:12
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cvs", "0010_alter_cvtranslation_language_code"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "source_language",
+                    models.CharField(
+                        choices=[
+                            ("tr", "Türkçe"),
+                            ("en", "English"),
+                            ("es", "Español"),
+                            ("zh", "中文"),
+                            ("ar", "العربية"),
+                            ("hi", "हिन्दी"),
+                            ("de", "Deutsch"),
+                        ],
+                        max_length=2,
+                    ),
+                ),
+                ("fields", models.JSONField(default=list)),
+                ("template_id", models.CharField(default="1", max_length=50)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Beklemede"),
+                            ("running", "Çalışıyor"),
+                            ("completed", "Tamamlandı"),
+                            ("failed", "Başarısız"),
+                            ("superseded", "Yenisiyle Değiştirildi"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("error", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "cv",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="translation_jobs",
+                        to="cvs.cv",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["cv", "status"], name="cvs_transla_cv_id_fa480d_idx"
+                    )
+                ],
+            },
+        ),
+    ]
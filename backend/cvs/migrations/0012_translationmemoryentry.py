@@ -0,0 +1,66 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cvs", "0011_translationjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationMemoryEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source_hash", models.CharField(max_length=64)),
+                (
+                    "source_language",
+                    models.CharField(
+                        choices=[
+                            ("tr", "Türkçe"),
+                            ("en", "English"),
+                            ("es", "Español"),
+                            ("zh", "中文"),
+                            ("ar", "العربية"),
+                            ("hi", "हिन्दी"),
+                            ("de", "Deutsch"),
+                        ],
+                        max_length=2,
+                    ),
+                ),
+                (
+                    "target_language",
+                    models.CharField(
+                        choices=[
+                            ("tr", "Türkçe"),
+                            ("en", "English"),
+                            ("es", "Español"),
+                            ("zh", "中文"),
+                            ("ar", "العربية"),
+                            ("hi", "हिन्दी"),
+                            ("de", "Deutsch"),
+                        ],
+                        max_length=2,
+                    ),
+                ),
+                ("prompt_version", models.CharField(max_length=20)),
+                ("source_text", models.TextField()),
+                ("translated_text", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "unique_together": {
+                    ("source_hash", "source_language", "target_language", "prompt_version")
+                },
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cvs", "0012_translationmemoryentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="translationjob",
+            name="changes",
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cvs", "0013_translationjob_changes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cvtranslation",
+            name="source_hash",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="cvtranslation",
+            name="source_language",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("tr", "Türkçe"),
+                    ("en", "English"),
+                    ("es", "Español"),
+                    ("zh", "中文"),
+                    ("ar", "العربية"),
+                    ("hi", "हिन्दी"),
+                    ("de", "Deutsch"),
+                ],
+                default="",
+                max_length=2,
+            ),
+        ),
+        migrations.AddField(
+            model_name="translationjob",
+            name="kind",
+            field=models.CharField(
+                choices=[("update", "Güncelleme"), ("repair", "Onarım")],
+                default="update",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import copy
+
 from django.db import models
 from django.conf import settings
 from users.models import User
@@ -5,6 +7,7 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 import random
 import string
+import uuid
 from django.db import IntegrityError
 
 User = get_user_model()
@@ -110,6 +113,9 @@ class CVTranslation(models.Model):
     languages = models.JSONField(default=list)
     certificates = models.JSONField(default=list)  # Her sertifika için: {id, name, issuer, date, description, document_url, document_type}
     video_info = models.JSONField(default=dict)  # Video bilgileri: {url, description, type, uploaded_at}
+    # Bu çevirinin üretildiği kaynak dil ve o anki kaynak içeriğin özeti (bkz. cvs.jobs.content_hash)
+    source_language = models.CharField(max_length=2, choices=LANGUAGE_CHOICES, blank=True, default='')
+    source_hash = models.CharField(max_length=64, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -123,6 +129,19 @@ class CVTranslation(models.Model):
     def __str__(self):
         return f"{self.cv.title} - {self.get_language_code_display()}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kayıtta çıkarılan sertifika belgelerini bulmak için yüklenen liste saklanır (bkz. cvs.signals)
+        if 'certificates' in instance.__dict__:
+            instance._loaded_certificates = copy.deepcopy(instance.certificates)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or 'certificates' in fields:
+            self._loaded_certificates = copy.deepcopy(self.certificates)
+
     @property
     def content(self):
         """Tüm çevrilmiş içeriği tek bir dict olarak döndürür"""
@@ -145,4 +164,73 @@ class CVTranslation(models.Model):
         self.languages = translated_content.get('languages', [])
         self.certificates = translated_content.get('certificates', [])
         self.video_info = translated_content.get('video_info', {})
-        self.save() 
\ No newline at end of file
+        self.save()
+
+
+class TranslationJob(models.Model):
+    """CV kaydından sonra arka planda çalışan düzeltme + çeviri işi"""
+    STATUS_CHOICES = (
+        ('pending', 'Beklemede'),
+        ('running', 'Çalışıyor'),
+        ('completed', 'Tamamlandı'),
+        ('failed', 'Başarısız'),
+        ('superseded', 'Yenisiyle Değiştirildi'),
+    )
+
+    KIND_CHOICES = (
+        ('update', 'Güncelleme'),
+        ('repair', 'Onarım'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    cv = models.ForeignKey(CV, on_delete=models.CASCADE, related_name='translation_jobs')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default='update')
+    source_language = models.CharField(max_length=2, choices=CVTranslation.LANGUAGE_CHOICES)
+    fields = models.JSONField(default=list)  # Değişen alanlar: ['experience', 'skills', ...]
+    changes = models.JSONField(default=dict)  # Alan bazında metin farkları (bkz. cvs.diff)
+    template_id = models.CharField(max_length=50, default='1')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['cv', 'status'])
+        ]
+
+    def __str__(self):
+        return f"{self.cv_id} - {self.source_language} ({self.status})"
+
+
+class TranslationMemoryEntry(models.Model):
+    """Daha önce çevrilmiş bir metin parçası (bkz. cvs.translation_memory)"""
+    source_hash = models.CharField(max_length=64)  # Normalize edilmiş kaynak metnin SHA-256'sı
+    source_language = models.CharField(max_length=2, choices=CVTranslation.LANGUAGE_CHOICES)
+    target_language = models.CharField(max_length=2, choices=CVTranslation.LANGUAGE_CHOICES)
+    prompt_version = models.CharField(max_length=20)
+    source_text = models.TextField()
+    translated_text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('source_hash', 'source_language', 'target_language', 'prompt_version')
+
+    def __str__(self):
+        return f"{self.source_language}->{self.target_language}: {self.source_text[:50]}"
+
+
+class StoredBlob(models.Model):
+    """İçerik adresli dosya: aynı içerik depolamada bir kez tutulur (bkz. cvs.blobs)"""
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True)  # default_storage içindeki yol
+    size = models.BigIntegerField()
+    content_type = models.CharField(max_length=100, blank=True, default='')
+    ref_count = models.PositiveIntegerField(default=0)  # Dosyayı kullanan sertifika sayısı
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} ref)"
@@ -0,0 +1,227 @@
+"""
+CV PDF çıktısı.
+
+PDF'ler `templates/pdf/pdf-template*.html` şablonlarından WeasyPrint ile üretilir.
+Render işlemi süreç başına sınırlı bir worker havuzunda çalışır; her worker thread
+başlarken şablonların CSS ve fontlarını bir kez derler (bkz. cvs.pdf_assets) ve
+sonraki render'larda tekrar kullanır. Sunucu süreci istek almadan önce
+warm_render_workers ile tüm worker'ları hazırlar (bkz. cv_builder.asgi).
+Üretilen dosya object storage'da (çeviri içeriğinin özeti, şablon, şablon sürümü)
+anahtarıyla saklanır; aynı istek tekrar geldiğinde render yapılmadan dosya akıtılır.
+"""
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.template.loader import get_template, render_to_string
+
+from .pdf_assets import TemplateAssets
+
+logger = logging.getLogger(__name__)
+
+PDF_TEMPLATES = [f'pdf-template{number}' for number in range(1, 9)]
+DEFAULT_PDF_TEMPLATE = 'pdf-template1'
+PDF_CACHE_PREFIX = 'pdf-cache'
+# PDF'deki profil resmi için kullanılan türevin en küçük genişliği (px)
+PDF_PHOTO_WIDTH = 256
+
+# Şablonlardaki bölüm başlıkları
+SECTION_LABELS = {
+    'en': {
+        'summary': 'Summary', 'experience': 'Experience', 'education': 'Education',
+        'skills': 'Skills', 'languages': 'Languages', 'certificates': 'Certificates',
+        'contact': 'Contact', 'present': 'Present', 'skill_level': 'Level',
+    },
+    'tr': {
+        'summary': 'Özet', 'experience': 'Deneyim', 'education': 'Eğitim',
+        'skills': 'Yetenekler', 'languages': 'Diller', 'certificates': 'Sertifikalar',
+        'contact': 'İletişim', 'present': 'Devam ediyor', 'skill_level': 'Seviye',
+    },
+    'es': {
+        'summary': 'Resumen', 'experience': 'Experiencia', 'education': 'Educación',
+        'skills': 'Habilidades', 'languages': 'Idiomas', 'certificates': 'Certificados',
+        'contact': 'Contacto', 'present': 'Actualidad', 'skill_level': 'Nivel',
+    },
+    'de': {
+        'summary': 'Zusammenfassung', 'experience': 'Berufserfahrung', 'education': 'Ausbildung',
+        'skills': 'Fähigkeiten', 'languages': 'Sprachen', 'certificates': 'Zertifikate',
+        'contact': 'Kontakt', 'present': 'Heute', 'skill_level': 'Niveau',
+    },
+    'zh': {
+        'summary': '简介', 'experience': '工作经验', 'education': '教育背景',
+        'skills': '技能', 'languages': '语言', 'certificates': '证书',
+        'contact': '联系方式', 'present': '至今', 'skill_level': '水平',
+    },
+    'ar': {
+        'summary': 'الملخص', 'experience': 'الخبرة', 'education': 'التعليم',
+        'skills': 'المهارات', 'languages': 'اللغات', 'certificates': 'الشهادات',
+        'contact': 'التواصل', 'present': 'حتى الآن', 'skill_level': 'المستوى',
+    },
+    'hi': {
+        'summary': 'सारांश', 'experience': 'अनुभव', 'education': 'शिक्षा',
+        'skills': 'कौशल', 'languages': 'भाषाएँ', 'certificates': 'प्रमाणपत्र',
+        'contact': 'संपर्क', 'present': 'वर्तमान', 'skill_level': 'स्तर',
+    },
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def get_render_executor():
+    """
+    Süreç başına tek bir PDF render havuzu; eşzamanlı render sayısını da sınırlar.
+    Her worker thread başlarken şablon varlıklarını derler.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'PDF_RENDER_WORKERS', 2),
+                    thread_name_prefix='cv-pdf',
+                    initializer=_init_worker,
+                )
+    return _executor
+
+
+def render_template_html(template_name, data, lang):
+    return render_to_string(f'pdf/{template_name}.html', {
+        **data,
+        'lang': lang,
+        'translations': SECTION_LABELS.get(lang, SECTION_LABELS['en']),
+    })
+
+
+def compile_template_assets(assets, template_names=None, languages=None):
+    """
+    Şablonların stil bloklarını tüm diller için önceden derler. Stiller sadece
+    dile bağlı olduğundan boş bir CV ile render etmek yeterlidir.
+    """
+    for template_name in template_names or PDF_TEMPLATES:
+        for lang in languages or SECTION_LABELS:
+            assets.compile(render_template_html(template_name, {}, lang))
+
+
+def _init_worker():
+    try:
+        _worker_assets()
+    except Exception as e:
+        # Derleme hatası havuzu bozmasın; render sırasında tekrar denenir
+        logger.error(f"PDF asset warm-up failed: {str(e)}")
+
+
+def _worker_assets():
+    """Worker thread'in derlenmiş şablon varlıkları (ilk kullanımda oluşturulur)"""
+    if not hasattr(_worker_state, 'assets'):
+        assets = TemplateAssets(max_images=getattr(settings, 'PDF_IMAGE_CACHE_SIZE', 256))
+        compile_template_assets(assets)
+        _worker_state.assets = assets
+    return _worker_state.assets
+
+
+def _render(html, base_url):
+    return _worker_assets().render(html, base_url)
+
+
+def warm_render_workers(timeout=None, wait=True):
+    """
+    Havuzdaki tüm worker thread'leri istek gelmeden başlatır. ThreadPoolExecutor
+    thread'leri ihtiyaç oldukça açtığı için her worker'a bir bariyer görevi
+    gönderilir; görevler hepsi başlayana kadar beklediğinden her biri ayrı bir
+    thread'de çalışır ve initializer (varlık derleme) her thread için tamamlanır.
+    Böylece derleme süresi ilk PDF isteğinin PDF_RENDER_TIMEOUT süresinden yenmez.
+
+    wait=False ile görevler sadece gönderilir ve çağıran beklemez (ör. sunucu
+    açılışı); sonuç worker'lar hazır olunca loglanır.
+
+    Returns:
+        int: hazırlanan worker sayısı (wait=False ise None)
+    """
+    workers = getattr(settings, 'PDF_RENDER_WORKERS', 2)
+    timeout = timeout or getattr(settings, 'PDF_RENDER_TIMEOUT', 60)
+    barrier = threading.Barrier(workers)
+
+    def warm():
+        barrier.wait(timeout)
+        return hasattr(_worker_state, 'assets')
+
+    executor = get_render_executor()
+    futures = [executor.submit(warm) for _ in range(workers)]
+
+    if not wait:
+        def report(future):
+            if future.exception() is not None:
+                barrier.abort()
+                logger.error(f"PDF worker warm-up failed: {str(future.exception())}")
+            elif future.result():
+                logger.info("Warmed a PDF render worker")
+
+        for future in futures:
+            future.add_done_callback(report)
+        return None
+
+    try:
+        warmed = sum(1 for future in futures if future.result(timeout=timeout * 2))
+    except Exception as e:
+        barrier.abort()
+        logger.error(f"PDF worker warm-up failed: {str(e)}")
+        return 0
+    logger.info(f"Warmed {warmed}/{workers} PDF render worker(s)")
+    return warmed
+
+
+@lru_cache(maxsize=None)
+def template_version(template_name):
+    """Şablon kaynağının özeti; şablon değişince eski PDF'ler kullanılmaz"""
+    source = get_template(f'pdf/{template_name}.html').template.source
+    version = f"{getattr(settings, 'PDF_TEMPLATE_VERSION', 'v1')}:{source}"
+    return hashlib.sha256(version.encode('utf-8')).hexdigest()[:16]
+
+
+def document_hash(data):
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    ).hexdigest()
+
+
+def pdf_cache_path(cv_id, template_name, lang, data):
+    return (
+        f'{PDF_CACHE_PREFIX}/{cv_id}/'
+        f'{template_name}-{lang}-{document_hash(data)[:32]}-{template_version(template_name)}.pdf'
+    )
+
+
+def render_cv_pdf(document, template_name, base_url=None):
+    """
+    CV belgesinin PDF'ini döndürür: önbellekte varsa storage'daki dosya yolunu,
+    yoksa render edip kaydettikten sonra yolunu.
+
+    Returns:
+        str: default_storage içindeki dosya yolu
+    """
+    data = document.payload(template_name)
+    # Orijinal (MB'larca) resim yerine baskıya yeterli JPEG türevi gömülür
+    photo = document.photo_variant(PDF_PHOTO_WIDTH)
+    if photo:
+        data['personal_info']['photo'] = photo
+    # Zaman damgaları içerik değişmeden de değişebilir; önbellek anahtarına katılmaz
+    content = {key: value for key, value in data.items() if key not in ('created_at', 'updated_at')}
+    path = pdf_cache_path(document.id, template_name, document.language, content)
+    if default_storage.exists(path):
+        return path
+
+    html = render_template_html(template_name, data, document.language)
+    pdf_bytes = get_render_executor().submit(_render, html, base_url).result(
+        timeout=getattr(settings, 'PDF_RENDER_TIMEOUT', 60)
+    )
+    saved_path = default_storage.save(path, ContentFile(pdf_bytes))
+    logger.info(f"Rendered PDF for CV {document.id} ({template_name}, {document.language}): {len(pdf_bytes)} bytes")
+    return saved_path
@@ -0,0 +1,90 @@
+"""
+PDF şablonları için önceden derlenmiş CSS ve font varlıkları.
+
+Her PDF şablonu stillerini kendi `<style>` bloğunda taşır. WeasyPrint normalde her
+belgede bu CSS'i yeniden ayrıştırır ve fontları yeniden çözümler. TemplateAssets,
+render edilmiş HTML'den stil bloklarını ayırır, CSS'i bir kez `weasyprint.CSS`
+nesnesine derler ve aynı FontConfiguration ile birlikte sonraki render'larda
+tekrar kullanır. Derlenen stil sayfaları stil metninin özetiyle saklanır; böylece
+dile göre değişen stiller (ör. Arapça için RTL) ayrı ayrı derlenir.
+
+Not: Ayrılan stiller WeasyPrint'e `stylesheets` olarak verilir. Şablonlarda
+!important ve harici stil dosyası kullanılmadığı sürece sonuç aynıdır.
+"""
+import hashlib
+import re
+import threading
+
+from cachetools import LRUCache
+
+STYLE_RE = re.compile(r'<style[^>]*>(.*?)</style>', re.IGNORECASE | re.DOTALL)
+
+
+def split_styles(html):
+    """HTML'i stil blokları çıkarılmış gövde ve birleştirilmiş CSS metni olarak ayırır"""
+    css_text = '\n'.join(STYLE_RE.findall(html))
+    return STYLE_RE.sub('', html), css_text
+
+
+class TemplateAssets:
+    """
+    Bir worker'ın yeniden kullanılabilir WeasyPrint varlıkları: font ayarları,
+    derlenmiş stil sayfaları ve resim önbelleği. FontConfiguration thread-safe
+    olmadığı için her worker thread kendi örneğini kullanır.
+    """
+
+    def __init__(self, max_stylesheets=64, max_images=256):
+        from weasyprint.text.fonts import FontConfiguration
+
+        self.font_config = FontConfiguration()
+        self.image_cache = {}
+        self.max_images = max_images
+        self._stylesheets = LRUCache(maxsize=max_stylesheets)
+        self._lock = threading.Lock()
+        self.stats = {'compiled': 0, 'hits': 0, 'renders': 0}
+
+    def stylesheet(self, css_text):
+        """CSS metninin derlenmiş halini döndürür; ilk kullanımda derler"""
+        from weasyprint import CSS
+
+        key = hashlib.sha256(css_text.encode('utf-8')).hexdigest()
+        with self._lock:
+            css = self._stylesheets.get(key)
+            if css is not None:
+                self.stats['hits'] += 1
+                return css
+
+        css = CSS(string=css_text, font_config=self.font_config)
+        with self._lock:
+            self._stylesheets[key] = css
+            self.stats['compiled'] += 1
+        return css
+
+    def compile(self, html):
+        """Render edilmiş bir şablonun stillerini önceden derler"""
+        _, css_text = split_styles(html)
+        if css_text.strip():
+            self.stylesheet(css_text)
+
+    def render(self, html, base_url=None):
+        """HTML'i derlenmiş stiller ve sıcak font ayarlarıyla PDF'e çevirir"""
+        from weasyprint import HTML
+
+        body, css_text = split_styles(html)
+        stylesheets = [self.stylesheet(css_text)] if css_text.strip() else []
+        if len(self.image_cache) > self.max_images:
+            self.image_cache.clear()
+        self.stats['renders'] += 1
+        return HTML(string=body, base_url=base_url).write_pdf(
+            stylesheets=stylesheets,
+            font_config=self.font_config,
+            cache=self.image_cache,
+        )
+
+
+def render_inline(html, base_url=None):
+    """Karşılaştırma için: stiller belgede, her render'da yeni font ayarları"""
+    from weasyprint import HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    return HTML(string=html, base_url=base_url).write_pdf(font_config=FontConfiguration())
@@ -0,0 +1,81 @@
+"""
+CV görüntüleyici sayıları (presence).
+
+Her CV/dil için açık bağlantı sayısı önbellekte bir sayaç olarak tutulur; Redis
+kullanıldığında tüm süreçler aynı sayacı görür. Katılma/ayrılma olaylarında tam
+CV verisi yerine sadece `{"type": "presence", "viewers": N}` gönderilir ve bu
+yayın grup başına en fazla PRESENCE_INTERVAL saniyede bir yapılır; aradaki
+değişiklikler tek bir yayında birleşir.
+"""
+import asyncio
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import cache
+
+PRESENCE_INTERVAL = getattr(settings, 'CV_PRESENCE_INTERVAL', 2)
+# Süreç kapanırken azaltılamayan sayaçlar en geç bu sürede sıfırlanır
+PRESENCE_TIMEOUT = getattr(settings, 'CV_PRESENCE_TIMEOUT', 60 * 60 * 6)
+
+
+def _presence_key(cv_id, lang):
+    return f'cv:{cv_id}:viewers:{lang}'
+
+
+def add_viewer(cv_id, lang, delta):
+    """Sayaçı delta kadar değiştirir ve yeni değeri döndürür"""
+    key = _presence_key(cv_id, lang)
+    cache.add(key, 0, PRESENCE_TIMEOUT)
+    try:
+        count = cache.incr(key, delta)
+    except ValueError:
+        # Anahtar add ile incr arasında düştüyse
+        count = max(delta, 0)
+        cache.set(key, count, PRESENCE_TIMEOUT)
+    if count < 0:
+        count = 0
+        cache.set(key, count, PRESENCE_TIMEOUT)
+    else:
+        cache.touch(key, PRESENCE_TIMEOUT)
+    return count
+
+
+def viewer_count(cv_id, lang):
+    return max(cache.get(_presence_key(cv_id, lang), 0), 0)
+
+
+class PresenceBroadcaster:
+    """Grup başına kısıtlanmış (throttled) presence yayını; event loop içinden kullanılır"""
+
+    def __init__(self, interval=PRESENCE_INTERVAL):
+        self.interval = interval
+        self._pending = {}
+        # Son yayın zamanları sadece interval boyunca gerekir
+        self._last_sent = TTLCache(maxsize=10000, ttl=max(interval, 1))
+
+    def schedule(self, group_name, send):
+        """
+        send: argümansız async fonksiyon. Grup için bekleyen bir yayın varsa
+        yenisi oluşturulmaz; bekleyen yayın gönderildiği anda güncel sayıyı okur.
+        """
+        if group_name in self._pending:
+            return
+        loop = asyncio.get_running_loop()
+        delay = max(0.0, self._last_sent.get(group_name, 0.0) + self.interval - loop.time())
+        self._pending[group_name] = asyncio.ensure_future(self._run(group_name, delay, send))
+
+    async def _run(self, group_name, delay, send):
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+        finally:
+            self._pending.pop(group_name, None)
+        self._last_sent[group_name] = asyncio.get_running_loop().time()
+        try:
+            await send()
+        except Exception:
+            # Presence bilgisi kritik değil; bir sonraki yayında düzelir
+            pass
+
+
+presence_broadcaster = PresenceBroadcaster()
@@ -1,6 +1,9 @@
 from django.urls import re_path
 from . import consumers
 
+# Sorgu parametreleri (bkz. CVConsumer):
+#   ?delta=1                    güncellemeler JSON Patch olarak
+#   ?encoding=msgpack|deflate   binary çerçeveler; yoksa JSON text
 websocket_urlpatterns = [
     # Old URL pattern (without template_id)
     re_path(r'ws/cv/(?P<cv_id>\d+)/(?P<translation_key>[^/]+)/(?P<lang>[^/]+)/$', consumers.CVConsumer.as_asgi()),
@@ -1,6 +1,11 @@
+import logging
+
 from rest_framework import serializers
-from .models import CV, CVTranslation
+from .models import CV, CVTranslation, TranslationJob
 from profiles.serializers import LanguageSerializer
+from .documents import build_cv_document, select_translation
+
+logger = logging.getLogger(__name__)
 
 class CVTranslationSerializer(serializers.ModelSerializer):
     language_code = serializers.CharField(read_only=True)
@@ -28,6 +33,74 @@ class CVTranslationSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
 
+class TranslationJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TranslationJob
+        fields = [
+            'id',
+            'kind',
+            'source_language',
+            'fields',
+            'status',
+            'error',
+            'created_at',
+            'started_at',
+            'finished_at'
+        ]
+        read_only_fields = fields
+
+class CVListSerializer(serializers.ModelSerializer):
+    """
+    CV listesi için hafif gösterim: sadece özet alanlar. İstenen dildeki çeviri
+    prefetch edilmiş veriden Python tarafında seçilir, satır başına sorgu yapılmaz.
+    `?include=translations` ile tüm çeviriler de eklenir.
+    """
+    language = serializers.SerializerMethodField()
+    full_name = serializers.SerializerMethodField()
+    available_languages = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CV
+        fields = [
+            'id', 'title', 'status', 'current_step', 'translation_key',
+            'language', 'full_name', 'available_languages',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+    def _language_code(self):
+        if 'language' in self.context:
+            return self.context['language']
+        request = self.context.get('request')
+        return request.headers.get('Accept-Language', 'en')[:2].lower() if request else 'en'
+
+    def _translation(self, instance):
+        return select_translation(instance.translations.all(), self._language_code())
+
+    def get_language(self, instance):
+        translation = self._translation(instance)
+        return translation.language_code if translation else None
+
+    def get_full_name(self, instance):
+        translation = self._translation(instance)
+        personal_info = (translation.personal_info if translation else None) or instance.personal_info or {}
+        if personal_info.get('full_name'):
+            return personal_info['full_name']
+        # PDF şablonlarındaki gibi ad ve soyad ayrı tutulmuş olabilir
+        full_name = ' '.join(
+            str(personal_info[key]).strip() for key in ('first_name', 'last_name') if personal_info.get(key)
+        )
+        return full_name or None
+
+    def get_available_languages(self, instance):
+        return sorted(translation.language_code for translation in instance.translations.all())
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if self.context.get('include_translations'):
+            data['translations'] = CVTranslationSerializer(instance.translations.all(), many=True).data
+        return data
+
 class CVSerializer(serializers.ModelSerializer):
     translations = CVTranslationSerializer(many=True, read_only=True)
     personal_info = serializers.JSONField(required=False)
@@ -66,57 +139,34 @@ class CVSerializer(serializers.ModelSerializer):
         lang_code = request.headers.get('Accept-Language', 'en')[:2].lower()
         
         try:
-            # İstenen dildeki çeviriyi bul
-            translation = instance.translations.filter(language_code=lang_code).first()
+            # İstenen dildeki (yoksa İngilizce) çeviriyi prefetch edilmiş veriden seç
+            translation = select_translation(instance.translations.all(), lang_code)
             
             if translation:
-                # Çeviri varsa, ana veriyi çeviri ile değiştir
-                data['language'] = lang_code
-                personal_info = translation.personal_info
+                document = build_cv_document(instance, translation)
+                data['language'] = document.language
+                personal_info = dict(document.personal_info)
                 # Kullanıcının profil resmini ekle
-                if instance.user.profile_picture:
-                    personal_info['photo'] = request.build_absolute_uri(instance.user.profile_picture.url)
+                if document.photo_url:
+                    personal_info['photo'] = request.build_absolute_uri(document.photo_url)
+                    personal_info.update(document.photo_srcsets(request.build_absolute_uri))
                 data['personal_info'] = personal_info
-                data['education'] = translation.education
-                data['experience'] = translation.experience
-                data['skills'] = translation.skills
-                data['languages'] = translation.languages
-                data['certificates'] = translation.certificates
+                data['education'] = document.education
+                data['experience'] = document.experience
+                data['skills'] = document.skills
+                data['languages'] = document.languages
+                data['certificates'] = document.certificates
                 
                 # video_info alanını güncelle
-                video_info = translation.video_info or {}
-                if instance.video:
-                    video_info['url'] = request.build_absolute_uri(instance.video.url)
-                if instance.video_description:
-                    video_info['description'] = instance.video_description
+                video_info = dict(document.video_info)
+                if document.video_url:
+                    video_info['url'] = request.build_absolute_uri(document.video_url)
+                if document.video_description:
+                    video_info['description'] = document.video_description
                 data['video_info'] = video_info
-              
-            else:
-                # İngilizce çeviriyi dene
-                en_translation = instance.translations.filter(language_code='en').first()
-                if en_translation:
-                    data['language'] = 'en'
-                    personal_info = en_translation.personal_info
-                    # Kullanıcının profil resmini ekle
-                    if instance.user.profile_picture:
-                        personal_info['photo'] = request.build_absolute_uri(instance.user.profile_picture.url)
-                    data['personal_info'] = personal_info
-                    data['education'] = en_translation.education
-                    data['experience'] = en_translation.experience
-                    data['skills'] = en_translation.skills
-                    data['languages'] = en_translation.languages
-                    data['certificates'] = en_translation.certificates
-                    
-                    # video_info alanını güncelle
-                    video_info = en_translation.video_info or {}
-                    if instance.video:
-                        video_info['url'] = request.build_absolute_uri(instance.video.url)
-                    if instance.video_description:
-                        video_info['description'] = instance.video_description
-                    data['video_info'] = video_info
                 
-        except Exception as e:
-            print(f"Error in to_representation: {str(e)}")
+        except Exception:
+            logger.exception(f"Error building CV {instance.pk} representation")
             # Hata durumunda orijinal veriyi dön
             data['language'] = 'en'
             data['video_info'] = {
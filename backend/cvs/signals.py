@@ -0,0 +1,78 @@
+import copy
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_cv_version
+from .certificates import release_cv_documents, release_dropped_documents
+from .models import CV, CVTranslation
+
+
+def _bump_on_commit(cv_id):
+    # Okuyucular commit edilmemiş veriyi yeni sürümle önbelleğe almasın
+    transaction.on_commit(lambda: bump_cv_version(cv_id))
+
+
+@receiver(post_save, sender=CV)
+@receiver(post_delete, sender=CV)
+def invalidate_cv(sender, instance, **kwargs):
+    _bump_on_commit(instance.pk)
+
+
+@receiver(pre_delete, sender=CV)
+def release_cv_blobs(sender, instance, **kwargs):
+    """
+    Sertifika belgelerinin referansları çeviriler CV ile birlikte silinmeden önce
+    okunur ve silme commit edildikten sonra bırakılır
+    """
+    release_cv_documents(instance)
+
+
+def _saves_certificates(instance, update_fields):
+    return instance.pk is not None and (update_fields is None or 'certificates' in update_fields)
+
+
+@receiver(pre_save, sender=CVTranslation)
+def remember_certificates(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Kayıttan önceki sertifika listesi; çıkan belgeler post_save'de bırakılır. Liste
+    örnek yüklenirken saklanır (CVTranslation.from_db); sadece sertifikaları
+    yüklenmemiş örneklerde veritabanından okunur.
+    """
+    if raw or not _saves_certificates(instance, update_fields):
+        return
+    if '_loaded_certificates' in instance.__dict__:
+        instance._previous_certificates = instance._loaded_certificates
+    else:
+        instance._previous_certificates = (
+            CVTranslation.objects.filter(pk=instance.pk).values_list('certificates', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=CVTranslation)
+def release_dropped_certificates(sender, instance, update_fields=None, raw=False, **kwargs):
+    previous = instance.__dict__.pop('_previous_certificates', None)
+    if previous:
+        release_dropped_documents(instance, previous)
+    if not raw and (update_fields is None or 'certificates' in update_fields):
+        # Aynı örneğin sonraki kaydı bu kaydedilen listeyle karşılaştırılır
+        instance._loaded_certificates = copy.deepcopy(instance.certificates)
+
+
+@receiver(post_save, sender=CVTranslation)
+@receiver(post_delete, sender=CVTranslation)
+def invalidate_cv_translation(sender, instance, **kwargs):
+    _bump_on_commit(instance.cv_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_cvs(sender, instance, update_fields=None, **kwargs):
+    """Profil resmi herkese açık CV'de gösterildiği için değiştiğinde CV'ler de geçersiz olur"""
+    if kwargs.get('created') or (
+        update_fields is not None and not {'profile_picture', 'profile_picture_variants'} & set(update_fields)
+    ):
+        return
+    for cv_id in CV.objects.filter(user=instance).values_list('id', flat=True):
+        _bump_on_commit(cv_id)
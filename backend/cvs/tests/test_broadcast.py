@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from cvs.broadcast import build_event, payload_hash, register_server_loop, send_to_group
+from cvs.consumers import CVConsumer
+
+
+class _Outbound:
+    def __init__(self):
+        self.frames = []
+
+    def put_snapshot(self, text):
+        self.frames.append(('snapshot', text))
+        return True
+
+    def put_patch(self, text):
+        self.frames.append(('patch', text))
+        return True
+
+
+def _payload(photo, position):
+    return {
+        'id': 1,
+        'personal_info': {'full_name': 'Ada Lovelace', 'photo': photo, 'summary': 'Engineer. ' * 50},
+        'experience': [{'id': '1', 'company': 'ACME', 'position': position}],
+    }
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ForwardFrameTests(SimpleTestCase):
+    """Patch sadece aynı içerikten türetildiği bağlantılara gönderilir"""
+
+    def setUp(self):
+        cache.clear()
+        self.photo = 'https://api.example.com/media/photo.jpg'
+        build_event('cv_group', _payload(self.photo, 'Engineer'), 1)
+        self.event = build_event('cv_group', _payload(self.photo, 'Lead engineer'), 2)
+
+    def _forward(self, base_payload):
+        consumer = CVConsumer()
+        consumer.delta = True
+        consumer.sent_version = 1
+        consumer.sent_hash = payload_hash(base_payload)
+        consumer.outbound = _Outbound()
+        async_to_sync(consumer.forward_frame)(dict(self.event))
+        return consumer
+
+    def test_patch_applies_to_matching_content(self):
+        consumer = self._forward(_payload(self.photo, 'Engineer'))
+
+        self.assertEqual([kind for kind, _ in consumer.outbound.frames], ['patch'])
+        self.assertEqual(consumer.sent_version, 2)
+        self.assertEqual(consumer.sent_hash, self.event['content_hash'])
+
+    def test_same_version_built_differently_gets_full_frame(self):
+        # Bağlantı anındaki veri göreli URL'lerle kurulmuş
+        consumer = self._forward(_payload('/media/photo.jpg', 'Engineer'))
+
+        self.assertEqual([kind for kind, _ in consumer.outbound.frames], ['snapshot'])
+        self.assertEqual(consumer.sent_hash, self.event['content_hash'])
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class SendToGroupTests(SimpleTestCase):
+    """Süreç içi katmana thread'lerden yapılan gönderimler sunucu loop'unda çalışır"""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 1)
+        self.addCleanup(self.loop.call_soon_threadsafe, self.loop.stop)
+        self.addCleanup(register_server_loop, None)
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout=1)
+
+    def test_worker_thread_send_is_delivered_on_server_loop(self):
+        layer = get_channel_layer()
+
+        async def join():
+            channel = await layer.new_channel()
+            await layer.group_add('cv_group', channel)
+            return channel
+
+        channel = self._run(join())
+        register_server_loop(self.loop)
+
+        worker = threading.Thread(target=send_to_group, args=('cv_group', {'type': 'cv_update', 'frame': '{}'}))
+        worker.start()
+        worker.join()
+
+        self.assertEqual(self._run(layer.receive(channel))['frame'], '{}')
+
+    def test_send_without_server_loop_is_dropped(self):
+        register_server_loop(None)
+        send_to_group('cv_group', {'type': 'cv_update', 'frame': '{}'})
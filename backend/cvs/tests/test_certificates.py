@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db import transaction
+from django.test import TestCase
+
+from cvs.models import CV, CVTranslation, StoredBlob
+from users.models import User
+
+BLOB_NAME = 'blobs/ab/' + 'ab' * 32 + '.pdf'
+
+
+def _certificate(cert_id='c1', name=BLOB_NAME):
+    return {'id': cert_id, 'name': 'Diploma', 'document_url': f'{settings.MEDIA_URL}{name}', 'document_type': 'pdf'}
+
+
+class CertificateReferenceTests(TestCase):
+    """Sertifika belgelerinin blob referansları normal kayıt ve CV silme yollarında bırakılır"""
+
+    def setUp(self):
+        user = User.objects.create_user(email='owner@example.com', password='secret')
+        self.cv = CV.objects.create(user=user, title='CV')
+        # İkinci referans başka bir CV'ye ait; dosya bu testlerde silinmez
+        self.blob = StoredBlob.objects.create(sha256='ab' * 32, name=BLOB_NAME, size=10, ref_count=2)
+        self.translations = [
+            CVTranslation.objects.create(cv=self.cv, language_code=lang, certificates=[_certificate()])
+            for lang in ('en', 'tr')
+        ]
+
+    def _ref_count(self):
+        self.blob.refresh_from_db()
+        return self.blob.ref_count
+
+    def test_reference_is_released_when_the_last_translation_drops_it(self):
+        en, tr = self.translations
+
+        with self.captureOnCommitCallbacks(execute=True):
+            en.certificates = []
+            en.save()
+        # Çevrilmemiş dil belgeyi hâlâ gösteriyor
+        self.assertEqual(self._ref_count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tr.certificates = []
+            tr.save(update_fields=['certificates', 'updated_at'])
+        self.assertEqual(self._ref_count(), 1)
+
+    def test_other_field_updates_do_not_touch_references(self):
+        en, _ = self.translations
+        with self.captureOnCommitCallbacks(execute=True):
+            en.personal_info = {'full_name': 'Ada Lovelace'}
+            en.save(update_fields=['personal_info', 'updated_at'])
+        self.assertEqual(self._ref_count(), 2)
+
+    def test_loaded_translation_save_does_not_reselect_certificates(self):
+        en = CVTranslation.objects.get(pk=self.translations[0].pk)
+        en.personal_info = {'full_name': 'Ada Lovelace'}
+        # Sadece UPDATE; eski sertifikalar yüklenirken saklandı
+        with self.assertNumQueries(1):
+            en.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            en.certificates = []
+            en.save()
+        self.assertEqual(self._ref_count(), 2)
+
+    def test_cv_delete_releases_each_certificate_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cv.delete()
+        self.assertEqual(self._ref_count(), 1)
+
+    def test_rolled_back_cv_delete_keeps_references(self):
+        cv_id = self.cv.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.cv.delete()
+                    raise RuntimeError('rollback')
+            except RuntimeError:
+                pass
+        self.assertEqual(self._ref_count(), 2)
+        self.assertTrue(CV.objects.filter(pk=cv_id).exists())
@@ -0,0 +1,51 @@
+from django.test import SimpleTestCase
+
+from cvs.diff import diff_field, existing_texts, merge_diffs, patch_field
+
+
+class PatchFieldTests(SimpleTestCase):
+    """Korunan hedef metinler kaynakla yanlış elemana yazılmamalı"""
+
+    def test_items_with_id_are_matched_by_id_in_target(self):
+        old = [{'id': 'a', 'company': 'ACME'}, {'id': 'b', 'company': 'Globex'}]
+        new = [{'id': 'b', 'company': 'Globex'}, {'id': 'a', 'company': 'ACME'}]
+        # Hedef, kaynaktan farklı bir sırada (ör. yarıda kalan bir iş yüzünden)
+        target = [{'id': 'b', 'company': 'Globex (de)'}, {'id': 'a', 'company': 'ACME (de)'}]
+
+        patched = patch_field('experience', new, target, diff_field('experience', old, new), {})
+
+        self.assertEqual([item['company'] for item in patched], ['Globex (de)', 'ACME (de)'])
+
+    def test_items_without_id_are_retranslated_when_target_length_differs(self):
+        old = [{'company': 'ACME'}, {'company': 'Globex'}]
+        new = [{'company': 'ACME'}, {'company': 'Globex'}, {'company': 'Initech'}]
+        target = [{'company': 'Globex (de)'}]
+
+        field_diff = diff_field('experience', old, new)
+
+        self.assertEqual(existing_texts('experience', new, target, field_diff), {})
+
+    def test_items_without_id_keep_translations_when_aligned(self):
+        old = [{'company': 'ACME'}, {'company': 'Globex'}]
+        new = [{'company': 'ACME'}, {'company': 'Globex Corp'}]
+        target = [{'company': 'ACME (de)'}, {'company': 'Globex (de)'}]
+
+        field_diff = diff_field('experience', old, new)
+
+        self.assertEqual(existing_texts('experience', new, target, field_diff), {'experience.0.company': 'ACME (de)'})
+
+    def test_merged_diff_keeps_length_of_original_list(self):
+        first = [{'company': 'ACME'}]
+        second = [{'company': 'ACME'}, {'company': 'Globex'}]
+        third = [{'company': 'ACME'}, {'company': 'Globex'}, {'company': 'Initech'}]
+
+        merged = merge_diffs(
+            {'experience': diff_field('experience', first, second)},
+            {'experience': diff_field('experience', second, third)},
+        )
+
+        self.assertEqual(merged['experience']['length'], 1)
+        self.assertEqual(
+            existing_texts('experience', third, [{'company': 'ACME (de)'}], merged['experience']),
+            {'experience.0.company': 'ACME (de)'}
+        )
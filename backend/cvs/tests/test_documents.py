@@ -0,0 +1,102 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from cvs.documents import load_cv_document
+from cvs.models import CV, CVTranslation
+from users.models import User
+
+LANGUAGES = ['en', 'tr', 'es', 'de', 'zh', 'ar', 'hi']
+
+
+def _certificates(count, lang):
+    return [
+        {
+            'id': f'cert-{index}',
+            'name': f'Certificate {index} ({lang})',
+            'issuer': 'Issuer',
+            'document_url': None,
+            'document_type': None,
+        }
+        for index in range(count)
+    ]
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PublicCVQueryCountTests(TestCase):
+    """Herkese açık CV okuması çeviri ve sertifika sayısından bağımsız sabit sayıda sorgu yapar"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='owner@example.com', password='secret')
+
+    def _create_cv(self, languages, certificates):
+        cv = CV.objects.create(user=self.user, title='CV', certificates=_certificates(certificates, 'en'))
+        for lang in languages:
+            CVTranslation.objects.create(
+                cv=cv,
+                language_code=lang,
+                personal_info={'full_name': 'Ada Lovelace'},
+                experience=[{'company': 'ACME', 'position': lang}],
+                certificates=_certificates(certificates, lang),
+            )
+        return cv
+
+    def test_load_cv_document_uses_one_query(self):
+        for languages, certificates in ((['en', 'tr'], 1), (LANGUAGES, 12)):
+            cv = self._create_cv(languages, certificates)
+            with self.subTest(translations=len(languages), certificates=certificates):
+                with self.assertNumQueries(1):
+                    document = load_cv_document(cv.id, cv.translation_key, 'tr')
+                self.assertEqual(document.language, 'tr')
+                self.assertEqual(len(document.certificates), certificates)
+
+    def test_missing_language_falls_back_to_english_in_one_query(self):
+        cv = self._create_cv(['en', 'de'], 3)
+        with self.assertNumQueries(1):
+            document = load_cv_document(cv.id, cv.translation_key, 'es')
+        self.assertEqual(document.language, 'en')
+
+    def test_public_endpoint_query_count_is_constant(self):
+        for languages, certificates in ((['en', 'tr'], 1), (LANGUAGES, 12)):
+            cv = self._create_cv(languages, certificates)
+            with self.subTest(translations=len(languages), certificates=certificates):
+                with self.assertNumQueries(1):
+                    response = self.client.get(f'/cvs/{cv.id}/{cv.translation_key}/de/')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()['certificates']), certificates)
+
+                # Aynı sürüm önbellekten verilir
+                with self.assertNumQueries(0):
+                    self.assertEqual(self.client.get(f'/cvs/{cv.id}/{cv.translation_key}/de/').status_code, 200)
+
+    def test_public_endpoint_unknown_cv(self):
+        cv = self._create_cv(['en'], 0)
+        response = self.client.get(f'/cvs/{cv.id}/wrong-key/en/')
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PublicCVConditionalRequestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(email='owner@example.com', password='secret')
+        self.cv = CV.objects.create(user=user, title='CV')
+        CVTranslation.objects.create(cv=self.cv, language_code='en', personal_info={'full_name': 'Ada Lovelace'})
+        self.url = f'/cvs/{self.cv.id}/{self.cv.translation_key}/en/'
+
+    def test_matching_etag_returns_304_without_queries(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertIn(self.cv.translation_key, etag)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_does_not_validate_a_wrong_translation_key(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(f'/cvs/{self.cv.id}/wrong-key/en/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get(f'/cvs/{self.cv.id}/wrong-key/en/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 404)
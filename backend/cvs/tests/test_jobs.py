@@ -0,0 +1,133 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from cvs.jobs import CONTENT_FIELDS, content_hash, is_stale, run_translation_job
+from cvs.models import CV, CVTranslation, TranslationJob
+from cvs.tests.test_services import FakeOpenAI
+from cvs.translation_memory import translation_memory
+from users.models import User
+
+
+class FailingLanguageOpenAI(FakeOpenAI):
+    """Verilen dile yapılan çeviri isteklerinde tekrar denenmeyen bir hata fırlatır"""
+
+    def __init__(self, language):
+        super().__init__()
+        self.language = language
+
+    def create(self, model, messages, timeout=None, **kwargs):
+        if f' to {self.language}.' in messages[-1]['content']:
+            raise KeyError(self.language)
+        return super().create(model, messages, timeout=timeout, **kwargs)
+
+
+class CVCreateTranslationTests(TestCase):
+    """CV oluşturma OpenAI'a senkron gitmez; diğer diller çeviri işine bırakılır"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_create_stores_source_translation_and_enqueues_job(self):
+        with mock.patch('cvs.services.OpenAI') as openai_client:
+            response = self.client.post('/api/cvs/', {
+                'title': 'CV',
+                'language': 'de',
+                'personal_info': {
+                    'full_name': 'Ada Lovelace',
+                    'title': 'Ingenieurin',
+                    'email': 'ada@example.com',
+                    'phone': '+49 30 1234567',
+                    'address': 'Berlin',
+                },
+            }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        openai_client.assert_not_called()
+        cv = CV.objects.get(id=response.data['id'])
+        self.assertEqual(
+            list(CVTranslation.objects.filter(cv=cv).values_list('language_code', flat=True)), ['de']
+        )
+        self.assertEqual(cv.translations.get().personal_info['title'], 'Ingenieurin')
+
+        job = TranslationJob.objects.get(cv=cv)
+        self.assertEqual(job.source_language, 'de')
+        self.assertEqual(job.fields, sorted(CONTENT_FIELDS))
+        self.assertEqual(response.data['translation_job']['id'], str(job.id))
+
+
+@override_settings(TRANSLATION_RETRY_BACKOFF=0)
+class TranslationJobFailureTests(TestCase):
+    """Çevirisi başarısız olan diller güncel işaretlenmemeli"""
+
+    def setUp(self):
+        translation_memory._cache.clear()
+        user = User.objects.create_user(email='owner@example.com', password='secret')
+        self.cv = CV.objects.create(user=user, title='CV')
+        self.source = CVTranslation.objects.create(
+            cv=self.cv, language_code='en', source_language='en',
+            experience=[{'company': 'ACME', 'position': 'Engineer'}],
+        )
+        CVTranslation.objects.create(
+            cv=self.cv, language_code='de', source_language='en', source_hash='old',
+            experience=[{'company': 'ACME', 'position': 'Alt'}],
+        )
+
+    def test_failed_language_stays_stale_and_job_is_marked_failed(self):
+        job = TranslationJob.objects.create(
+            cv=self.cv, kind='repair', source_language='en',
+            fields=sorted(CONTENT_FIELDS), changes={field: None for field in CONTENT_FIELDS},
+        )
+
+        with mock.patch('cvs.services.OpenAI', return_value=FailingLanguageOpenAI('German')), \
+                mock.patch('cvs.jobs.close_old_connections'), \
+                mock.patch('cvs.jobs.publish_cv_update') as publish:
+            run_translation_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('de', job.error)
+
+        translations = {translation.language_code: translation for translation in self.cv.translations.all()}
+        self.assertEqual(translations['es'].experience[0]['position'], '[Spanish] Engineer')
+        self.assertEqual(translations['es'].source_hash, content_hash(self.source.content))
+        self.assertEqual(translations['de'].experience[0]['position'], 'Alt')
+        self.assertTrue(is_stale(translations['de'], translations))
+        self.assertEqual(publish.call_args.kwargs['failed_languages'], ['de'])
+
+
+class CVRetrieveRepairTests(TestCase):
+    """Okuma isteği eksik çeviriler için onarım işi kuyruklar ama satır oluşturmaz"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_missing_translation_enqueues_repair_job(self):
+        cv = CV.objects.create(user=self.user, title='CV')
+        CVTranslation.objects.create(cv=cv, language_code='en', source_language='en')
+
+        response = self.client.get(f'/api/cvs/{cv.id}/', HTTP_ACCEPT_LANGUAGE='de')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['stale'])
+        self.assertTrue(response.data['pending'])
+        job = TranslationJob.objects.get(cv=cv)
+        self.assertEqual((job.kind, job.source_language), ('repair', 'en'))
+
+        # İş zaten bekliyorken ikinci okuma yeni iş oluşturmaz
+        self.client.get(f'/api/cvs/{cv.id}/', HTTP_ACCEPT_LANGUAGE='de')
+        self.assertEqual(TranslationJob.objects.filter(cv=cv).count(), 1)
+
+    def test_get_does_not_create_translation_rows(self):
+        cv = CV.objects.create(user=self.user, title='CV')
+
+        response = self.client.get(f'/api/cvs/{cv.id}/', HTTP_ACCEPT_LANGUAGE='en')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(CVTranslation.objects.filter(cv=cv).exists())
+        self.assertTrue(TranslationJob.objects.filter(cv=cv, kind='repair').exists())
@@ -0,0 +1,120 @@
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import openai
+from django.test import TestCase, override_settings
+
+from cvs.services import TranslationService
+from cvs.translation_memory import translation_memory
+
+
+def _response(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeOpenAI:
+    """
+    chat.completions.create yerine geçer: isteğin JSON'undaki her değeri
+    "[Dil] metin" olarak döndürür. `failures` ilk N çağrıda fırlatılacak hatalardır.
+    """
+
+    def __init__(self, delay=0, failures=()):
+        self.delay = delay
+        self.failures = list(failures)
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, timeout=None, **kwargs):
+        with self.lock:
+            self.calls.append({'messages': messages, 'timeout': timeout})
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            failure = self.failures.pop(0) if self.failures else None
+        try:
+            time.sleep(self.delay)
+            if failure is not None:
+                raise failure
+            prompt = messages[-1]['content']
+            language = re.search(r' to (\w+)\.', prompt).group(1)
+            texts = json.loads(prompt[prompt.find('{'):prompt.rfind('}') + 1])
+            return _response(json.dumps({key: f'[{language}] {text}' for key, text in texts.items()}))
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def _timeout_error():
+    return openai.APITimeoutError(request=httpx.Request('POST', 'https://api.openai.com/v1/chat/completions'))
+
+
+@override_settings(TRANSLATION_RETRY_BACKOFF=0)
+class TranslationServiceTests(TestCase):
+    texts = {'experience.0.position': 'Software engineer', 'skills.0.name': 'Teamwork'}
+
+    def setUp(self):
+        # Süreç içi LRU önbelleği testler arasında taşınmasın
+        translation_memory._cache.clear()
+
+    @override_settings(TRANSLATION_MAX_CONCURRENCY=2)
+    def test_requests_run_concurrently_up_to_the_limit(self):
+        client = FakeOpenAI(delay=0.05)
+        targets = ['tr', 'es', 'zh', 'ar', 'hi', 'de']
+
+        results = TranslationService(client=client).translate_many(self.texts, 'en', targets)
+
+        self.assertEqual(len(client.calls), len(targets))
+        self.assertEqual(client.peak, 2)
+        self.assertEqual(results['de']['skills.0.name'], '[German] Teamwork')
+        self.assertEqual(results['tr']['experience.0.position'], '[Turkish] Software engineer')
+
+    @override_settings(TRANSLATION_MAX_RETRIES=2)
+    def test_transient_errors_are_retried(self):
+        connection_error = openai.APIConnectionError(request=httpx.Request('POST', 'https://api.openai.com'))
+        client = FakeOpenAI(failures=[_timeout_error(), connection_error])
+
+        result = TranslationService(client=client).translate_texts(self.texts, 'en', 'es')
+
+        self.assertEqual(len(client.calls), 3)
+        self.assertEqual(result['skills.0.name'], '[Spanish] Teamwork')
+
+    @override_settings(TRANSLATION_MAX_RETRIES=1)
+    def test_gives_up_after_max_retries_and_keeps_source_texts(self):
+        client = FakeOpenAI(failures=[_timeout_error()] * 5)
+
+        with self.assertLogs('cvs.services', level='WARNING'):
+            result = TranslationService(client=client).translate_texts(self.texts, 'en', 'es')
+
+        self.assertEqual(len(client.calls), 2)
+        self.assertEqual(result, self.texts)
+
+    def test_non_transient_errors_are_not_retried(self):
+        client = FakeOpenAI(failures=[KeyError('boom')])
+
+        result = TranslationService(client=client).translate_texts(self.texts, 'en', 'es')
+
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual(result, self.texts)
+
+    @override_settings(TRANSLATION_REQUEST_TIMEOUT=7.5)
+    def test_every_request_carries_the_timeout(self):
+        client = FakeOpenAI()
+
+        TranslationService(client=client).translate_many(self.texts, 'en', ['es', 'de'])
+
+        self.assertEqual([call['timeout'] for call in client.calls], [7.5, 7.5])
+
+    def test_memory_hits_skip_the_api(self):
+        client = FakeOpenAI()
+        service = TranslationService(client=client)
+
+        service.translate_texts(self.texts, 'en', 'es')
+        service.translate_texts(self.texts, 'en', 'es')
+
+        self.assertEqual(len(client.calls), 1)
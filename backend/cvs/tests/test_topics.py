@@ -0,0 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from cvs.topics import subscribe, subscriptions, unsubscribe
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SubscriptionIndexTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_subscriptions_are_all_kept(self):
+        members = [(f'web-template{index}', lang) for index, lang in enumerate(['en', 'tr', 'de', 'es'] * 10)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda member: subscribe(1, *member), members))
+
+        self.assertEqual(set(subscriptions(1)), set(members))
+
+    def test_unsubscribe_removes_only_that_group(self):
+        subscribe(2, '1', 'en')
+        subscribe(2, '1', 'tr')
+        unsubscribe(2, '1', 'en')
+
+        self.assertEqual(subscriptions(2), [('1', 'tr')])
@@ -0,0 +1,207 @@
+import unittest
+from unittest import mock
+
+import boto3
+from botocore.exceptions import ClientError
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from cvs import uploads
+from cvs.coalescer import cv_update_coalescer
+from cvs.models import CV
+from users.models import User
+
+try:
+    from moto import mock_aws
+except ImportError:  # moto yoksa bu testler atlanır
+    mock_aws = None
+
+BUCKET = 'test-bucket'
+STORAGES = {
+    'default': {
+        'BACKEND': 'storages.backends.s3boto3.S3Boto3Storage',
+        'OPTIONS': {
+            'bucket_name': BUCKET,
+            'region_name': 'us-east-1',
+            'access_key': 'testing',
+            'secret_key': 'testing',
+            'custom_domain': None,
+            'file_overwrite': False,
+            'querystring_auth': False,
+            'location': 'media',
+        },
+    },
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@unittest.skipIf(mock_aws is None, 'moto is not installed')
+@override_settings(STORAGES=STORAGES, CACHES=CACHES)
+class VideoUploadTests(TestCase):
+    """Presigned multipart video yüklemesi; S3 moto ile taklit edilir"""
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        cache.clear()
+
+        self.s3 = boto3.client('s3', region_name='us-east-1', aws_access_key_id='testing', aws_secret_access_key='testing')
+        self.s3.create_bucket(Bucket=BUCKET)
+
+        self.user = User.objects.create_user(email='owner@example.com', password='secret')
+        self.cv = CV.objects.create(user=self.user, title='CV')
+        self.other_cv = CV.objects.create(user=self.user, title='Other CV')
+
+    def _start(self, size=1024, content_type='video/mp4', cv=None):
+        return uploads.start_video_upload(cv or self.cv, 'intro.MP4', content_type, size, 'Hello')
+
+    def _session(self, upload_id):
+        return cache.get(uploads._session_key(upload_id))
+
+    def _upload_parts(self, upload, body):
+        """Parçaları tarayıcının presigned URL'lerle yapacağı gibi S3'e yükler"""
+        session = self._session(upload['upload_id'])
+        parts = []
+        for part in upload['parts']:
+            start = (part['part_number'] - 1) * upload['part_size']
+            response = self.s3.upload_part(
+                Bucket=BUCKET, Key=session['key'], UploadId=upload['upload_id'],
+                PartNumber=part['part_number'], Body=body[start:start + upload['part_size']],
+            )
+            parts.append({'part_number': part['part_number'], 'etag': response['ETag']})
+        return parts
+
+    def _exists(self, key):
+        try:
+            self.s3.head_object(Bucket=BUCKET, Key=key)
+        except ClientError:
+            return False
+        return True
+
+    def _in_progress(self, upload_id):
+        uploads_in_progress = self.s3.list_multipart_uploads(Bucket=BUCKET).get('Uploads', [])
+        return any(upload['UploadId'] == upload_id for upload in uploads_in_progress)
+
+    def test_start_creates_session_and_presigned_part_urls(self):
+        upload = self._start(size=uploads.PART_SIZE * 2 + 1)
+
+        self.assertEqual([part['part_number'] for part in upload['parts']], [1, 2, 3])
+        self.assertIn(upload['upload_id'], upload['parts'][0]['url'])
+        session = self._session(upload['upload_id'])
+        self.assertEqual(session['cv_id'], self.cv.id)
+        self.assertTrue(session['key'].startswith('media/cv_videos/'))
+        self.assertTrue(session['key'].endswith('.mp4'))
+        self.assertTrue(self._in_progress(upload['upload_id']))
+
+    def test_start_rejects_invalid_requests(self):
+        with self.assertRaises(ValueError):
+            self._start(content_type='application/pdf')
+        with self.assertRaises(ValueError):
+            self._start(size=uploads.MAX_VIDEO_SIZE + 1)
+        with self.assertRaises(ValueError):
+            self._start(size=None)
+
+    def test_complete_returns_the_verified_object(self):
+        upload = self._start(size=1024)
+        parts = self._upload_parts(upload, b'v' * 1024)
+
+        video = uploads.complete_video_upload(self.cv, upload['upload_id'], parts)
+
+        self.assertEqual(video['size'], 1024)
+        self.assertEqual(video['content_type'], 'video/mp4')
+        self.assertEqual(video['description'], 'Hello')
+        self.assertTrue(self._exists(f"media/{video['name']}"))
+        self.assertIsNone(self._session(upload['upload_id']))
+
+    def test_complete_uses_uploaded_parts_when_none_are_sent(self):
+        upload = self._start(size=1024)
+        self._upload_parts(upload, b'v' * 1024)
+
+        video = uploads.complete_video_upload(self.cv, upload['upload_id'])
+
+        self.assertEqual(video['size'], 1024)
+
+    def test_size_mismatch_deletes_the_object(self):
+        upload = self._start(size=1024)
+        key = self._session(upload['upload_id'])['key']
+        parts = self._upload_parts(upload, b'v' * 2048)
+
+        with self.assertRaisesMessage(ValueError, 'does not match'):
+            uploads.complete_video_upload(self.cv, upload['upload_id'], parts)
+        self.assertFalse(self._exists(key))
+
+    def test_content_type_mismatch_deletes_the_object(self):
+        upload = self._start(size=1024)
+        session = self._session(upload['upload_id'])
+        # Aynı anahtara video olmayan tipte başlatılmış bir yükleme
+        self.s3.abort_multipart_upload(Bucket=BUCKET, Key=session['key'], UploadId=upload['upload_id'])
+        upload_id = self.s3.create_multipart_upload(
+            Bucket=BUCKET, Key=session['key'], ContentType='text/html'
+        )['UploadId']
+        cache.set(uploads._session_key(upload_id), session)
+        upload = dict(upload, upload_id=upload_id)
+        parts = self._upload_parts(upload, b'v' * 1024)
+
+        with self.assertRaisesMessage(ValueError, 'does not match'):
+            uploads.complete_video_upload(self.cv, upload_id, parts)
+        self.assertFalse(self._exists(session['key']))
+
+    def test_upload_id_of_another_cv_is_rejected(self):
+        upload = self._start(size=1024, cv=self.other_cv)
+        key = self._session(upload['upload_id'])['key']
+        parts = self._upload_parts(upload, b'v' * 1024)
+
+        with self.assertRaises(ValueError):
+            uploads.complete_video_upload(self.cv, upload['upload_id'], parts)
+        with self.assertRaises(ValueError):
+            uploads.abort_video_upload(self.cv, upload['upload_id'])
+
+        # Diğer CV'nin yüklemesine dokunulmadı
+        self.assertTrue(self._in_progress(upload['upload_id']))
+        self.assertFalse(self._exists(key))
+        self.assertIsNotNone(self._session(upload['upload_id']))
+
+    def test_unknown_upload_id_is_rejected(self):
+        with self.assertRaises(ValueError):
+            uploads.complete_video_upload(self.cv, 'missing')
+        with self.assertRaises(ValueError):
+            uploads.abort_video_upload(self.cv, None)
+
+    def test_abort_discards_the_upload(self):
+        upload = self._start(size=1024)
+        self._upload_parts(upload, b'v' * 1024)
+
+        uploads.abort_video_upload(self.cv, upload['upload_id'])
+
+        self.assertFalse(self._in_progress(upload['upload_id']))
+        self.assertIsNone(self._session(upload['upload_id']))
+
+    @mock.patch.object(cv_update_coalescer, 'submit')
+    def test_endpoints_attach_the_video_and_reject_foreign_uploads(self, submit):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        base = f'/api/cvs/{self.cv.id}/video-upload'
+
+        response = client.post(f'{base}/', {'filename': 'intro.mp4', 'content_type': 'video/mp4', 'size': 1024}, format='json')
+        self.assertEqual(response.status_code, 201)
+        upload = response.json()
+        parts = self._upload_parts(upload, b'v' * 1024)
+
+        response = client.post(
+            f'/api/cvs/{self.other_cv.id}/video-upload/complete/',
+            {'upload_id': upload['upload_id'], 'parts': parts}, format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = client.post(f'{base}/complete/', {'upload_id': upload['upload_id'], 'parts': parts}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.cv.refresh_from_db()
+        self.assertTrue(self.cv.video.name.startswith('cv_videos/'))
+        self.assertEqual(self.cv.video_info['size'], 1024)
+        submit.assert_called_once()
+
+        response = client.post(f'{base}/abort/', {'upload_id': upload['upload_id']}, format='json')
+        self.assertEqual(response.status_code, 400)
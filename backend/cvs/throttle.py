@@ -0,0 +1,117 @@
+"""
+WebSocket akış kontrolü: hız sınırlama ve geri basınç (backpressure).
+
+İstemciden gelen mesajlar bağlantı başına bir token bucket ile, gruba iletilen
+mesajlar ayrıca grup başına bir token bucket ile sınırlanır. Grup sınırı süreç
+içidir (GroupState üzerinde tutulur); N süreçte toplam sınır en fazla N katıdır.
+
+Sunucudan istemciye giden çerçeveler bağlantı başına sınırlı bir kuyruktan
+gönderilir. Yavaş bir istemci geride kaldığında kuyruktaki eski CV verileri ve
+patch'ler yeni tam veri geldiği anda atılır; istemci ara sürümler yerine
+doğrudan en güncel sürümü alır.
+
+Sayaçlar (`ws_stats`) süreç içidir ve sadece izleme amaçlıdır.
+"""
+import asyncio
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+
+_channel_settings = getattr(settings, 'CHANNEL_SETTINGS', {})
+
+# Bağlantı başına saniyedeki mesaj ve anlık patlama (burst) sınırı
+CLIENT_RATE = _channel_settings.get('CLIENT_RATE', 5)
+CLIENT_BURST = _channel_settings.get('CLIENT_BURST', 10)
+# Grup başına, gruba iletilen istemci mesajları için
+GROUP_RATE = _channel_settings.get('GROUP_RATE', 20)
+GROUP_BURST = _channel_settings.get('GROUP_BURST', 40)
+# Bu kadar mesajı sınırlanan bağlantı kapatılır (0 kapatmaz)
+CLIENT_MAX_THROTTLED = _channel_settings.get('CLIENT_MAX_THROTTLED', 100)
+# Bağlantı başına bekleyen giden çerçeve sayısı
+OUTBOUND_QUEUE_SIZE = _channel_settings.get('OUTBOUND_QUEUE_SIZE', 32)
+
+ws_stats = Counter()
+
+
+class TokenBucket:
+    """Saniyede `rate` token dolan, en fazla `burst` token tutan kova"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def allow(self, cost=1):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+
+class OutboundQueue:
+    """
+    Bağlantıya gidecek çerçevelerin sınırlı kuyruğu; event loop içinden kullanılır.
+
+    CV durumu taşıyan çerçeveler (tam veri ve patch) kontrol çerçevelerinden
+    (heartbeat, presence, pong...) ayrı işaretlenir: yeni tam veri kuyruktaki tüm
+    durum çerçevelerini geçersiz kılar.
+    """
+
+    def __init__(self, maxsize=OUTBOUND_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self._items = deque()  # (durum çerçevesi mi, metin)
+        self._ready = asyncio.Event()
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, text):
+        """Kontrol çerçevesi ekler; kuyruk doluysa en eski kontrol çerçevesi atılır"""
+        if len(self._items) >= self.maxsize:
+            for index, (is_state, _) in enumerate(self._items):
+                if not is_state:
+                    del self._items[index]
+                    break
+            else:
+                # Kuyrukta sadece CV verisi var; yeni kontrol çerçevesi atılır
+                ws_stats['dropped'] += 1
+                return False
+            ws_stats['dropped'] += 1
+        self._append(False, text)
+        return True
+
+    def put_snapshot(self, text):
+        """Tam CV verisi ekler; henüz gönderilmemiş eski CV verileri ve patch'ler atılır"""
+        stale = sum(1 for is_state, _ in self._items if is_state)
+        if stale:
+            self._items = deque(item for item in self._items if not item[0])
+            ws_stats['dropped_stale'] += stale
+        if len(self._items) >= self.maxsize:
+            self._items.popleft()
+            ws_stats['dropped'] += 1
+        self._append(True, text)
+
+    def put_patch(self, text):
+        """
+        Patch önceki çerçevelere bağlı olduğu için hiçbir şey atılmaz. Kuyruk
+        doluysa False döner; çağıran tam veriyi put_snapshot ile göndermelidir.
+        """
+        if len(self._items) >= self.maxsize:
+            return False
+        self._append(True, text)
+        return True
+
+    async def get(self):
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()[1]
+
+    def _append(self, is_state, text):
+        self._items.append((is_state, text))
+        self._ready.set()
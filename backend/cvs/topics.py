@@ -0,0 +1,178 @@
+"""
+CV seviyesinde yayın konusu (topic) ve abonelik indeksi.
+
+Her CV için o anda izlenen (template_id, dil) grupları önbellekte bir indeks
+olarak tutulur. Bir güncelleme tüm yedi dil x tüm şablonlara değil, sadece bu
+indeksteki canlı gruplara, her gruba kendi dilindeki içerikle gönderilir.
+
+Bağlantılar katılırken ve her heartbeat'te grubu indekse yazar; kayıtlar
+TOPIC_TTL sonunda düşer. Böylece çöken süreçlerin grupları da kendiliğinden
+temizlenir.
+
+Önbellek Redis ise indeks, skoru geçerlilik zamanı olan bir sorted set'tir
+(ZADD/ZREM); farklı süreçlerin eşzamanlı abonelikleri birbirini ezmez. Süreç
+içi önbellekte (locmem) oku-değiştir-yaz bir kilitle korunur.
+"""
+import threading
+import time
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from django.utils import timezone
+
+from .broadcast import broadcast_cv_update
+from .cache import get_cv_version
+from .documents import FALLBACK_LANGUAGE, build_cv_document, select_translation
+from .models import CV, CVTranslation
+
+# Heartbeat aralığının birkaç katı: canlı gruplar bu sürede en az bir kez yenilenir
+TOPIC_TTL = getattr(settings, 'CHANNEL_SETTINGS', {}).get('PING_INTERVAL', 30) * 3
+
+_index_lock = threading.Lock()
+# Önbellek adresi -> redis client (bkz. _redis_client)
+_redis_clients = {}
+
+
+def _topic_key(cv_id):
+    return f'cv:{cv_id}:topic'
+
+
+def _member(template_id, lang):
+    return f'{template_id}|{lang}'
+
+
+def _redis_client():
+    """
+    Önbellek Redis ise, önbelleğin birincil (yazılabilir) sunucusuna bağlanan bir
+    redis client'ı; indeks atomik sorted set işlemleriyle tutulur. Client önbellek
+    adresi başına bir kez oluşturulur ve bağlantı havuzunu paylaşır. Değilse None
+    (locmem tek süreçtir, indeks süreç içi kilitle korunur).
+    """
+    if not isinstance(caches['default'], RedisCache):
+        return None
+
+    location = settings.CACHES['default']['LOCATION']
+    if isinstance(location, str):
+        location = location.split(',')
+    primary = location[0].strip()
+
+    client = _redis_clients.get(primary)
+    if client is None:
+        import redis
+
+        with _index_lock:
+            client = _redis_clients.setdefault(primary, redis.Redis.from_url(primary))
+    return client
+
+
+def _redis_key(cv_id):
+    return caches['default'].make_and_validate_key(_topic_key(cv_id))
+
+
+def subscribe(cv_id, template_id, lang):
+    """Grubu CV'nin abonelik indeksine ekler veya süresini yeniler"""
+    now = time.time()
+    member = _member(template_id, lang)
+    client = _redis_client()
+    if client is not None:
+        # Üye başına skor = son geçerlilik zamanı; eşzamanlı abonelikler birbirini ezmez
+        key = _redis_key(cv_id)
+        pipe = client.pipeline()
+        pipe.zadd(key, {member: now + TOPIC_TTL})
+        pipe.zremrangebyscore(key, '-inf', now)
+        pipe.expire(key, TOPIC_TTL)
+        pipe.execute()
+        return
+
+    with _index_lock:
+        index = {
+            existing: expires
+            for existing, expires in (cache.get(_topic_key(cv_id)) or {}).items()
+            if expires > now
+        }
+        index[member] = now + TOPIC_TTL
+        cache.set(_topic_key(cv_id), index, TOPIC_TTL)
+
+
+def unsubscribe(cv_id, template_id, lang):
+    member = _member(template_id, lang)
+    client = _redis_client()
+    if client is not None:
+        client.zrem(_redis_key(cv_id), member)
+        return
+
+    with _index_lock:
+        index = cache.get(_topic_key(cv_id))
+        if not index or member not in index:
+            return
+        index.pop(member)
+        if index:
+            cache.set(_topic_key(cv_id), index, TOPIC_TTL)
+        else:
+            cache.delete(_topic_key(cv_id))
+
+
+def subscriptions(cv_id):
+    """CV'nin canlı (template_id, dil) grupları"""
+    now = time.time()
+    client = _redis_client()
+    if client is not None:
+        members = [
+            member.decode() if isinstance(member, bytes) else member
+            for member in client.zrangebyscore(_redis_key(cv_id), now, '+inf')
+        ]
+    else:
+        members = [
+            member
+            for member, expires in (cache.get(_topic_key(cv_id)) or {}).items()
+            if expires > now
+        ]
+    return [tuple(member.split('|', 1)) for member in members]
+
+
+def publish_cv_update(cv_id, base_url=None, include=(), **extra):
+    """
+    CV'nin güncel halini tüm canlı gruplara yayınlar. Her dil için belge bir kez
+    oluşturulur; şablonlar sadece template_id alanında ayrılır.
+
+    base_url: medya URL'lerini mutlak yapmak için kök adres (ör. "https://api.example.com/").
+    İstek nesnesi değil düz metin alınır; yayın istek bittikten sonra başka bir
+    thread'den yapılabilir (bkz. cvs.coalescer).
+
+    include: indekste olmasa da yayınlanacak (template_id, dil) çiftleri
+    (ör. düzenleyenin kendi önizlemesi).
+
+    Returns:
+        int: yayın yapılan grup sayısı
+    """
+    # Döngüsel import'u önlemek için burada import ediyoruz
+    from .views import get_cv_group_name
+
+    targets = set(subscriptions(cv_id)) | set(include)
+    if not targets:
+        return 0
+
+    # Sürüm veriden önce okunur; arada gelen değişiklik bir sonraki sürümle gönderilir
+    version = get_cv_version(cv_id)
+    languages = {lang for _, lang in targets} | {FALLBACK_LANGUAGE}
+    cv = CV.objects.select_related('user').get(pk=cv_id)
+    translations = list(CVTranslation.objects.filter(cv_id=cv_id, language_code__in=languages))
+
+    build_absolute_uri = (lambda url: urljoin(base_url, url)) if base_url else None
+    documents = {}
+    sent = 0
+    timestamp = str(timezone.now().timestamp())
+    for template_id, lang in sorted(targets):
+        if lang not in documents:
+            translation = select_translation(translations, lang)
+            documents[lang] = build_cv_document(cv, translation) if translation else None
+        document = documents[lang]
+        if document is None:
+            continue
+
+        data = document.payload(template_id, build_absolute_uri, version=version, timestamp=timestamp, **extra)
+        broadcast_cv_update(get_cv_group_name(cv.id, cv.translation_key, lang, template_id), data, version)
+        sent += 1
+    return sent
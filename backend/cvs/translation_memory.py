@@ -0,0 +1,122 @@
+"""
+Çeviri hafızası.
+
+Daha önce çevrilmiş metin parçaları (normalize edilmiş kaynak metnin hash'i,
+kaynak dil, hedef dil ve prompt sürümü ile) veritabanında saklanır. Önünde süreç
+içi bir LRU önbellek bulunur; böylece sık tekrar eden metinler ("Bachelor's degree",
+pozisyon adları, yetenekler) OpenAI'ye tekrar gönderilmez.
+"""
+import hashlib
+import threading
+import unicodedata
+
+from cachetools import LRUCache
+from django.conf import settings
+
+from .models import TranslationMemoryEntry
+
+# Prompt'lar değiştiğinde eski çeviriler kullanılmasın diye artırılır
+PROMPT_VERSION = getattr(settings, 'TRANSLATION_PROMPT_VERSION', 'v1')
+
+
+def normalize_text(text):
+    """Unicode NFC + baştaki/sondaki ve tekrar eden boşlukları temizler"""
+    return ' '.join(unicodedata.normalize('NFC', str(text)).split())
+
+
+def text_hash(text):
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    def __init__(self, maxsize=None):
+        self._cache = LRUCache(maxsize=maxsize or getattr(settings, 'TRANSLATION_MEMORY_LRU_SIZE', 10000))
+        self._lock = threading.Lock()
+        self._stats = {'lru_hits': 0, 'db_hits': 0, 'misses': 0, 'stores': 0}
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self._stats[name] += value
+
+    def stats(self):
+        """Süreç içi isabet/ıska sayaçları"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['lru_hits'] + stats['db_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['lru_hits'] + stats['db_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def lookup(self, texts, source_language, target_language):
+        """
+        texts: {anahtar: kaynak metin}
+
+        Returns:
+            tuple: (bulunanlar {anahtar: çeviri}, bulunamayanlar {anahtar: kaynak metin})
+        """
+        found = {}
+        missing = {}
+        hashes = {key: text_hash(text) for key, text in texts.items()}
+
+        with self._lock:
+            for key, digest in hashes.items():
+                cache_key = (digest, source_language, target_language, PROMPT_VERSION)
+                if cache_key in self._cache:
+                    found[key] = self._cache[cache_key]
+        if found:
+            self._count('lru_hits', len(found))
+
+        db_hashes = {hashes[key] for key in texts if key not in found}
+        if db_hashes:
+            rows = dict(
+                TranslationMemoryEntry.objects.filter(
+                    source_hash__in=db_hashes,
+                    source_language=source_language,
+                    target_language=target_language,
+                    prompt_version=PROMPT_VERSION,
+                ).values_list('source_hash', 'translated_text')
+            )
+            db_hits = 0
+            with self._lock:
+                for key, text in texts.items():
+                    if key in found:
+                        continue
+                    digest = hashes[key]
+                    if digest in rows:
+                        found[key] = rows[digest]
+                        self._cache[(digest, source_language, target_language, PROMPT_VERSION)] = rows[digest]
+                        db_hits += 1
+                    else:
+                        missing[key] = text
+            if db_hits:
+                self._count('db_hits', db_hits)
+
+        if missing:
+            self._count('misses', len(missing))
+        return found, missing
+
+    def store(self, texts, translated, source_language, target_language):
+        """texts ve translated aynı anahtarları taşır; yeni çevirileri kaydeder"""
+        entries = {}
+        for key, text in texts.items():
+            if key not in translated:
+                continue
+            digest = text_hash(text)
+            entries[digest] = TranslationMemoryEntry(
+                source_hash=digest,
+                source_language=source_language,
+                target_language=target_language,
+                prompt_version=PROMPT_VERSION,
+                source_text=normalize_text(text),
+                translated_text=translated[key],
+            )
+        if not entries:
+            return
+
+        TranslationMemoryEntry.objects.bulk_create(entries.values(), ignore_conflicts=True)
+        with self._lock:
+            for digest, entry in entries.items():
+                self._cache[(digest, source_language, target_language, PROMPT_VERSION)] = entry.translated_text
+        self._count('stores', len(entries))
+
+
+translation_memory = TranslationMemory()
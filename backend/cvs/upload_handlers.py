@@ -0,0 +1,42 @@
+"""
+Dosyanın SHA-256'sını yükleme sırasında hesaplayan upload handler'lar.
+
+Django'nun varsayılan handler'larının yerine geçer (FILE_UPLOAD_HANDLERS). Hash,
+istek gövdesi okunurken parçalar üzerinden hesaplanır ve dosya nesnesine
+`sha256` olarak eklenir; içerik adresli depolama (cvs.blobs) dosyayı tekrar okumaz.
+"""
+import hashlib
+
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+
+class _HashingMixin:
+    def new_file(self, *args, **kwargs):
+        # MemoryFileUploadHandler.new_file StopFutureHandlers fırlatabilir; önce hash
+        self.sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def _complete(self, file):
+        if file is not None:
+            file.sha256 = self.sha256.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(_HashingMixin, MemoryFileUploadHandler):
+    def receive_data_chunk(self, raw_data, start):
+        # Dosya bellekte tutulmayacaksa (büyük dosya) hash'i sonraki handler hesaplar
+        if self.activated:
+            self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        return self._complete(super().file_complete(file_size))
+
+
+class HashingTemporaryFileUploadHandler(_HashingMixin, TemporaryFileUploadHandler):
+    def receive_data_chunk(self, raw_data, start):
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        return self._complete(super().file_complete(file_size))
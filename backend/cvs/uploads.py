@@ -0,0 +1,197 @@
+"""
+Videoların tarayıcıdan doğrudan nesne depolamaya (DigitalOcean Spaces / S3)
+multipart yüklenmesi.
+
+1. start_video_upload: multipart yükleme başlatılır, her parça için imzalı
+   (presigned) PUT URL'i üretilir ve oturum önbellekte saklanır.
+2. Tarayıcı parçaları doğrudan bucket'a yükler ve her yanıttaki ETag'i toplar
+   (bucket CORS ayarında ETag header'ı expose edilmelidir).
+3. complete_video_upload: yükleme tamamlanır, nesne HEAD ile doğrulanır
+   (boyut ve içerik tipi); doğrulanamayan nesne silinir.
+
+Django worker'ı dosya içeriğini hiç görmez. Tamamlanmayan yüklemeler abort ile
+veya bucket'taki AbortIncompleteMultipartUpload yaşam döngüsü kuralıyla temizlenir.
+"""
+import math
+import os
+import posixpath
+import re
+import uuid
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+VIDEO_UPLOAD_DIR = 'cv_videos'
+MAX_VIDEO_SIZE = getattr(settings, 'VIDEO_UPLOAD_MAX_SIZE', 100 * 1024 * 1024)
+# S3 son parça hariç en az 5 MB'lık parçalar ister
+PART_SIZE = max(getattr(settings, 'VIDEO_UPLOAD_PART_SIZE', 8 * 1024 * 1024), 5 * 1024 * 1024)
+URL_EXPIRY = getattr(settings, 'VIDEO_UPLOAD_URL_EXPIRY', 60 * 60)
+MAX_PARTS = 10000
+
+
+def _session_key(upload_id):
+    return f'video-upload:{upload_id}'
+
+
+def _client():
+    """Depolama backend'inin kullandığı S3 istemcisi (aynı endpoint ve kimlik bilgileri)"""
+    return default_storage.connection.meta.client
+
+
+def _object_key(name):
+    """Depolama adını bucket'taki nesne anahtarına çevirir (location öneki)"""
+    location = getattr(default_storage, 'location', '')
+    return posixpath.join(location, name) if location else name
+
+
+def _video_name(filename):
+    extension = os.path.splitext(filename or '')[1].lower()
+    if not re.fullmatch(r'\.[a-z0-9]{1,8}', extension):
+        extension = ''
+    return f'{VIDEO_UPLOAD_DIR}/{uuid.uuid4().hex}{extension}'
+
+
+def _get_session(cv, upload_id):
+    session = cache.get(_session_key(upload_id)) if upload_id else None
+    if not session or session['cv_id'] != cv.id:
+        raise ValueError('Upload session not found or expired')
+    return session
+
+
+def start_video_upload(cv, filename, content_type, size, description=''):
+    """
+    Multipart yüklemeyi başlatır.
+
+    Returns:
+        dict: upload_id, part_size, expires_in ve parça başına {part_number, url}
+    """
+    content_type = content_type or ''
+    if not content_type.startswith('video/'):
+        raise ValueError(f'Invalid file type: {content_type}. Only video files are allowed.')
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise ValueError('File size is required')
+    if size <= 0:
+        raise ValueError('File size is required')
+    if size > MAX_VIDEO_SIZE:
+        raise ValueError(f'Video file is too large. Maximum size is {MAX_VIDEO_SIZE // (1024 * 1024)}MB.')
+
+    part_count = math.ceil(size / PART_SIZE)
+    if part_count > MAX_PARTS:
+        raise ValueError('Video file has too many parts')
+
+    client = _client()
+    bucket = default_storage.bucket_name
+    name = _video_name(filename)
+    key = _object_key(name)
+
+    params = {'Bucket': bucket, 'Key': key, 'ContentType': content_type}
+    if getattr(default_storage, 'default_acl', None):
+        params['ACL'] = default_storage.default_acl
+    upload_id = client.create_multipart_upload(**params)['UploadId']
+
+    parts = [
+        {
+            'part_number': part_number,
+            'url': client.generate_presigned_url(
+                'upload_part',
+                Params={'Bucket': bucket, 'Key': key, 'UploadId': upload_id, 'PartNumber': part_number},
+                ExpiresIn=URL_EXPIRY,
+            ),
+        }
+        for part_number in range(1, part_count + 1)
+    ]
+
+    cache.set(_session_key(upload_id), {
+        'cv_id': cv.id,
+        'name': name,
+        'key': key,
+        'size': size,
+        'content_type': content_type,
+        'description': description or '',
+    }, URL_EXPIRY)
+
+    return {
+        'upload_id': upload_id,
+        'part_size': PART_SIZE,
+        'expires_in': URL_EXPIRY,
+        'parts': parts,
+    }
+
+
+def _uploaded_parts(client, bucket, key, upload_id):
+    """İstemci parça listesi göndermezse S3'te yüklenmiş parçalar kullanılır"""
+    parts = []
+    marker = 0
+    while True:
+        response = client.list_parts(Bucket=bucket, Key=key, UploadId=upload_id, PartNumberMarker=marker)
+        parts.extend({'PartNumber': part['PartNumber'], 'ETag': part['ETag']} for part in response.get('Parts', []))
+        if not response.get('IsTruncated'):
+            return parts
+        marker = response['NextPartNumberMarker']
+
+
+def complete_video_upload(cv, upload_id, parts=None):
+    """
+    Multipart yüklemeyi tamamlar ve nesneyi doğrular.
+
+    parts: [{part_number, etag}]; verilmezse S3'teki parçalar kullanılır
+
+    Returns:
+        dict: name (depolama adı), size, content_type, description
+    """
+    session = _get_session(cv, upload_id)
+    client = _client()
+    bucket = default_storage.bucket_name
+    key = session['key']
+
+    try:
+        if parts:
+            try:
+                parts = sorted(
+                    ({'PartNumber': int(part['part_number']), 'ETag': str(part['etag'])} for part in parts),
+                    key=lambda part: part['PartNumber'],
+                )
+            except (KeyError, TypeError, ValueError):
+                raise ValueError('Each part needs part_number and etag')
+        else:
+            parts = _uploaded_parts(client, bucket, key, upload_id)
+        if not parts:
+            raise ValueError('No uploaded parts found')
+
+        client.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={'Parts': parts}
+        )
+        head = client.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        raise ValueError(f'Upload could not be completed: {e.response.get("Error", {}).get("Message", str(e))}')
+
+    cache.delete(_session_key(upload_id))
+
+    size = head.get('ContentLength')
+    content_type = head.get('ContentType') or ''
+    if size != session['size'] or size > MAX_VIDEO_SIZE or not content_type.startswith('video/'):
+        client.delete_object(Bucket=bucket, Key=key)
+        raise ValueError(
+            f'Uploaded object does not match the upload session (size {size}, type {content_type})'
+        )
+
+    return {
+        'name': session['name'],
+        'size': size,
+        'content_type': content_type,
+        'description': session['description'],
+    }
+
+
+def abort_video_upload(cv, upload_id):
+    """Yüklemeyi iptal eder; yüklenmiş parçalar silinir"""
+    session = _get_session(cv, upload_id)
+    cache.delete(_session_key(upload_id))
+    try:
+        _client().abort_multipart_upload(Bucket=default_storage.bucket_name, Key=session['key'], UploadId=upload_id)
+    except ClientError as e:
+        raise ValueError(f'Upload could not be aborted: {e.response.get("Error", {}).get("Message", str(e))}')
@@ -0,0 +1,157 @@
+"""
+Profil resmi türevleri.
+
+Yüklenen orijinalden 96/256/512 px (en uzun kenar) WebP ve JPEG türevleri
+üretilir. Türevlerde EXIF (konum vb.) bulunmaz, yönlendirme piksel verisine
+uygulanır. Dosya adları orijinalin içerik hash'inden türetildiği için aynı
+resim için tekrar üretim var olan dosyaları yeniden yüklemez.
+
+Üretim istek thread'i dışında, süreç başına bir worker havuzunda yapılır ve
+sonuç User.profile_picture_variants alanına yazılır:
+
+    {'source': <orijinal adı>, 'hash': <sha256 öneki>,
+     'sizes': {'96': {'width', 'height', 'jpeg', 'webp'}, ...}}
+"""
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_SIZES = (96, 256, 512)
+DERIVATIVE_DIR = 'profile_pictures/derived'
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Süreç başına tek bir resim işleme havuzu oluşturur"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'IMAGE_WORKER_THREADS', 2),
+                    thread_name_prefix='profile-picture',
+                )
+    return _executor
+
+
+def _save(image, name, image_format, **options):
+    # İçerik hash'li ad: dosya varsa aynı içeriktir
+    if default_storage.exists(name):
+        return name
+    buffer = io.BytesIO()
+    # exif parametresi verilmediği için metadata yazılmaz
+    image.save(buffer, image_format, **options)
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def _flatten(image):
+    """Saydam resmi JPEG için beyaz zemine yerleştirir"""
+    if image.mode != 'RGBA':
+        return image
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def build_variants(user_id, source_name, raw):
+    """Orijinal resim baytlarından türevleri üretip kaydeder"""
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+    with Image.open(io.BytesIO(raw)) as original:
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    sizes = {}
+    for size in DERIVATIVE_SIZES:
+        # Orijinalden büyük türev üretilmez (en küçüğü hariç)
+        if sizes and size > max(image.size):
+            break
+        variant = image.copy()
+        variant.thumbnail((size, size), Image.LANCZOS)
+        base = f'{DERIVATIVE_DIR}/{user_id}/{digest}-{size}'
+        sizes[str(size)] = {
+            'width': variant.width,
+            'height': variant.height,
+            'webp': _save(variant, f'{base}.webp', 'WEBP', quality=WEBP_QUALITY, method=4),
+            'jpeg': _save(_flatten(variant), f'{base}.jpg', 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True),
+        }
+    return {'source': source_name, 'hash': digest, 'sizes': sizes}
+
+
+def delete_variants(variants):
+    """Türev dosyalarını siler (orijinal resim hariç)"""
+    for entry in (variants or {}).get('sizes', {}).values():
+        for key in ('jpeg', 'webp'):
+            if entry.get(key):
+                try:
+                    default_storage.delete(entry[key])
+                except Exception as e:
+                    logger.error(f"Error deleting profile picture variant {entry[key]}: {str(e)}")
+
+
+def delete_profile_picture(source_name, variants, keep=None):
+    """
+    Değiştirilen profil resmini ve türevlerini siler. Yeni resim aynı adla
+    kaydedildiyse (depolama üzerine yazıyorsa) `keep` adı silinmez.
+    """
+    if source_name and source_name != keep:
+        try:
+            default_storage.delete(source_name)
+        except Exception as e:
+            logger.error(f"Error deleting old profile picture {source_name}: {str(e)}")
+    delete_variants(variants)
+
+
+def generate_profile_picture_variants(user_id):
+    """
+    Kullanıcının güncel profil resmi için türevleri üretir ve kaydeder. Bu arada
+    resim değiştiyse sonuç yazılmaz (yeni resim için ayrı bir iş çalışır).
+    """
+    User = get_user_model()
+    user = User.objects.filter(pk=user_id).first()
+    if not user or not user.profile_picture:
+        return None
+
+    source_name = user.profile_picture.name
+    with default_storage.open(source_name, 'rb') as source:
+        raw = source.read()
+    variants = build_variants(user_id, source_name, raw)
+
+    user.refresh_from_db(fields=['profile_picture'])
+    if user.profile_picture.name != source_name:
+        return None
+    user.profile_picture_variants = variants
+    # post_save sinyali kullanıcının CV'lerini geçersiz kılar (cvs.signals)
+    user.save(update_fields=['profile_picture_variants'])
+    logger.info(f"Generated {len(variants['sizes'])} profile picture variant(s) for user {user_id}")
+    return variants
+
+
+def _run(user_id):
+    try:
+        generate_profile_picture_variants(user_id)
+    except Exception as e:
+        logger.error(f"Error generating profile picture variants for user {user_id}: {str(e)}")
+    finally:
+        close_old_connections()
+
+
+def enqueue_profile_picture_variants(user):
+    """Türev üretimini transaction commit edildikten sonra worker havuzuna gönderir"""
+    user_id = user.pk
+    transaction.on_commit(lambda: get_executor().submit(_run, user_id))
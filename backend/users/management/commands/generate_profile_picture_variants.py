@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from users.images import generate_profile_picture_variants
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/JPEG variants for existing profile pictures'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate users that already have variants')
+
+    def handle(self, *args, **options):
+        users = User.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        generated = failed = skipped = 0
+
+        for user in users.only('id', 'profile_picture', 'profile_picture_variants').iterator():
+            if not options['all'] and (user.profile_picture_variants or {}).get('source') == user.profile_picture.name:
+                skipped += 1
+                continue
+            try:
+                if generate_profile_picture_variants(user.id):
+                    generated += 1
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'User {user.id}: {str(e)}'))
+
+        self.stdout.write(self.style.SUCCESS(f'Generated: {generated}, skipped: {skipped}, failed: {failed}'))
@@ -45,6 +45,8 @@ class User(AbstractUser):
         ],
         verbose_name='Profil Resmi'
     )
+    # Profil resminin boyutlandırılmış türevleri (bkz. users.images)
+    profile_picture_variants = models.JSONField(default=dict, blank=True)
     
     # Paddle müşteri ID'si
     paddle_customer_id = models.CharField(max_length=255, blank=True, null=True, verbose_name='Paddle Customer ID')
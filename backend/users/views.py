@@ -12,6 +12,8 @@ import logging
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from .authentication import TokenAuthentication
 from .utils import send_verification_email, send_password_reset_email
+from .images import delete_profile_picture, enqueue_profile_picture_variants
+from django.db import transaction
 from django.utils import timezone
 import uuid
 from django.shortcuts import get_object_or_404
@@ -212,16 +214,7 @@ def upload_profile_picture(request):
         user = request.user
         logger.info(f"Uploading profile picture for user: {user.email}")
         
-        # Eski resmi sil
-        if user.profile_picture:
-            logger.info(f"Deleting old profile picture: {user.profile_picture.name}")
-            try:
-                user.profile_picture.delete(save=False)
-                logger.info("Old profile picture deleted successfully")
-            except Exception as e:
-                logger.error(f"Error deleting old profile picture: {str(e)}")
-        
-        # Yeni resmi kaydet
+        # Yeni resmi doğrula; eski resim sadece yeni resim kaydedildikten sonra silinir
         file = request.FILES['profile_picture']
         logger.info(f"New file details - Name: {file.name}, Size: {file.size}, Content Type: {file.content_type}")
         
@@ -237,10 +230,22 @@ def upload_profile_picture(request):
                 'error': 'File size too large. Maximum size is 5MB.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        old_name = user.profile_picture.name if user.profile_picture else None
+        old_variants = user.profile_picture_variants
+        
         try:
             # Dosyayı kaydet
             user.profile_picture = file
+            user.profile_picture_variants = {}
             user.save()
+
+            # Eski resim ve türevleri commit'ten sonra silinir; kayıt başarısız olursa korunur
+            if old_name:
+                new_name = user.profile_picture.name
+                transaction.on_commit(lambda: delete_profile_picture(old_name, old_variants, keep=new_name))
+
+            # Boyutlandırılmış türevler arka planda üretilir
+            enqueue_profile_picture_variants(user)
             
             # Dosya yükleme sonrası bilgileri logla
             logger.info(f"Profile picture saved successfully. URL: {user.profile_picture.url}")